@@ -1,9 +1,36 @@
+import time
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from datetime import datetime
+from http import HTTPStatus
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiler import SlowRequestProfilerMiddleware
+from app.middleware.response_cache import ResponseCacheMiddleware, response_cache
+from app.routers import admin, charts, grievances
+from app.services.action_history import get_actions, load_actions
+from app.services.grievance_store import get_store, load_store
+from app.services.metrics import NAMESPACE, format_metric, metrics
+from app.services.precompute import PrecomputeScheduler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the grievance dataset and action history once, before serving requests,
+    and keep the chart response cache warm while serving"""
+    start = time.perf_counter()
+    load_store()
+    load_actions()
+    app.state.startup_seconds = time.perf_counter() - start
+    # Warm the default chart payloads in the background, then after every ingest
+    app.state.precompute = PrecomputeScheduler(app)
+    app.state.precompute.start()
+    yield
+    await app.state.precompute.stop()
 
-from app.routers import charts
 
 # Create FastAPI instance
 app = FastAPI(
@@ -11,9 +38,19 @@ app = FastAPI(
     description="A modern API for dashboard data and chart analytics",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
+# Cache chart responses (added before CORS so cached replies still get CORS headers)
+app.add_middleware(ResponseCacheMiddleware)
+
+# Record chart request metrics (outside the cache, so hits are counted too)
+app.add_middleware(MetricsMiddleware)
+
+# Keep stack-sampled profiles of slow chart requests (see /api/admin/profiles)
+app.add_middleware(SlowRequestProfilerMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -25,6 +62,8 @@ app.add_middleware(
 
 # Include routers
 app.include_router(charts.router)
+app.include_router(grievances.router)
+app.include_router(admin.router)
 
 
 @app.get("/")
@@ -40,17 +79,52 @@ async def root():
 
 @app.get("/api/health")
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint, with how long the datasets took to load at startup"""
+    store = get_store()
+    actions = get_actions()
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "service": "cpgrams-trends-api"
+        "service": "cpgrams-trends-api",
+        "startup_seconds": round(getattr(app.state, "startup_seconds", 0.0), 4),
+        "datasets": {
+            "grievances": {
+                "rows": store.size,
+                "memory_mapped": store.memory_mapped,
+                "load_seconds": round(store.load_seconds, 4),
+                "version": store.version,
+            },
+            "actions": {
+                "rows": actions.size,
+                "memory_mapped": actions.memory_mapped,
+                "load_seconds": round(actions.build_seconds, 4),
+            },
+        },
     }
 
 
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Chart request, hot-path, response cache and dataset metrics in Prometheus text format"""
+    store = get_store()
+    cache = response_cache.snapshot()
+    lines = metrics.render()
+    for name in ("hits", "misses", "not_modified", "evictions", "invalidations"):
+        lines += format_metric(f"{NAMESPACE}_response_cache_{name}_total", "counter",
+                               f"Chart response cache {name.replace('_', ' ')}", [("", {}, cache[name])])
+    lines += format_metric(f"{NAMESPACE}_response_cache_entries", "gauge", "Cached chart responses",
+                           [("", {}, cache["entries"])])
+    lines += format_metric(f"{NAMESPACE}_dataset_rows", "gauge", "Grievances in the store", [("", {}, store.size)])
+    lines += format_metric(f"{NAMESPACE}_dataset_version", "gauge", "Grievance dataset version",
+                           [("", {}, store.version)])
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
+
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
-    """Custom 404 handler"""
+    """Custom 404 handler; a route's own 404 (e.g. an unknown dimension) keeps its detail"""
+    if isinstance(exc, StarletteHTTPException) and exc.detail != HTTPStatus.NOT_FOUND.phrase:
+        return JSONResponse(status_code=404, content={"detail": exc.detail}, headers=exc.headers)
     return JSONResponse(
         status_code=404,
         content={
@@ -58,9 +132,25 @@ async def not_found_handler(request, exc):
             "available_endpoints": [
                 "/docs",
                 "/api/health",
+                "/api/metrics",
                 "/api/charts/sales",
                 "/api/charts/performance",
-                "/api/charts/analytics"
+                "/api/charts/analytics",
+                "/api/charts/grievances/monthly",
+                "/api/charts/grievances/by-state",
+                "/api/charts/grievances/by-ministry",
+                "/api/charts/grievances/by-category",
+                "/api/charts/resolution-time",
+                "/api/charts/resolution-time/by-ministry",
+                "/api/charts/resolution-time/by-state",
+                "/api/charts/resolution-time/by-month",
+                "/api/charts/top/district",
+                "/api/charts/top/pincode",
+                "/api/charts/top/category",
+                "/api/charts/grievances/timeline",
+                "/api/charts/actions/summary",
+                "/api/charts/batch",
+                "/api/grievances/export"
             ]
         }
     )
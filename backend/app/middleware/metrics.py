@@ -0,0 +1,80 @@
+import time
+from typing import Dict
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.metrics import Metrics, metrics, request_timings, server_timing
+
+# Request header asking for a Server-Timing response header
+SERVER_TIMING_HEADER = b"x-server-timing"
+# Route templates remembered per path (for requests answered before routing)
+MAX_ROUTE_PATHS = 1024
+
+
+class MetricsMiddleware:
+    """Record latency, response bytes, status and cache result of requests under a path prefix
+
+    Requests are labelled with their route template (e.g.
+    /api/charts/top/{dimension}), so label values stay bounded; responses
+    the cache serves before routing are matched against the app's routes.
+    A request sending an X-Server-Timing header gets a Server-Timing
+    response header with its total time and hot-path timers.
+    """
+
+    def __init__(self, app: ASGIApp, registry: Metrics = metrics, path_prefix: str = "/api/charts"):
+        self.app = app
+        self.registry = registry
+        self.path_prefix = path_prefix
+        self.route_paths: Dict[str, str] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        timing = False
+        for name, _ in scope["headers"]:
+            if name == SERVER_TIMING_HEADER:
+                timing = True
+        token = request_timings.set([]) if timing else None
+        status, cache, nbytes = 500, "none", 0
+
+        async def record(message: Message) -> None:
+            nonlocal status, cache, nbytes
+            if message["type"] == "http.response.body":
+                nbytes += len(message.get("body", b""))
+            elif message["type"] == "http.response.start":
+                status = message["status"]
+                for name, value in message.get("headers", ()):
+                    if name == b"x-cache":
+                        cache = value.decode("latin-1").lower()
+                if timing:
+                    header = server_timing(time.perf_counter() - start, cache)
+                    message = {**message, "headers": [*message.get("headers", ()), (b"server-timing", header)]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, record)
+        finally:
+            if token is not None:
+                request_timings.reset(token)
+            self.registry.observe_request(self.route_of(scope), status, cache, time.perf_counter() - start, nbytes)
+
+    def route_of(self, scope: Scope) -> str:
+        """Template of the route that served (or would serve) a request"""
+        route = scope.get("route")
+        if route is not None:
+            return route.path
+        path = scope["path"]
+        template = self.route_paths.get(path)
+        if template is None:
+            template = "unmatched"
+            for candidate in scope["app"].router.routes:
+                if candidate.matches(scope)[0] == Match.FULL:
+                    template = candidate.path
+                    break
+            if len(self.route_paths) < MAX_ROUTE_PATHS:
+                self.route_paths[path] = template
+        return template
@@ -0,0 +1,39 @@
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.profiler import SlowRequestProfiler, slow_request_profiler
+
+
+class SlowRequestProfilerMiddleware:
+    """Profile requests under a path prefix, keeping those slower than the profiler's threshold
+
+    Every request is registered with the profiler for its duration; see
+    SlowRequestProfiler for what a profile holds. Does nothing when the
+    threshold is 0.
+    """
+
+    def __init__(self, app: ASGIApp, profiler: SlowRequestProfiler = slow_request_profiler,
+                 path_prefix: str = "/api/charts"):
+        self.app = app
+        self.profiler = profiler
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (scope["type"] != "http" or not self.profiler.enabled
+                or not scope["path"].startswith(self.path_prefix)):
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def record(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        token = self.profiler.begin()
+        try:
+            await self.app(scope, receive, record)
+        finally:
+            self.profiler.end(token, scope["method"], scope["path"],
+                              scope.get("query_string", b"").decode("latin-1"), status)
@@ -0,0 +1,272 @@
+import gzip
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.grievance_store import get_store
+from app.services.serialization import negotiate_format, response_format
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always offered
+    brotli = None
+
+DEFAULT_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL", "300"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_SIZE", "512"))
+# Bodies smaller than this are sent uncompressed
+COMPRESS_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 6
+
+# Content codings by preference, each with its compressor
+COMPRESSORS = {
+    **({"br": lambda body: brotli.compress(body, quality=BROTLI_QUALITY)} if brotli is not None else {}),
+    "gzip": lambda body: gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0),
+}
+VARY = (b"vary", b"Accept, Accept-Encoding")
+
+
+@dataclass
+class CachedResponse:
+    """An encoded response body plus what is needed to replay it"""
+    body: bytes
+    headers: List[Tuple[bytes, bytes]]
+    etag: str
+    version: int
+    expires_at: float
+    # Compressed copies of body, by content coding, made on first request
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+
+@dataclass
+class CacheStats:
+    """Cache effectiveness counters"""
+    hits: int = 0
+    misses: int = 0
+    not_modified: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    compressions: int = 0
+
+
+class ResponseCache:
+    """Size-bounded LRU of encoded responses with a TTL.
+
+    Entries are tagged with the dataset version they were computed from; the
+    whole cache is dropped as soon as a different version is requested.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self.version: Optional[int] = None
+        self.stats = CacheStats()
+
+    def _check_version(self, version: int) -> None:
+        if version != self.version:
+            if self.entries:
+                self.stats.invalidations += 1
+            self.entries.clear()
+            self.version = version
+
+    def get(self, key: str, version: int) -> Optional[CachedResponse]:
+        """Return a live entry (and mark it recently used), or None."""
+        self._check_version(version)
+        entry = self.entries.get(key)
+        if entry is None or entry.expires_at < time.monotonic():
+            if entry is not None:
+                del self.entries[key]
+            self.stats.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry
+
+    def put(self, key: str, body: bytes, headers: List[Tuple[bytes, bytes]], version: int) -> CachedResponse:
+        """Store an encoded response, evicting the least recently used entries."""
+        self._check_version(version)
+        entry = CachedResponse(
+            body=body,
+            headers=headers,
+            etag='"%s"' % hashlib.sha1(body).hexdigest()[:20],
+            version=version,
+            expires_at=time.monotonic() + self.ttl_seconds
+        )
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.stats.evictions += 1
+        return entry
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self.entries.clear()
+
+    def snapshot(self) -> Dict[str, float]:
+        """Counters plus current size, for the admin endpoint"""
+        lookups = self.stats.hits + self.stats.misses
+        return {
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "hit_ratio": round(self.stats.hits / lookups, 4) if lookups else 0.0,
+            "not_modified": self.stats.not_modified,
+            "evictions": self.stats.evictions,
+            "invalidations": self.stats.invalidations,
+            "compressions": self.stats.compressions,
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "bytes": sum(len(entry.body) for entry in self.entries.values()),
+            "compressed_bytes": sum(len(body) for entry in self.entries.values() for body in entry.encoded.values()),
+            "dataset_version": self.version
+        }
+
+
+response_cache = ResponseCache()
+
+
+def cache_key(scope: Scope, representation: str = "json") -> str:
+    """Route + normalized (sorted) query parameters, + the representation if not JSON"""
+    query = scope.get("query_string", b"").decode("latin-1")
+    params = sorted(parse_qsl(query, keep_blank_values=True))
+    key = f"{scope['path']}?{urlencode(params)}"
+    return key if representation == "json" else f"{key}#{representation}"
+
+
+def choose_encoding(accept_encoding: Optional[str], size: int) -> Optional[str]:
+    """Preferred content coding the client accepts (q > 0) for a body of size bytes, or None"""
+    if not accept_encoding or size < COMPRESS_MIN_BYTES:
+        return None
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    for coding in COMPRESSORS:
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+def compress_all(body: bytes) -> Dict[str, bytes]:
+    """Body compressed with every available content coding, if large enough to be sent compressed"""
+    if len(body) < COMPRESS_MIN_BYTES:
+        return {}
+    return {coding: compress(body) for coding, compress in COMPRESSORS.items()}
+
+
+def encoded_body(cache: ResponseCache, entry: CachedResponse, coding: str) -> bytes:
+    """Body of an entry compressed with a content coding, compressed once and kept on the entry"""
+    body = entry.encoded.get(coding)
+    if body is None:
+        body = entry.encoded[coding] = COMPRESSORS[coding](entry.body)
+        cache.stats.compressions += 1
+    return body
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an If-None-Match header against an ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in [tag[2:] if tag.startswith("W/") else tag for tag in candidates]
+
+
+class ResponseCacheMiddleware:
+    """Serve repeated GETs under a path prefix from the response cache
+
+    Cache misses run the route normally and keep the encoded body; hits skip
+    the route (and its Pydantic validation) entirely. Every cached response
+    carries an ETag, and a matching If-None-Match gets a bodiless 304.
+
+    Content negotiation: an Accept header listing Arrow makes columnar
+    routes answer with an Arrow stream (cached under its own key), and
+    bodies of at least COMPRESS_MIN_BYTES are sent br- or gzip-compressed
+    per Accept-Encoding. Compressed copies are kept on the cache entry, so
+    each is compressed once, and get their own ETag.
+    """
+
+    def __init__(self, app: ASGIApp, cache: ResponseCache = response_cache, path_prefix: str = "/api/charts"):
+        self.app = app
+        self.cache = cache
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (scope["type"] != "http" or scope["method"] != "GET"
+                or not scope["path"].startswith(self.path_prefix)):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        representation = negotiate_format(headers.get("accept"))
+        key = cache_key(scope, representation)
+        version = get_store().version
+
+        entry = self.cache.get(key, version)
+        if entry is not None:
+            await self.send_entry(entry, headers, b"HIT", send)
+            return
+
+        start: Dict = {}
+        chunks: List[bytes] = []
+
+        async def capture(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        token = response_format.set(representation)
+        try:
+            await self.app(scope, receive, capture)
+        finally:
+            response_format.reset(token)
+        body = b"".join(chunks)
+
+        if start.get("status") != 200:
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        response_headers = [(name, value) for name, value in start.get("headers", [])
+                            if name.lower() != b"content-length"]
+        entry = self.cache.put(key, body, response_headers, version)
+        await self.send_entry(entry, headers, b"MISS", send)
+
+    async def send_entry(self, entry: CachedResponse, headers: Headers, status: bytes, send: Send) -> None:
+        """Replay a cached entry as a 200 (compressed if accepted), or a 304 if the client already has it"""
+        coding = choose_encoding(headers.get("accept-encoding"), len(entry.body))
+        etag = entry.etag if coding is None else f'{entry.etag[:-1]}-{coding}"'
+        cache_headers = [
+            (b"etag", etag.encode("latin-1")),
+            (b"cache-control", b"no-cache"),
+            (b"x-cache", status),
+            VARY
+        ]
+        if coding is not None:
+            cache_headers.append((b"content-encoding", coding.encode("latin-1")))
+        if etag_matches(headers.get("if-none-match"), etag):
+            self.cache.stats.not_modified += 1
+            await send({"type": "http.response.start", "status": 304, "headers": cache_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        body = entry.body if coding is None else encoded_body(self.cache, entry, coding)
+        response_headers = entry.headers + cache_headers + [(b"content-length", str(len(body)).encode("latin-1"))]
+        await send({"type": "http.response.start", "status": 200, "headers": response_headers})
+        await send({"type": "http.response.body", "body": body})
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import List, Dict, Any, Optional, Union
+from datetime import date, datetime
 
 
 class ChartDataPoint(BaseModel):
@@ -61,4 +61,142 @@ class DonutChartData(BaseModel):
     """Model for donut chart data"""
     name: str
     value: float
-    color: str 
\ No newline at end of file
+    color: str 
+
+
+class GroupCount(BaseModel):
+    """Model for grievance counts per group (state, ministry, category)"""
+    name: str
+    count: int
+
+
+class TopValue(BaseModel):
+    """Model for one value of a top-K list, with the previous window for growth lists"""
+    name: str
+    count: int
+    previous: Optional[int] = None
+    change: Optional[int] = None
+
+
+class TopValues(BaseModel):
+    """Model for the most frequent (or fastest-growing) values of a field"""
+    dimension: str
+    mode: str  # "exact" or "approximate"
+    total: int
+    error_bound: int
+    values: List[TopValue]
+
+
+class MonthlyVolume(BaseModel):
+    """Model for monthly grievance volume"""
+    month: str
+    received: int
+    closed: int
+
+
+class ResolutionTime(BaseModel):
+    """Model for grievance disposal times and open backlog of a group"""
+    name: str
+    closed: int
+    open: int
+    median_days: Optional[float] = None
+    p90_days: Optional[float] = None
+    p99_days: Optional[float] = None
+
+
+class ActionEvent(BaseModel):
+    """Model for one action in a grievance timeline"""
+    action_srno: int
+    action_date: Optional[str] = None
+    action_name: str
+    from_org_code: str
+    to_org_code: str
+    days_since_previous: Optional[float] = None
+
+
+class GrievanceTimeline(BaseModel):
+    """Model for the action history of one grievance"""
+    registration_no: str
+    actions: List[ActionEvent]
+
+
+class ActionCount(BaseModel):
+    """Model for the number of grievances with a given number of actions"""
+    actions: int
+    grievances: int
+
+
+class HandoffTime(BaseModel):
+    """Model for time since the previous action, per action name"""
+    action_name: str
+    count: int
+    median_days: float
+    p90_days: float
+
+
+class ActionSummary(BaseModel):
+    """Model for action history aggregates"""
+    grievances: int
+    actions: int
+    mean_actions: float
+    max_actions: int
+    per_grievance: List[ActionCount]
+    handoffs: List[HandoffTime]
+
+
+class ChartFilters(BaseModel):
+    """Model for the grievance filters of a batched chart (as the query parameters of one route)"""
+    start: Optional[date] = None
+    end: Optional[date] = None
+    state: Optional[str] = None
+    org_code: Optional[str] = None
+    dist_name: Optional[str] = None
+    sex: Optional[str] = None
+    category: Optional[int] = None
+
+
+class ChartSpec(BaseModel):
+    """Model for one chart of a batch: a GET route under /api/charts and its parameters"""
+    id: Optional[str] = None
+    route: str  # e.g. "/kpi-cards", "/grievances/by-state"
+    params: Dict[str, Union[str, int, float, bool]] = {}
+    filters: Optional[ChartFilters] = None  # defaults to the batch filters
+
+
+class ChartBatchRequest(BaseModel):
+    """Model for a batch of charts sharing default filters"""
+    charts: List[ChartSpec] = Field(..., min_length=1, max_length=50)
+    filters: ChartFilters = ChartFilters()
+
+
+class ChartBatchResult(BaseModel):
+    """Model for the response of one batched chart"""
+    id: Optional[str] = None
+    route: str
+    status: int
+    cached: bool
+    data: Any
+
+
+class ChartBatchResponse(BaseModel):
+    """Model for the responses of a batch, in request order"""
+    results: List[ChartBatchResult]
+
+
+class GrievanceRecord(BaseModel):
+    """Model for an exported grievance, with the values of the converted dataset"""
+    registration_no: Optional[str] = None
+    recvd_date: Optional[datetime] = None
+    closing_date: Optional[datetime] = None
+    CategoryV7: Optional[int] = None
+    pincode: Optional[int] = None
+    state: str
+    org_code: str
+    dist_name: str
+    sex: str
+
+
+class GrievancePage(BaseModel):
+    """Model for a page of exported grievances and the cursor of the next one"""
+    records: List[GrievanceRecord]
+    next_cursor: Optional[str] = None
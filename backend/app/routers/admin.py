@@ -0,0 +1,90 @@
+import hmac
+import os
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Dict, List, Optional
+
+from app.middleware.response_cache import response_cache
+from app.services.grievance_store import GRIEVANCE_FIELDS, ingest
+from app.services.profiler import slow_request_profiler
+
+# Bearer token required by every admin endpoint; unset disables them
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+
+def require_admin_token(authorization: Optional[str] = Header(None)) -> None:
+    """Reject admin requests without `Authorization: Bearer <ADMIN_TOKEN>` (403 if no token is configured)"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled; set ADMIN_TOKEN to enable them")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid or missing admin token",
+                            headers={"WWW-Authenticate": "Bearer"})
+
+
+router = APIRouter(prefix="/api/admin", tags=["admin"], dependencies=[Depends(require_admin_token)])
+
+
+@router.post("/ingest")
+async def ingest_records(records: List[Dict[str, Any]], request: Request):
+    """Upsert converted grievance records into the in-memory store
+
+    Accepts the records written by
+    `fix_json_files.py --incremental DELTA --delta-output FILE`; aggregates
+    are updated incrementally in a worker thread, without reloading the
+    dataset or blocking other requests, and the default chart payloads are
+    precomputed again.
+    """
+    data = {field: [record.get(field) for record in records] for field in GRIEVANCE_FIELDS}
+    result = await run_in_threadpool(ingest, data)
+    request.app.state.precompute.notify()
+    return result
+
+
+@router.get("/cache")
+async def get_cache_stats():
+    """Get chart response cache hit/miss counters"""
+    return response_cache.snapshot()
+
+
+@router.delete("/cache")
+async def clear_cache():
+    """Drop every cached chart response"""
+    response_cache.clear()
+    return response_cache.snapshot()
+
+
+@router.get("/precompute")
+async def get_precompute_status(request: Request):
+    """Get the state of the last chart payload precompute run"""
+    return request.app.state.precompute.snapshot()
+
+
+@router.get("/profiles")
+async def get_profiles():
+    """Get the slow request profiler settings and the kept profiles, newest first"""
+    return slow_request_profiler.snapshot()
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: int, format: str = Query("json", pattern="^(json|folded)$")):
+    """Get one slow request profile: top functions and folded stacks
+
+    format=folded returns the stacks as text, one "outer;...;inner count"
+    line per stack, for flamegraph.pl or speedscope.
+    """
+    profile = slow_request_profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"No profile: {profile_id}")
+    if format == "folded":
+        return PlainTextResponse("".join(f"{stack} {count}\n" for stack, count in profile.to_dict()["folded"].items()))
+    return profile.to_dict()
+
+
+@router.delete("/profiles")
+async def clear_profiles():
+    """Drop every kept slow request profile"""
+    slow_request_profiler.clear()
+    return slow_request_profiler.snapshot()
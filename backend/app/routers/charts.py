@@ -1,163 +1,623 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
-from datetime import datetime, timedelta
-import random
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import Dict, List, Optional, Tuple, Union
+from contextvars import ContextVar
+from dataclasses import astuple, replace
+from datetime import date, timedelta
+from urllib.parse import parse_qsl, urlencode
+
+import numpy as np
 
 from app.models.chart_models import (
-    SalesData, 
-    PerformanceMetric, 
-    AnalyticsData, 
-    KPICard, 
-    TimeSeriesData, 
-    DonutChartData
+    SalesData,
+    PerformanceMetric,
+    AnalyticsData,
+    KPICard,
+    TimeSeriesData,
+    DonutChartData,
+    GroupCount,
+    MonthlyVolume,
+    TopValues,
+    ResolutionTime,
+    GrievanceTimeline,
+    ActionSummary,
+    ChartBatchRequest,
+    ChartBatchResponse
 )
+from app.middleware.response_cache import cache_key, response_cache
+from app.services.action_history import get_actions
+from app.services.downsample import lttb
+from app.services.dates import month_label
+from app.services.grievance_store import CubeSelection, GrievanceStore, get_store
+from app.services.heavy_hitters import count_values, error_bound, lookup_counts, top_k
+from app.services.precompute import render
+from app.services.query import GrievanceFilter
+from app.services.resolution import quantiles
+from app.services.serialization import RawJSONResponse, dumps, records_response
+from app.services.trend_cube import day_labels
+
+# Handlers return pre-encoded RawJSONResponses built straight from the store's
+# aggregates (records_response: JSON records, or Arrow when negotiated);
+# response_model is kept for the OpenAPI schema only.
+router = APIRouter(prefix="/api/charts", tags=["charts"], default_response_class=RawJSONResponse)
+
+COLORS = ["#3b82f6", "#ef4444", "#10b981", "#f59e0b", "#8b5cf6"]
+EPOCH_DATE = date(1970, 1, 1)
+
+# Fields with top-K endpoints, by URL dimension
+TOP_FIELDS = {"district": "dist_name", "pincode": "pincode", "category": "CategoryV7"}
+
+# Filters the trend cube / resolution sketch apply to their own cells
+CUBE_FILTERS = ("start", "end", "state", "org_code", "category")
+SKETCH_FILTERS = ("start", "end", "state", "org_code")
+# Cube filters that select the same closings as selecting rows does (a date
+# range selects closings by closing day in the cube, by received day in rows)
+CUBE_FIELD_FILTERS = ("state", "org_code", "category")
+
+# Row masks and filtered stores shared by the charts of one batch request,
+# keyed by dataset version and filter values (None outside a batch)
+batch_selections: ContextVar[Optional[Dict[tuple, object]]] = ContextVar("batch_selections", default=None)
+
+
+def grievance_filter(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    state: Optional[str] = None,
+    org_code: Optional[str] = None,
+    dist_name: Optional[str] = None,
+    sex: Optional[str] = None,
+    category: Optional[int] = None
+) -> GrievanceFilter:
+    """Filters accepted by every grievance endpoint (start/end inclusive, YYYY-MM-DD)"""
+    return GrievanceFilter(start, end, state, org_code, dist_name, sex, category)
+
+
+def filtered_store(filters: GrievanceFilter, served: Tuple[str, ...] = ()) -> GrievanceStore:
+    """The store, or a store of the matching rows if any filter is left after `served`
+
+    `served` names the filters the caller applies itself from pre-aggregated
+    cells. Otherwise rows are selected with a compiled row mask (date range
+    + bitmap ANDs) on every field filter, so the rebuilt aggregates are as
+    small as possible; served date ranges are still left to the cells.
+    """
+    store = get_store()
+    if filters.without(*served).empty:
+        return store
+    cell_dates = [name for name in ("start", "end") if name in served]
+    selection = filters.without(*cell_dates)
+    return shared_selection("store", store, selection, lambda: store.select(selection_mask(store, selection)))
+
+
+def cube_aggregates(filters: GrievanceFilter, served: Tuple[str, ...] = CUBE_FILTERS) -> Union[GrievanceStore, CubeSelection]:
+    """The store, the aggregates of the matching trend cube cells, or a store of the matching rows
+
+    Filters the cube has cells for (`served`) are answered by masking and
+    summing cells, as the time-series charts are; any other filter
+    (dist_name, sex) falls back to filtered_store.
+    """
+    store = get_store()
+    if filters.empty:
+        return store
+    if filters.without(*served).empty:
+        return shared_selection("cells", store, filters, lambda: store.select_cells(cube_mask(store, filters)))
+    return filtered_store(filters)
+
+
+def shared_selection(kind: str, store: GrievanceStore, filters: GrievanceFilter, build):
+    """build(), or within a batch request the result already built for the same filters"""
+    shared = batch_selections.get()
+    if shared is None:
+        return build()
+    key = (kind, store.version, astuple(filters))
+    if key not in shared:
+        shared[key] = build()
+    return shared[key]
+
+
+def selection_mask(store: GrievanceStore, filters: GrievanceFilter) -> np.ndarray:
+    """Row mask of the store rows matching filters, compiled once per batch request"""
+    return shared_selection("mask", store, filters, lambda: filters.mask(store))
+
+
+def month_over_month(series: np.ndarray) -> Tuple[float, float]:
+    """Return (latest value, % change vs previous month) of a monthly series"""
+    if len(series) == 0:
+        return 0.0, 0.0
+    latest = float(series[-1])
+    previous = float(series[-2]) if len(series) > 1 else 0.0
+    change = (latest - previous) / previous * 100 if previous else 0.0
+    return latest, round(change, 1)
+
+
+def trend_of(change: float) -> str:
+    """Map a % change to a trend label"""
+    if change > 0:
+        return "up"
+    if change < 0:
+        return "down"
+    return "stable"
 
-router = APIRouter(prefix="/api/charts", tags=["charts"])
+
+def cube_mask(store: GrievanceStore, filters: GrievanceFilter):
+    """Translate request filters into a mask over the trend cube cells"""
+    return store.cube.mask(
+        state=store.code_of("state", filters.state),
+        org_code=store.code_of("org_code", filters.org_code),
+        category=filters.category,
+        start_day=(filters.start - EPOCH_DATE).days if filters.start else None,
+        end_day=(filters.end - EPOCH_DATE).days if filters.end else None
+    )
+
+
+def month_of(day: date) -> int:
+    """Months since 1970-01 of a date"""
+    return (day.year - 1970) * 12 + day.month - 1
+
+
+def resolution_columns(names: List[str], histograms: np.ndarray) -> Dict[str, list]:
+    """Per-group closed/open counts and disposal quantiles in days (None if nothing closed)"""
+    closed = histograms[:, :-1].sum(axis=1)
+    days = np.round(quantiles(histograms), 2)
+    days = np.where(np.isnan(days), None, days.astype(object))
+    return {
+        "name": names,
+        "closed": closed.tolist(),
+        "open": histograms[:, -1].tolist(),
+        "median_days": days[:, 0].tolist(),
+        "p90_days": days[:, 1].tolist(),
+        "p99_days": days[:, 2].tolist()
+    }
+
+
+def resolution_mask(store: GrievanceStore, filters: GrievanceFilter):
+    """Translate request filters into a mask over the resolution sketch entries"""
+    return store.resolution.mask(
+        state=store.code_of("state", filters.state),
+        org_code=store.code_of("org_code", filters.org_code),
+        start_month=month_of(filters.start) if filters.start else None,
+        end_month=month_of(filters.end) if filters.end else None
+    )
+
+
+def top_with_other(pairs: List[Tuple[str, int]], limit: int) -> List[Tuple[str, int]]:
+    """Keep the largest groups and fold the rest into "Other" """
+    head = pairs[:limit]
+    rest = sum(count for _, count in pairs[limit:])
+    if rest:
+        head.append(("Other", rest))
+    return head
 
 
 @router.get("/sales", response_model=List[SalesData])
-async def get_sales_data():
-    """Get sales data for area/bar charts"""
-    months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", 
-              "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-    
-    sales_data = []
-    for month in months:
-        sales_data.append(SalesData(
-            month=month,
-            sales=random.uniform(10000, 50000),
-            profit=random.uniform(2000, 15000),
-            customers=random.randint(100, 500)
-        ))
-    
-    return sales_data
+async def get_sales_data(filters: GrievanceFilter = Depends(grievance_filter)):
+    """Get monthly grievance volume for area/bar charts
+
+    sales = grievances received, profit = grievances disposed,
+    customers = districts reporting grievances that month.
+    """
+    store = filtered_store(filters)
+    return records_response({
+        "month": store.months,
+        "sales": store.monthly_received.astype(float).tolist(),
+        "profit": store.monthly_closed.astype(float).tolist(),
+        "customers": store.monthly_districts.tolist()
+    })
 
 
 @router.get("/performance", response_model=List[PerformanceMetric])
-async def get_performance_metrics():
-    """Get performance metrics for KPI cards"""
+async def get_performance_metrics(filters: GrievanceFilter = Depends(grievance_filter)):
+    """Get month-over-month grievance metrics for KPI cards"""
+    store = cube_aggregates(filters, served=CUBE_FIELD_FILTERS)
+    received, received_change = month_over_month(store.monthly_received)
+    closed, closed_change = month_over_month(store.monthly_closed)
+    rate_series = np.divide(
+        store.monthly_closed, store.monthly_received,
+        out=np.zeros(len(store.monthly_received)), where=store.monthly_received > 0
+    ) * 100
+    rate, rate_change = month_over_month(rate_series)
+
     metrics = [
         {
-            "metric": "Revenue",
-            "value": 45000.00,
-            "change": 12.5,
-            "trend": "up"
+            "metric": "Grievances Received",
+            "value": received,
+            "change": received_change,
+            "trend": trend_of(received_change)
         },
         {
-            "metric": "Users",
-            "value": 1250.0,
-            "change": -3.2,
-            "trend": "down"
+            "metric": "Grievances Disposed",
+            "value": closed,
+            "change": closed_change,
+            "trend": trend_of(closed_change)
         },
         {
-            "metric": "Conversion Rate",
-            "value": 3.45,
-            "change": 0.8,
-            "trend": "up"
+            "metric": "Disposal Rate",
+            "value": round(rate, 2),
+            "change": rate_change,
+            "trend": trend_of(rate_change)
         },
         {
-            "metric": "Avg. Order Value",
-            "value": 89.50,
-            "change": 5.1,
-            "trend": "up"
+            "metric": "Pending",
+            "value": float(store.size - store.closed_total),
+            "change": 0.0,
+            "trend": "stable"
         }
     ]
-    
-    return [PerformanceMetric(**metric) for metric in metrics]
+
+    return RawJSONResponse(metrics)
 
 
 @router.get("/analytics", response_model=List[AnalyticsData])
-async def get_analytics_data():
-    """Get analytics data for donut charts"""
+async def get_analytics_data(filters: GrievanceFilter = Depends(grievance_filter)):
+    """Get grievance share by state for donut charts"""
+    store = cube_aggregates(filters)
+    pairs = top_with_other(store.top("state"), 4)
+    total = sum(count for _, count in pairs) or 1
     categories = [
-        {"category": "Desktop", "value": 45.2, "percentage": 45.2, "color": "#3b82f6"},
-        {"category": "Mobile", "value": 32.8, "percentage": 32.8, "color": "#ef4444"},
-        {"category": "Tablet", "value": 15.1, "percentage": 15.1, "color": "#10b981"},
-        {"category": "Other", "value": 6.9, "percentage": 6.9, "color": "#f59e0b"}
+        {
+            "category": name,
+            "value": float(count),
+            "percentage": round(count / total * 100, 1),
+            "color": COLORS[i % len(COLORS)]
+        }
+        for i, (name, count) in enumerate(pairs)
     ]
-    
-    return [AnalyticsData(**category) for category in categories]
+
+    return RawJSONResponse(categories)
 
 
 @router.get("/kpi-cards", response_model=List[KPICard])
-async def get_kpi_cards():
+async def get_kpi_cards(filters: GrievanceFilter = Depends(grievance_filter)):
     """Get KPI card data"""
+    store = filtered_store(filters)
+    _, received_change = month_over_month(store.monthly_received)
+    _, closed_change = month_over_month(store.monthly_closed)
+    closed = store.closed_total
+    pending = store.size - closed
+    avg_days = store.avg_disposal_days
+
     kpis = [
         {
-            "title": "Total Revenue",
-            "value": "$45,231",
-            "change": 20.1,
-            "trend": "up",
-            "color": "emerald"
+            "title": "Total Grievances",
+            "value": f"{store.size:,}",
+            "change": received_change,
+            "trend": trend_of(received_change),
+            "color": "blue"
         },
         {
-            "title": "Active Users",
-            "value": "2,350",
-            "change": -10.1,
-            "trend": "down",
-            "color": "red"
+            "title": "Disposed",
+            "value": f"{closed:,}",
+            "change": closed_change,
+            "trend": trend_of(closed_change),
+            "color": "emerald"
         },
         {
-            "title": "Conversion Rate",
-            "value": "3.45%",
-            "change": 5.4,
-            "trend": "up",
-            "color": "blue"
+            "title": "Pending",
+            "value": f"{pending:,}",
+            "change": 0.0,
+            "trend": "stable",
+            "color": "red"
         },
         {
-            "title": "Avg Session",
-            "value": "4:35",
-            "change": 2.1,
-            "trend": "up",
+            "title": "Avg Disposal Time",
+            "value": f"{avg_days:.1f} days",
+            "change": 0.0,
+            "trend": "stable",
             "color": "emerald"
         }
     ]
-    
-    return [KPICard(**kpi) for kpi in kpis]
+
+    return RawJSONResponse(kpis)
 
 
 @router.get("/time-series", response_model=List[TimeSeriesData])
-async def get_time_series_data():
-    """Get time series data for line charts"""
-    base_date = datetime.now() - timedelta(days=30)
-    time_series = []
-    
-    for i in range(30):
-        current_date = base_date + timedelta(days=i)
-        time_series.append(TimeSeriesData(
-            date=current_date.strftime("%Y-%m-%d"),
-            value=random.uniform(100, 1000),
-            category="Website Traffic"
-        ))
-    
-    return time_series
+async def get_time_series_data(
+    granularity: str = Query("day", pattern="^(day|week|month)$"),
+    metric: str = Query("received", pattern="^(received|closed)$"),
+    max_points: Optional[int] = Query(None, ge=3, le=10000),
+    filters: GrievanceFilter = Depends(grievance_filter)
+):
+    """Get grievances received (or closed) per day/week/month for line charts
+
+    Served from the pre-aggregated trend cube; date, state, org_code and
+    category filters only mask and sum cube cells (dist_name/sex first
+    select rows). Series longer than max_points are downsampled with LTTB,
+    keeping peaks and troughs.
+    """
+    store = filtered_store(filters, served=CUBE_FILTERS)
+    mask = cube_mask(store, filters)
+    buckets, counts = store.cube.series(granularity, metric, mask)
+    if max_points is not None and len(buckets) > max_points:
+        keep = lttb(buckets, counts, max_points)
+        buckets, counts = buckets[keep], counts[keep]
+    label = "Grievances Received" if metric == "received" else "Grievances Closed"
+    return records_response({
+        "date": day_labels(buckets),
+        "value": counts.astype(float).tolist(),
+        "category": [label] * len(buckets)
+    })
 
 
 @router.get("/donut-data", response_model=List[DonutChartData])
-async def get_donut_chart_data():
-    """Get data specifically formatted for donut charts"""
+async def get_donut_chart_data(filters: GrievanceFilter = Depends(grievance_filter)):
+    """Get grievances by ministry formatted for donut charts"""
+    store = cube_aggregates(filters)
+    pairs = top_with_other(store.top("org_code"), 4)
     donut_data = [
-        {"name": "Sales", "value": 890, "color": "#3b82f6"},
-        {"name": "Marketing", "value": 338, "color": "#ef4444"},
-        {"name": "Development", "value": 538, "color": "#10b981"},
-        {"name": "Support", "value": 396, "color": "#f59e0b"},
-        {"name": "Other", "value": 135, "color": "#8b5cf6"}
+        {"name": name, "value": float(count), "color": COLORS[i % len(COLORS)]}
+        for i, (name, count) in enumerate(pairs)
     ]
-    
-    return [DonutChartData(**item) for item in donut_data]
+
+    return RawJSONResponse(donut_data)
 
 
 @router.get("/revenue-by-month", response_model=List[dict])
-async def get_revenue_by_month():
-    """Get monthly revenue data for area charts"""
-    months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun"]
-    revenue_data = []
-    
-    for month in months:
-        revenue_data.append({
-            "month": month,
-            "revenue": random.randint(15000, 50000),
-            "profit": random.randint(5000, 20000)
-        })
-    
-    return revenue_data 
\ No newline at end of file
+async def get_revenue_by_month(filters: GrievanceFilter = Depends(grievance_filter)):
+    """Get monthly received (revenue) vs disposed (profit) grievances for area charts"""
+    store = cube_aggregates(filters, served=CUBE_FIELD_FILTERS)
+    return records_response({
+        "month": store.months,
+        "revenue": store.monthly_received.tolist(),
+        "profit": store.monthly_closed.tolist()
+    })
+
+
+@router.get("/grievances/monthly", response_model=List[MonthlyVolume])
+async def get_grievances_by_month(filters: GrievanceFilter = Depends(grievance_filter)):
+    """Get grievances received and disposed per month"""
+    store = filtered_store(filters, served=CUBE_FILTERS)
+    mask = cube_mask(store, filters)
+    received_months, received = store.cube.series("month", "received", mask)
+    closed_months, closed = store.cube.series("month", "closed", mask)
+
+    volume = {}
+    for month, count in zip(day_labels(received_months), received.tolist()):
+        volume[month[:7]] = [count, 0]
+    for month, count in zip(day_labels(closed_months), closed.tolist()):
+        volume.setdefault(month[:7], [0, 0])[1] = count
+
+    months = sorted(volume)
+    return records_response({
+        "month": months,
+        "received": [volume[month][0] for month in months],
+        "closed": [volume[month][1] for month in months]
+    })
+
+
+@router.get("/grievances/by-{dimension}", response_model=List[GroupCount])
+async def get_grievances_by_group(
+    dimension: str,
+    limit: int = Query(50, ge=1, le=1000),
+    filters: GrievanceFilter = Depends(grievance_filter)
+):
+    """Get grievance volume per state, ministry (org_code), district or category"""
+    field = {"state": "state", "ministry": "org_code", "district": "dist_name"}.get(dimension)
+    if field is None and dimension != "category":
+        raise HTTPException(status_code=404, detail=f"Unknown dimension: {dimension}")
+    store = filtered_store(filters) if field == "dist_name" else cube_aggregates(filters)
+    if field is None:
+        pairs = [(str(category), count) for category, count in store.top_categories(limit)]
+    else:
+        pairs = store.top(field, limit)
+
+    return records_response({
+        "name": [name for name, _ in pairs],
+        "count": [count for _, count in pairs]
+    })
+
+
+def top_field(dimension: str) -> str:
+    """Store column of a top-K dimension"""
+    field = TOP_FIELDS.get(dimension)
+    if field is None:
+        raise HTTPException(status_code=404, detail=f"Unknown dimension: {dimension}")
+    return field
+
+
+def value_names(store: GrievanceStore, field: str, values: np.ndarray) -> List[str]:
+    """Display names of top-K values (district labels, pincodes, category numbers)"""
+    if field == "dist_name":
+        return [store.labels[field][code] for code in values.tolist()]
+    return ["Unknown" if value == -1 else str(value) for value in values.tolist()]
+
+
+def exact_counts(store: GrievanceStore, field: str, filters: GrievanceFilter) -> Tuple[np.ndarray, np.ndarray]:
+    """Distinct values of a field and their counts over the matching rows"""
+    values = store.columns[field]
+    if not filters.empty:
+        values = values[selection_mask(store, filters)]
+    return count_values(values)
+
+
+def approximate_window(filters: GrievanceFilter) -> Tuple[Optional[int], Optional[int]]:
+    """Months of the sketch window, rejecting filters the sketches can't apply"""
+    if not filters.without("start", "end").empty:
+        raise HTTPException(status_code=400, detail="mode=approximate only supports the start/end filters")
+    return (month_of(filters.start) if filters.start else None,
+            month_of(filters.end) if filters.end else None)
+
+
+@router.get("/top/{dimension}", response_model=TopValues)
+async def get_top_values(
+    dimension: str,
+    k: int = Query(20, ge=1, le=1000),
+    mode: str = Query("exact", pattern="^(exact|approximate)$"),
+    filters: GrievanceFilter = Depends(grievance_filter)
+):
+    """Get the k districts, pincodes or categories with the most grievances
+
+    exact counts the matching rows and partially sorts the counts
+    (argpartition); it accepts every filter. approximate reads the heavy-hitter
+    sketches of the months from start to end (whole months, no other
+    filters): counts may overshoot by up to error_bound, but cost does not
+    grow with the number of rows.
+    """
+    field = top_field(dimension)
+    store = get_store()
+    if mode == "exact":
+        values, counts = exact_counts(store, field, filters)
+        order = top_k(counts, k)
+        values, counts, total, bound = values[order], counts[order], int(counts.sum()), 0
+    else:
+        values, counts, total = store.heavy_hitters[field].top(k, *approximate_window(filters))
+        bound = error_bound(total)
+
+    return RawJSONResponse({
+        "dimension": dimension,
+        "mode": mode,
+        "total": total,
+        "error_bound": bound,
+        "values": [
+            {"name": name, "count": count}
+            for name, count in zip(value_names(store, field, values), counts.tolist())
+        ]
+    })
+
+
+@router.get("/top/{dimension}/growing", response_model=TopValues)
+async def get_fastest_growing(
+    dimension: str,
+    k: int = Query(20, ge=1, le=1000),
+    mode: str = Query("exact", pattern="^(exact|approximate)$"),
+    filters: GrievanceFilter = Depends(grievance_filter)
+):
+    """Get the k districts, pincodes or categories whose grievances grew the most
+
+    start and end are required. Compares start..end with the window of the
+    same length just before it (same number of days, or of whole months for
+    approximate) and ranks by the increase in count.
+    """
+    field = top_field(dimension)
+    if filters.start is None or filters.end is None or filters.end < filters.start:
+        raise HTTPException(status_code=400, detail="start and end (not before start) are required")
+    store = get_store()
+    if mode == "exact":
+        length = filters.end - filters.start + timedelta(days=1)
+        previous_window = replace(filters, start=filters.start - length, end=filters.start - timedelta(days=1))
+        values, counts = exact_counts(store, field, filters)
+        previous = lookup_counts(values, *exact_counts(store, field, previous_window))
+        total, bound = int(counts.sum()), 0
+    else:
+        start_month, end_month = approximate_window(filters)
+        sketches = store.heavy_hitters[field]
+        values = sketches.window_candidates(start_month, end_month)
+        window = sketches.sketch(start_month, end_month)
+        counts = sketches.estimate(window, values)
+        length = end_month - start_month + 1
+        previous = sketches.estimate(sketches.sketch(start_month - length, start_month - 1), values)
+        total = int(window[0].sum())
+        bound = error_bound(max(total, int(previous.sum())))
+
+    order = top_k(counts - previous, k)
+    values, counts, previous = values[order], counts[order], previous[order]
+    return RawJSONResponse({
+        "dimension": dimension,
+        "mode": mode,
+        "total": total,
+        "error_bound": bound,
+        "values": [
+            {"name": name, "count": count, "previous": before, "change": count - before}
+            for name, count, before in zip(value_names(store, field, values), counts.tolist(), previous.tolist())
+        ]
+    })
+
+
+@router.get("/resolution-time", response_model=ResolutionTime)
+async def get_resolution_time(filters: GrievanceFilter = Depends(grievance_filter)):
+    """Get median/p90/p99 disposal days and open backlog of all matching grievances
+
+    Disposal time is recvd_date to closing_date. start/end select the months
+    received (whole months). Served from the resolution sketch: quantiles are
+    read from merged histograms, within 1% of the exact values.
+    """
+    store = filtered_store(filters, served=SKETCH_FILTERS)
+    mask = resolution_mask(store, filters)
+    _, histograms = store.resolution.histograms(mask=mask)
+    columns = resolution_columns(["All"], histograms)
+    return RawJSONResponse({name: values[0] for name, values in columns.items()})
+
+
+@router.get("/resolution-time/by-{dimension}", response_model=List[ResolutionTime])
+async def get_resolution_time_by_group(
+    dimension: str,
+    limit: int = Query(50, ge=1, le=1000),
+    filters: GrievanceFilter = Depends(grievance_filter)
+):
+    """Get disposal time quantiles and open backlog per ministry (org_code), state or month received
+
+    Ministries and states are ordered by grievance count (top `limit`),
+    months chronologically.
+    """
+    field = {"ministry": "org_code", "state": "state", "month": "month"}.get(dimension)
+    if field is None:
+        raise HTTPException(status_code=404, detail=f"Unknown dimension: {dimension}")
+    store = filtered_store(filters, served=SKETCH_FILTERS)
+    mask = resolution_mask(store, filters)
+    groups, histograms = store.resolution.histograms(field, mask)
+
+    if field == "month":
+        names = [month_label(month) for month in groups.tolist()]
+    else:
+        order = np.argsort(-histograms.sum(axis=1), kind="stable")[:limit]
+        groups, histograms = groups[order], histograms[order]
+        names = [store.labels[field][code] for code in groups.tolist()]
+    return records_response(resolution_columns(names, histograms))
+
+
+@router.get("/grievances/timeline", response_model=GrievanceTimeline)
+async def get_grievance_timeline(registration_no: str):
+    """Get the actions of one grievance in order, from the action history index"""
+    timeline = get_actions().timeline(registration_no)
+    if timeline is None:
+        raise HTTPException(status_code=404, detail=f"No actions for grievance: {registration_no}")
+    names = list(timeline)
+    return RawJSONResponse({
+        "registration_no": registration_no,
+        "actions": [dict(zip(names, row)) for row in zip(*timeline.values())]
+    })
+
+
+@router.get("/actions/summary", response_model=ActionSummary)
+async def get_action_summary():
+    """Get actions per grievance and time since the previous action per action name
+
+    Computed once when the action history is indexed.
+    """
+    return RawJSONResponse(get_actions().summary)
+
+
+@router.post("/batch", response_model=ChartBatchResponse)
+async def get_chart_batch(batch: ChartBatchRequest, request: Request):
+    """Get several charts in one request, e.g. every chart of a dashboard
+
+    Each chart names a GET route under /api/charts with its query parameters
+    and filters (the batch filters unless it has its own); results come back
+    in request order with the status and body that route would return.
+    Charts already in the response cache are served from it, and the others
+    are cached. Charts with the same filters share one compiled row mask and
+    one filtered store, so a dashboard costs one scan rather than one per
+    chart.
+    """
+    version = get_store().version
+    token = batch_selections.set({})
+    try:
+        parts = []
+        for chart in batch.charts:
+            filters = (chart.filters or batch.filters).model_dump(exclude_none=True)
+            route, _, query = chart.route.partition("?")
+            params = {**dict(parse_qsl(query)), **chart.params, **{name: str(value) for name, value in filters.items()}}
+            path = router.prefix + route
+            query_string = urlencode(params).encode("latin-1")
+            key = cache_key({"path": path, "query_string": query_string})
+            entry = response_cache.get(key, version)
+            if entry is not None:
+                status, body = 200, entry.body
+            else:
+                _, status, headers, body = await render(request.app.router, path, query_string)
+                if status == 200:
+                    response_cache.put(key, body, headers, version)
+                elif not dict(headers).get(b"content-type", b"").startswith(b"application/json"):
+                    body = dumps({"detail": body.decode("utf-8", "replace")})
+            header = dumps({"id": chart.id, "route": chart.route, "status": status, "cached": entry is not None})
+            parts.append(header[:-1] + b',"data":' + body + b"}")
+    finally:
+        batch_selections.reset(token)
+    return RawJSONResponse(b'{"results":[' + b",".join(parts) + b"]}")
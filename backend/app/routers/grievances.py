@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
+
+from app.models.chart_models import GrievancePage
+from app.routers.charts import grievance_filter
+from app.services.export import MEDIA_TYPES, Snapshot, StaleCursor, page_records, stream_records
+from app.services.grievance_store import get_store
+from app.services.query import GrievanceFilter
+from app.services.serialization import RawJSONResponse, dumps
+
+router = APIRouter(prefix="/api/grievances", tags=["grievances"])
+
+
+@router.get("/export", response_model=GrievancePage)
+async def export_grievances(
+    format: str = Query("ndjson", pattern="^(ndjson|csv|json)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (json only)"),
+    limit: int = Query(1000, ge=1, le=10_000, description="Records per page (json only)"),
+    filters: GrievanceFilter = Depends(grievance_filter)
+):
+    """Raw grievance records matching the filters
+
+    `ndjson` and `csv` stream every matching record, batch by batch, from a
+    snapshot of the dataset taken when the export starts. `json` returns one
+    page of records with a cursor for the next page; a cursor stops working
+    (409) once the dataset changes, so restart the export then.
+    """
+    snapshot = Snapshot(get_store())
+    if format == "json":
+        try:
+            page = page_records(snapshot, filters, limit, cursor)
+        except StaleCursor as exc:
+            raise HTTPException(status_code=409, detail=str(exc))
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        return RawJSONResponse(dumps(page))
+    return StreamingResponse(
+        stream_records(snapshot, filters, format),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="grievances.{format}"',
+            "X-Dataset-Version": str(snapshot.version),
+        },
+    )
@@ -0,0 +1 @@
+# Business Logic Package
\ No newline at end of file
@@ -0,0 +1,255 @@
+import argparse
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.services.dataset import (
+    is_column_store, open_column_store, read_columns, source_stamp, stale_source, write_column_store
+)
+from app.services.dates import NAT, MS_PER_DAY, parse_dates
+from app.services.grievance_store import REPO_ROOT, factorize
+from app.services.records import RecordLayout
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ACTION_HISTORY_PATH = REPO_ROOT / "data" / "fixed_action_history_v2.json"
+# Column store written by `python -m app.services.action_history`, preferred when present
+DEFAULT_ACTION_STORE_PATH = REPO_ROOT / "data" / "action_history_store"
+
+ACTION_FIELDS = ["registration_no", "action_srno", "action_date", "action_name", "from_org_code", "to_org_code"]
+# How converted action fields are decoded when the JSON dataset is read
+# (grievances have several actions each, so registration numbers repeat)
+ACTION_LAYOUT = RecordLayout(
+    dates=("action_date",),
+    interned=("registration_no", "action_name", "from_org_code", "to_org_code"),
+)
+
+
+class ActionHistoryIndex:
+    """Action history rows grouped by grievance for slicing.
+
+    Rows are sorted by registration_no, then action_date (then action_srno),
+    so the actions of one grievance are a contiguous range: keys holds the
+    distinct registration numbers in sorted order and the actions of
+    keys[i] are rows offsets[i]:offsets[i + 1]. Lookups are a binary search
+    over keys; aggregates are computed once from the same arrays.
+    """
+
+    def __init__(self, data: Dict[str, List[Any]], source: str = ""):
+        start = time.perf_counter()
+        self.source = source
+        # Set by load_actions to the source file's identity, saved with the store
+        self.source_stamp: Dict[str, Any] = {}
+        registration_no = np.array([value or "" for value in data["registration_no"]], dtype=str)
+        size = len(registration_no)
+        action_date = parse_dates(data["action_date"])
+        action_srno = np.fromiter(
+            (int(v) if isinstance(v, (int, float)) else -1 for v in data["action_srno"]),
+            dtype=np.int64,
+            count=size,
+        )
+        names, name_index = factorize(data["action_name"])
+        org_index: Dict[str, int] = {}
+        from_org, org_index = factorize(data["from_org_code"], org_index)
+        to_org, org_index = factorize(data["to_org_code"], org_index)
+        self.action_names = list(name_index)
+        self.org_codes = list(org_index)
+
+        order = np.lexsort((action_srno, action_date, registration_no))
+        registration_no = registration_no[order]
+        self.columns = {
+            "action_srno": action_srno[order],
+            "action_date": action_date[order],
+            "action_name": names[order],
+            "from_org_code": from_org[order],
+            "to_org_code": to_org[order],
+        }
+        self.keys, first_rows = np.unique(registration_no, return_index=True)
+        self.offsets = np.append(first_rows, size).astype(np.int64)
+
+        # Time since the previous action of the same grievance (NAT for first actions)
+        dates = self.columns["action_date"]
+        self.gaps = np.full(size, NAT, dtype=np.int64)
+        follows = np.ones(size, dtype=bool)
+        follows[first_rows] = False  # includes row 0
+        follows[1:] &= (dates[1:] != NAT) & (dates[:-1] != NAT)
+        self.gaps[follows] = dates[follows] - dates[np.flatnonzero(follows) - 1]
+
+        self.summary = self._summarize()
+        self.memory_mapped = False
+        self.build_seconds = time.perf_counter() - start
+
+    @classmethod
+    def empty(cls) -> "ActionHistoryIndex":
+        """Create an index with no actions."""
+        return cls({field: [] for field in ACTION_FIELDS})
+
+    def save(self, path: str) -> None:
+        """Write the index arrays and summary to a column store directory."""
+        arrays = {f"column.{name}": values for name, values in self.columns.items()}
+        arrays.update({"keys": self.keys, "offsets": self.offsets, "gaps": self.gaps})
+        write_column_store(path, arrays, {
+            "source": self.source,
+            "source_stamp": self.source_stamp,
+            "action_names": self.action_names,
+            "org_codes": self.org_codes,
+            "summary": self.summary,
+        })
+
+    @classmethod
+    def open(cls, path: str) -> "ActionHistoryIndex":
+        """Open a column store written by save, memory-mapping every array."""
+        start = time.perf_counter()
+        arrays, meta = open_column_store(path)
+        index = cls.__new__(cls)
+        index.source = meta["source"]
+        index.source_stamp = meta.get("source_stamp", {})
+        index.action_names = meta["action_names"]
+        index.org_codes = meta["org_codes"]
+        index.columns = {name[len("column."):]: values for name, values in arrays.items() if name.startswith("column.")}
+        index.keys = arrays["keys"]
+        index.offsets = arrays["offsets"]
+        index.gaps = arrays["gaps"]
+        index.summary = meta["summary"]
+        index.memory_mapped = True
+        index.build_seconds = time.perf_counter() - start
+        return index
+
+    @property
+    def size(self) -> int:
+        """Number of actions."""
+        return len(self.gaps)
+
+    def rows(self, registration_no: str) -> Optional[slice]:
+        """Row range of a grievance's actions, or None if it has none."""
+        i = int(np.searchsorted(self.keys, registration_no))
+        if i == len(self.keys) or self.keys[i] != registration_no:
+            return None
+        return slice(int(self.offsets[i]), int(self.offsets[i + 1]))
+
+    def timeline(self, registration_no: str) -> Optional[Dict[str, list]]:
+        """Columns of a grievance's actions in order, or None if it has none."""
+        rows = self.rows(registration_no)
+        if rows is None:
+            return None
+        dates = self.columns["action_date"][rows]
+        gaps = self.gaps[rows]
+        labels = np.datetime_as_string(dates.view("datetime64[ms]"), timezone="UTC").tolist()
+        return {
+            "action_srno": self.columns["action_srno"][rows].tolist(),
+            "action_date": [None if d == NAT else label for d, label in zip(dates.tolist(), labels)],
+            "action_name": [self.action_names[code] for code in self.columns["action_name"][rows].tolist()],
+            "from_org_code": [self.org_codes[code] for code in self.columns["from_org_code"][rows].tolist()],
+            "to_org_code": [self.org_codes[code] for code in self.columns["to_org_code"][rows].tolist()],
+            "days_since_previous": [None if gap == NAT else round(gap / MS_PER_DAY, 2) for gap in gaps.tolist()],
+        }
+
+    def _summarize(self) -> Dict[str, Any]:
+        """Actions per grievance and time between consecutive actions, by action name."""
+        per_grievance = np.diff(self.offsets)
+        action_counts, grievances = np.unique(per_grievance, return_counts=True)
+
+        has_gap = self.gaps != NAT
+        gap_days = self.gaps[has_gap] / MS_PER_DAY
+        gap_names = self.columns["action_name"][has_gap]
+        order = np.argsort(gap_names, kind="stable")
+        gap_names, gap_days = gap_names[order], gap_days[order]
+        names, starts = np.unique(gap_names, return_index=True)
+        handoffs = []
+        for code, days in zip(names.tolist(), np.split(gap_days, starts[1:])):
+            median, p90 = np.percentile(days, [50, 90])
+            handoffs.append({
+                "action_name": self.action_names[code],
+                "count": len(days),
+                "median_days": round(float(median), 2),
+                "p90_days": round(float(p90), 2),
+            })
+        handoffs.sort(key=lambda handoff: -handoff["count"])
+
+        return {
+            "grievances": len(self.keys),
+            "actions": self.size,
+            "mean_actions": round(float(per_grievance.mean()), 2) if len(per_grievance) else 0.0,
+            "max_actions": int(per_grievance.max()) if len(per_grievance) else 0,
+            "per_grievance": [
+                {"actions": actions, "grievances": count}
+                for actions, count in zip(action_counts.tolist(), grievances.tolist())
+            ],
+            "handoffs": handoffs,
+        }
+
+
+_actions: Optional[ActionHistoryIndex] = None
+
+
+def get_action_history_path() -> str:
+    """Action history location, overridable with the ACTION_HISTORY_DATA_PATH environment variable.
+
+    Defaults to the column store when one has been built, else the JSON file
+    (load_actions reads the JSON instead of a store built before it changed).
+    """
+    default = DEFAULT_ACTION_HISTORY_PATH
+    if is_column_store(str(DEFAULT_ACTION_STORE_PATH)):
+        default = DEFAULT_ACTION_STORE_PATH
+    return os.getenv("ACTION_HISTORY_DATA_PATH", str(default))
+
+
+def load_actions(path: Optional[str] = None) -> ActionHistoryIndex:
+    """Load the action history dataset (or open its column store) into the shared index."""
+    global _actions
+    path = path or get_action_history_path()
+    if not os.path.exists(path):
+        logger.warning(f"Action history not found at {path}; serving an empty index")
+        _actions = ActionHistoryIndex.empty()
+        return _actions
+
+    if is_column_store(path):
+        source = stale_source(path)
+        if source is not None:
+            logger.warning(f"Column store {path} is older than {source}; loading {source} instead "
+                           f"(rebuild with `python -m app.services.action_history`)")
+            path = source
+    if is_column_store(path):
+        _actions = ActionHistoryIndex.open(path)
+    else:
+        stamp = source_stamp(path)
+        _actions = ActionHistoryIndex(read_columns(path, ACTION_FIELDS, ACTION_LAYOUT), source=path)
+        _actions.source_stamp = stamp
+    logger.info(
+        f"{'Opened' if _actions.memory_mapped else 'Indexed'} {_actions.size} actions of "
+        f"{len(_actions.keys)} grievances from {path} in {_actions.build_seconds * 1000:.0f} ms"
+    )
+    return _actions
+
+
+def get_actions() -> ActionHistoryIndex:
+    """Return the shared action history index, loading it on first use."""
+    if _actions is None:
+        return load_actions()
+    return _actions
+
+
+def main():
+    """Convert the action history dataset into a memory-mappable column store."""
+    parser = argparse.ArgumentParser(description="Build the action history column store opened at startup")
+    parser.add_argument("--data", default=None, help="Converted action history (default: ACTION_HISTORY_DATA_PATH)")
+    parser.add_argument("--output", default=str(DEFAULT_ACTION_STORE_PATH), help="Column store directory to write")
+    args = parser.parse_args()
+
+    data_path = args.data or os.getenv("ACTION_HISTORY_DATA_PATH", str(DEFAULT_ACTION_HISTORY_PATH))
+    if is_column_store(data_path):
+        parser.error(f"{data_path} is already a column store")
+    index = load_actions(data_path)
+    index.save(args.output)
+    opened = ActionHistoryIndex.open(args.output)
+    print(f"Dataset:    {data_path} ({index.size:,} actions)")
+    print(f"Store:      {args.output}")
+    print(f"Build time: {index.build_seconds:.2f} s")
+    print(f"Open time:  {opened.build_seconds * 1000:.1f} ms ({opened.size:,} actions)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+import numpy as np
+
+from app.services.dates import NAT, parse_dates
+from app.services.records import RecordLayout
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet support is optional
+    pq = None
+
+
+# Characters of a JSON dataset read at a time
+JSON_BUFFER_SIZE = 1024 * 1024
+# "}," positions tried as the end of a buffer's complete objects
+JSON_CUT_ATTEMPTS = 8
+
+
+def iter_json_chunks(infile: TextIO, buffer_size: int = JSON_BUFFER_SIZE) -> Iterator[List[Any]]:
+    """Incrementally yield the elements of a top-level JSON array, a list at a time.
+
+    The file is read a buffer at a time, as by ``fix_json_streaming.iter_json_array``
+    (the backend is deployed without scripts/), but each buffer's complete
+    elements are decoded by one json.loads call: the text up to the last
+    "}," is tried as an array, which only parses if that "}," ends a
+    top-level object (one inside a string or a nested object leaves the
+    array unterminated). Objects, one per line as the converters write
+    them, are thus decoded at json.load speed while only about one buffer
+    of text is held; other elements are decoded once the file is read.
+    """
+    pending = ""
+    while not pending.strip():
+        text = infile.read(buffer_size)
+        if not text:
+            break
+        pending += text
+    pending = pending.lstrip()
+    if not pending.startswith("["):
+        raise ValueError("Expected a top-level JSON array")
+    pending = pending[1:]
+
+    while True:
+        text = infile.read(buffer_size)
+        if not text:
+            # What is left must be the last elements and the closing bracket
+            yield json.loads("[" + pending)
+            return
+        pending += text
+        end = len(pending)
+        for _ in range(JSON_CUT_ATTEMPTS):
+            end = pending.rfind("},", 0, end)
+            if end < 0:
+                break
+            try:
+                chunk = json.loads("[" + pending[:end + 1] + "]")
+            except json.JSONDecodeError:
+                continue
+            yield chunk
+            pending = pending[end + 2:]
+            break
+
+
+def read_columns(path: str, columns: Optional[List[str]] = None,
+                 layout: RecordLayout = RecordLayout()) -> Dict[str, Any]:
+    """Read selected columns of a converted grievance/action-history dataset.
+
+    Parquet files (written by ``fix_json_streaming.py --format parquet``) are
+    read column by column, so only the requested columns are decoded. Plain
+    JSON arrays are streamed and projected a buffer at a time (see
+    iter_json_chunks), so neither the file text nor one dict per record is
+    ever held whole. Date fields of the layout come back as int64 arrays of
+    epoch milliseconds (NAT if missing, see parse_dates), other columns as
+    lists, with the strings of interned fields shared.
+    """
+    if Path(path).suffix == ".parquet":
+        if pq is None:
+            raise RuntimeError("Reading Parquet datasets requires pyarrow")
+        parquet_file = pq.ParquetFile(path)
+        available = parquet_file.schema_arrow.names
+        if columns is None:
+            columns = available
+        data = parquet_file.read(columns=[c for c in columns if c in available]).to_pydict()
+        rows = parquet_file.metadata.num_rows
+        return {column: data.get(column, [None] * rows) for column in columns}
+
+    data: Dict[str, List[Any]] = {column: [] for column in columns or []}
+    interned: Dict[str, Dict[str, str]] = {field: {} for field in layout.interned}
+    rows = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for chunk in iter_json_chunks(f):
+            if columns is None:
+                for key in dict.fromkeys(key for record in chunk for key in record):
+                    if key not in data:
+                        data[key] = [np.full(rows, NAT)] if key in layout.dates else [None] * rows
+            for column, values in data.items():
+                chunk_values = [record.get(column) for record in chunk]
+                if column in layout.dates:
+                    values.append(parse_dates(chunk_values))
+                elif column in interned:
+                    try:
+                        values.extend(map(interned[column].setdefault, chunk_values, chunk_values))
+                    except TypeError:  # unhashable values are kept as they are
+                        values.extend(chunk_values[len(values) - rows:])
+                        interned.pop(column)
+                else:
+                    values.extend(chunk_values)
+            rows += len(chunk)
+
+    return {
+        column: np.concatenate([np.empty(0, dtype=np.int64), *values]) if column in layout.dates else values
+        for column, values in data.items()
+    }
+
+
+# Bumped whenever the arrays a column store must contain change
+COLUMN_STORE_FORMAT = 2
+META_FILE = "meta.json"
+
+
+def is_column_store(path: str) -> bool:
+    """Whether a path is a column store directory written by write_column_store."""
+    return os.path.isfile(os.path.join(path, META_FILE))
+
+
+def source_stamp(path: str) -> Dict[str, Any]:
+    """Identity of a dataset file (absolute path, size, mtime), kept in the stores built from it"""
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def stale_source(path: str) -> Optional[str]:
+    """The dataset a column store was built from, if it changed since; None if unchanged or gone.
+
+    Stores written before sources were stamped count as stale when their
+    source still exists.
+    """
+    with open(os.path.join(path, META_FILE), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    stamp = meta.get("source_stamp") or {}
+    source = stamp.get("path") or meta.get("source")
+    if not source or not os.path.isfile(source):
+        return None
+    return None if source_stamp(source) == stamp else source
+
+
+def write_column_store(path: str, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> None:
+    """Write named arrays (one .npy file each) and JSON metadata to a directory.
+
+    The directory is written next to the target as path.tmp. Once complete,
+    the previous store is renamed aside to path.old, the new one renamed
+    into place, and only then is the old one deleted. A crash leaves either
+    store whole, and a reader never sees a half-written or half-deleted
+    directory. Between the two renames, an instant, path does not exist.
+    """
+    path = path.rstrip("/")
+    tmp_path, old_path = path + ".tmp", path + ".old"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    for name, values in arrays.items():
+        np.save(os.path.join(tmp_path, f"{name}.npy"), np.ascontiguousarray(values), allow_pickle=False)
+    with open(os.path.join(tmp_path, META_FILE), "w", encoding="utf-8") as f:
+        json.dump({"format": COLUMN_STORE_FORMAT, "arrays": list(arrays), **meta}, f, ensure_ascii=False)
+    shutil.rmtree(old_path, ignore_errors=True)
+    if os.path.exists(path):
+        os.rename(path, old_path)
+    os.rename(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+
+def open_column_store(path: str) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """Open a column store directory with every array memory-mapped.
+
+    Arrays are mapped copy-on-write: pages are read lazily and shared with
+    every other process mapping the same files through the OS page cache,
+    and in-place updates stay private to this process.
+    """
+    with open(os.path.join(path, META_FILE), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("format") != COLUMN_STORE_FORMAT:
+        raise ValueError(f"Column store {path} has format {meta.get('format')}, expected {COLUMN_STORE_FORMAT}")
+    arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="c") for name in meta["arrays"]}
+    return arrays, meta
+
@@ -0,0 +1,180 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Sequence
+
+import numpy as np
+
+# Sentinel for missing dates, identical to NumPy's NaT
+NAT = np.iinfo(np.int64).min
+MS_PER_DAY = 86_400_000
+MS_PER_MINUTE = 60_000
+
+# Rows parsed per block by parse_dates (bounds the per-character work arrays)
+PARSE_BLOCK_ROWS = 65_536
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def to_epoch_ms(value: Any) -> int:
+    """Convert an ISO date string or datetime to epoch milliseconds (NAT if missing)."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return NAT
+    if not isinstance(value, datetime):
+        return NAT
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - EPOCH) // timedelta(milliseconds=1)
+
+
+# Digit columns of YYYY-MM-DDTHH:MM:SS.fff, and the weights that turn them into
+# (year, month, day, hour, minute, second, millisecond) with one matrix product
+DIGIT_COLUMNS = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18, 20, 21, 22]
+FIELD_WEIGHTS = np.zeros((len(DIGIT_COLUMNS), 7))
+for field, (start, stop) in enumerate([(0, 4), (4, 6), (6, 8), (8, 10), (10, 12), (12, 14), (14, 17)]):
+    FIELD_WEIGHTS[start:stop, field] = 10.0 ** np.arange(stop - start - 1, -1, -1)
+DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+# Characters needed to read every column of the longest layout plus a +HH:MM zone
+LAYOUT_WIDTH = 29
+
+
+def _days_from_civil(year: np.ndarray, month: np.ndarray, day: np.ndarray) -> np.ndarray:
+    """Days since 1970-01-01 of proleptic Gregorian dates (H. Hinnant's algorithm)."""
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * ((month + 9) % 12) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146_097 + day_of_era - 719_468
+
+
+def _parse_fields(fields: np.ndarray) -> np.ndarray:
+    """Epoch ms from (year, month, day, hour, minute, second, ms) rows (NAT if out of range)."""
+    year, month, day, hour, minute, second, millis = fields.astype(np.int64).T
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_days = DAYS_IN_MONTH[np.clip(month, 0, 12)] + (leap & (month == 2))
+    ok = (month >= 1) & (month <= 12) & (day >= 1) & (day <= month_days)
+    ok &= (hour < 24) & (minute < 60) & (second < 60)
+    epoch_ms = (((_days_from_civil(year, month, day) * 24 + hour) * 60 + minute) * 60 + second) * 1000 + millis
+    return np.where(ok, epoch_ms, NAT)
+
+
+def _parse_other(chars: np.ndarray, keep: np.ndarray) -> np.ndarray:
+    """Epoch ms of the first ``keep`` characters of each row, parsed by NumPy."""
+    n, width = chars.shape
+    chars = np.where(np.arange(width) < keep[:, None], chars, 0).astype(np.uint32)
+    local = chars.view(f"U{width}").reshape(n)
+    try:
+        return local.astype("datetime64[ms]").astype(np.int64)
+    except ValueError:
+        # Some value looked like a date but is not one
+        return np.fromiter((_parse_local(value) for value in local.tolist()), dtype=np.int64, count=n)
+
+
+def _parse_local(value: str) -> int:
+    try:
+        return int(np.datetime64(value, "ms").astype(np.int64))
+    except ValueError:
+        return NAT
+
+
+def _parse_date_block(text: np.ndarray) -> np.ndarray:
+    """Parse one block of date strings (bytes or unicode, see parse_dates)."""
+    n = len(text)
+    chars = text.view(np.uint8 if text.dtype.kind == "S" else np.uint32).reshape(n, -1)
+    width = chars.shape[1]
+    if width < 10:
+        return np.full(n, NAT, dtype=np.int64)
+    if width < LAYOUT_WIDTH:
+        chars = np.pad(chars, ((0, 0), (0, LAYOUT_WIDTH - width)))
+    # Strings are NUL-padded; rows shorter than 10 characters fail the date check anyway
+    lengths = 10 + np.count_nonzero(chars[:, 10:], axis=1)
+    digits = chars[:, DIGIT_COLUMNS] - np.float64(ord("0"))
+    is_digit = (digits >= 0) & (digits <= 9)
+    separators = chars[:, [4, 7, 10, 13, 16, 19]]
+
+    # Only YYYY-MM-DD... values are parsed; anything else is missing
+    valid = (lengths >= 10) & (separators[:, 0] == ord("-")) & (separators[:, 1] == ord("-"))
+    valid &= is_digit[:, :8].all(axis=1)
+    has_time = valid & (lengths > 10) & ((separators[:, 2] == ord("T")) | (separators[:, 2] == ord(" ")))
+
+    # Trailing zone: Z, +HHMM (MongoDB exports) or +HH:MM (Python isoformat)
+    row_lengths = lengths[valid]
+    if len(row_lengths) and row_lengths.min() == row_lengths.max():
+        # Usual case: one layout throughout the column
+        tail = chars[:, row_lengths[0] - 6:row_lengths[0]]
+    else:
+        tail = np.take_along_axis(chars, np.clip(lengths[:, None] - 6, 0, None) + np.arange(6), axis=1)
+    tail_digit = (tail >= ord("0")) & (tail <= ord("9"))
+    zulu = has_time & (tail[:, 5] == ord("Z"))
+    compact = has_time & ((tail[:, 1] == ord("+")) | (tail[:, 1] == ord("-"))) & tail_digit[:, 2:].all(axis=1)
+    extended = (has_time & ((tail[:, 0] == ord("+")) | (tail[:, 0] == ord("-"))) & (tail[:, 3] == ord(":"))
+                & tail_digit[:, [1, 2, 4, 5]].all(axis=1))
+    keep = lengths - zulu - 5 * compact - 6 * extended
+
+    # Zone offsets in minutes east of UTC
+    zone = np.where(compact[:, None], tail[:, 1:], tail[:, [0, 1, 2, 4, 5]]).astype(np.int64) - ord("0")
+    offset = (zone[:, 1] * 10 + zone[:, 2]) * 60 + zone[:, 3] * 10 + zone[:, 4]
+    offset = np.where(zone[:, 0] == ord("-") - ord("0"), -offset, offset)
+    offset[~(compact | extended)] = 0
+
+    # The layouts found in the exports (date, to seconds, to milliseconds) are
+    # read straight from their digits
+    with_time = (has_time & (separators[:, 3] == ord(":")) & (separators[:, 4] == ord(":"))
+                 & is_digit[:, 8:14].all(axis=1))
+    with_ms = with_time & (keep == 23) & (separators[:, 5] == ord(".")) & is_digit[:, 14:].all(axis=1)
+    with_time &= (keep == 19) | with_ms
+    fixed = valid & ((keep == 10) | with_time)
+    digits[~with_time, 8:] = 0
+    digits[~with_ms, 14:] = 0
+    epoch_ms = np.where(fixed, _parse_fields(digits @ FIELD_WEIGHTS), NAT)
+
+    other = valid & ~fixed
+    if other.any():
+        epoch_ms[other] = _parse_other(chars[other, :width], keep[other])
+
+    parsed = epoch_ms != NAT
+    epoch_ms[parsed] -= offset[parsed] * MS_PER_MINUTE
+    return epoch_ms
+
+
+def parse_dates(values: Sequence[Any]) -> np.ndarray:
+    """Convert a whole column of dates to epoch milliseconds (NAT if missing).
+
+    Vectorized counterpart of to_epoch_ms for loading columns: values are
+    parsed block by block with NumPy instead of one datetime at a time.
+    Accepts ISO strings ending in ``Z``, ``+0000``/``+HHMM``, ``+HH:MM`` or
+    no zone (taken as UTC), and datetimes. None and malformed values become
+    NAT, so ``parse_dates(values) == NAT`` is the null mask. An int64 array
+    is taken as epoch milliseconds already (see read_columns) and returned
+    as is.
+    """
+    if isinstance(values, np.ndarray) and values.dtype == np.int64:
+        return values
+    result = np.empty(len(values), dtype=np.int64)
+    for start in range(0, len(values), PARSE_BLOCK_ROWS):
+        block = values[start:start + PARSE_BLOCK_ROWS]
+        # None and other non-dates stringify to text that fails the date check.
+        # ASCII bytes are a quarter the size of NumPy unicode strings
+        try:
+            text = np.array(block, dtype=bytes)
+        except UnicodeEncodeError:
+            text = np.array(block, dtype=str)
+        result[start:start + len(block)] = _parse_date_block(text)
+    return result
+
+
+def to_month_index(epoch_ms: np.ndarray) -> np.ndarray:
+    """Convert epoch milliseconds to months since 1970-01 (NaT stays NaT)."""
+    return epoch_ms.view("datetime64[ms]").astype("datetime64[M]").astype(np.int64)
+
+
+def days_to_month_index(days: np.ndarray) -> np.ndarray:
+    """Convert days since 1970-01-01 to months since 1970-01."""
+    return days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+
+
+def month_label(month_index: int) -> str:
+    """Format a months-since-1970 index as YYYY-MM."""
+    return str(np.datetime64(int(month_index), "M"))
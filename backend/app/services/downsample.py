@@ -0,0 +1,49 @@
+import numpy as np
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Pick the indices of ``n_out`` points that preserve the shape of a series.
+
+    Largest-Triangle-Three-Buckets: the first and last points are always
+    kept, the points in between are split into ``n_out - 2`` equal buckets,
+    and from each bucket the point forming the largest triangle with the
+    previously kept point and the mean of the next bucket is kept.
+
+    Bucket edges and means are computed for all buckets at once; the only
+    Python-level loop is over output buckets (each step a vectorised argmax
+    over one bucket), so the cost is O(len(x)) NumPy work plus O(n_out).
+    ``x`` must be sorted. Returns all indices if no downsampling is needed.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+
+    # n_out - 2 buckets over points 1 .. n-2; edges are strictly increasing
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+    lengths = ends - starts
+
+    # Mean of every bucket; the anchor for bucket k is the mean of bucket k + 1,
+    # and for the last bucket it is the last point
+    mean_x = np.add.reduceat(x[1:n - 1], starts - 1) / lengths
+    mean_y = np.add.reduceat(y[1:n - 1], starts - 1) / lengths
+    anchor_x = np.append(mean_x[1:], x[-1])
+    anchor_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for k in range(n_out - 2):
+        start, end = starts[k], ends[k]
+        prev_x, prev_y = x[previous], y[previous]
+        # Twice the triangle area; the constant factor does not change the argmax
+        area = np.abs(
+            (prev_x - anchor_x[k]) * (y[start:end] - prev_y)
+            - (prev_x - x[start:end]) * (anchor_y[k] - prev_y)
+        )
+        previous = start + int(np.argmax(area))
+        selected[k + 1] = previous
+    return selected
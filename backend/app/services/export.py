@@ -0,0 +1,168 @@
+import asyncio
+import base64
+import binascii
+import csv
+import io
+import os
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.dates import NAT
+from app.services.grievance_store import CODED_FIELDS, GRIEVANCE_FIELDS, GrievanceStore
+from app.services.query import GrievanceFilter
+from app.services.serialization import dumps
+
+# Store rows scanned per exported batch; bounds the memory of an export
+DEFAULT_BATCH_ROWS = int(os.getenv("EXPORT_BATCH_ROWS", "5000"))
+
+DATE_FIELDS = ("recvd_date", "closing_date")
+# Integer fields stored as -1 when missing
+OPTIONAL_INT_FIELDS = ("CategoryV7", "pincode")
+
+
+class StaleCursor(ValueError):
+    """A cursor issued for a dataset version that is no longer current"""
+
+
+class Snapshot:
+    """The columns and labels of a store at one dataset version.
+
+    Ingests never change a published store: they build an updated copy,
+    with its own columns, labels and label index, and publish that (see
+    grievance_store.ingest). Holding the ones current at the start, an
+    export reads the same rows, in the same order, with the same labels,
+    for its whole length, whatever is ingested meanwhile. Filters compile
+    against a snapshot as against a store.
+    """
+
+    def __init__(self, store: GrievanceStore):
+        self.columns = store.columns
+        self.labels = store.labels
+        self.label_index = store.label_index
+        self.version = store.version
+        self.size = store.size
+
+    def code_of(self, field: str, label: Optional[str]) -> Optional[int]:
+        """Return the integer code of a label (None if no label given, -1 if unknown)."""
+        if label is None:
+            return None
+        return self.label_index[field].get(label, -1)
+
+
+def record_columns(snapshot: Snapshot, rows: np.ndarray) -> Dict[str, List[Any]]:
+    """Converted grievance values of some rows, as parallel column lists
+
+    Values are those of the converted dataset: ISO dates, labels for coded
+    fields, None for missing dates, categories and pincodes.
+    """
+    columns: Dict[str, List[Any]] = {}
+    for field in GRIEVANCE_FIELDS:
+        values = snapshot.columns[field][rows]
+        if field in DATE_FIELDS:
+            labels = np.datetime_as_string(values.view("datetime64[ms]"), timezone="UTC").tolist()
+            columns[field] = [None if value == NAT else label for value, label in zip(values.tolist(), labels)]
+        elif field in CODED_FIELDS:
+            labels = snapshot.labels[field]
+            columns[field] = [labels[code] for code in values.tolist()]
+        elif field in OPTIONAL_INT_FIELDS:
+            columns[field] = [None if value < 0 else value for value in values.tolist()]
+        else:
+            columns[field] = [value or None for value in values.tolist()]
+    return columns
+
+
+def iter_batches(snapshot: Snapshot, filters: GrievanceFilter, start_row: int = 0,
+                 batch_rows: int = DEFAULT_BATCH_ROWS) -> Iterator[Tuple[int, np.ndarray]]:
+    """(next row, matching row indexes) for each batch of scanned rows, from start_row on
+
+    Only the rows inside the filter's date range are scanned (rows are
+    sorted by received date), batch_rows at a time, so each batch costs the
+    same whatever the size of the store or the selection.
+    """
+    predicate = filters.compile(snapshot)
+    lo = max(start_row, predicate.lo)
+    for batch_lo in range(lo, predicate.hi, batch_rows):
+        batch_hi = min(batch_lo + batch_rows, predicate.hi)
+        yield batch_hi, batch_lo + np.flatnonzero(predicate.scan(snapshot.columns, batch_lo, batch_hi))
+
+
+def ndjson_lines(columns: Dict[str, List[Any]]) -> bytes:
+    """Records as newline-delimited JSON, one object per line"""
+    names = list(columns)
+    return b"".join(dumps(dict(zip(names, row))) + b"\n" for row in zip(*columns.values()))
+
+
+def csv_lines(columns: Dict[str, List[Any]]) -> bytes:
+    """Records as CSV rows (missing values empty), without a header"""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(zip(*columns.values()))
+    return buffer.getvalue().encode("utf-8")
+
+
+ENCODERS = {"ndjson": ndjson_lines, "csv": csv_lines}
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+async def stream_records(snapshot: Snapshot, filters: GrievanceFilter, fmt: str,
+                         batch_rows: int = DEFAULT_BATCH_ROWS) -> AsyncIterator[bytes]:
+    """Encoded chunks of every record matching filters, one per batch of rows
+
+    Meant for a StreamingResponse: the server awaits sending each chunk
+    before asking for the next, so a slow client pauses the export instead
+    of letting chunks pile up, and at most one batch is held in memory.
+    Each batch yields to the event loop, so long exports do not starve
+    other requests.
+    """
+    encode = ENCODERS[fmt]
+    if fmt == "csv":
+        yield csv_lines({field: [field] for field in GRIEVANCE_FIELDS})
+    for _, rows in iter_batches(snapshot, filters, batch_rows=batch_rows):
+        if len(rows):
+            yield encode(record_columns(snapshot, rows))
+        await asyncio.sleep(0)
+
+
+def encode_cursor(version: int, row: int) -> str:
+    """Opaque cursor for resuming an export at a store row of a dataset version"""
+    return base64.urlsafe_b64encode(f"{version}:{row}".encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, version: int) -> int:
+    """Store row a cursor resumes at; ValueError if malformed, StaleCursor if issued for another version"""
+    try:
+        text = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        cursor_version, row = (int(part) for part in text.split(":"))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    if cursor_version != version:
+        raise StaleCursor(f"Cursor is for dataset version {cursor_version}, now {version}; restart the export")
+    if row < 0:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return row
+
+
+def page_records(snapshot: Snapshot, filters: GrievanceFilter, limit: int, cursor: Optional[str] = None,
+                 batch_rows: int = DEFAULT_BATCH_ROWS) -> Dict[str, Any]:
+    """Up to limit matching records from a cursor on, and the cursor of the next page (None on the last)"""
+    start_row = decode_cursor(cursor, snapshot.version) if cursor else 0
+    pages: List[np.ndarray] = []
+    remaining = limit
+    next_row: Optional[int] = None
+    for batch_hi, rows in iter_batches(snapshot, filters, start_row, batch_rows):
+        if len(rows) > remaining:
+            pages.append(rows[:remaining])
+            next_row = int(rows[remaining])
+            break
+        pages.append(rows)
+        remaining -= len(rows)
+        if remaining == 0:
+            next_row = batch_hi
+            break
+    rows = np.concatenate(pages) if pages else np.zeros(0, dtype=np.int64)
+    columns = record_columns(snapshot, rows)
+    names = list(columns)
+    return {
+        "records": [dict(zip(names, row)) for row in zip(*columns.values())],
+        "next_cursor": encode_cursor(snapshot.version, next_row) if next_row is not None else None,
+    }
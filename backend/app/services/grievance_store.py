@@ -0,0 +1,634 @@
+import argparse
+import copy
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.dataset import (
+    is_column_store, open_column_store, read_columns, source_stamp, stale_source, write_column_store
+)
+from app.services.dates import NAT, MS_PER_DAY, days_to_month_index, month_label, parse_dates, to_month_index
+from app.services.heavy_hitters import HeavyHitters, build_heavy_hitters
+from app.services.metrics import timed
+from app.services.query import BitmapIndex
+from app.services.records import GRIEVANCE_LAYOUT
+from app.services.resolution import ResolutionSketch
+from app.services.trend_cube import TrendCube
+
+logger = logging.getLogger(__name__)
+
+# Repository root (backend/app/services/ -> repo)
+REPO_ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_DATA_PATH = REPO_ROOT / "data" / "fixed_grievance_v2.json"
+# Column store written by `python -m app.services.grievance_store`, preferred when present
+DEFAULT_STORE_PATH = REPO_ROOT / "data" / "grievance_store"
+
+# Low-cardinality text fields stored as integer codes into a label list
+CODED_FIELDS = ["state", "org_code", "dist_name", "sex"]
+GRIEVANCE_FIELDS = ["registration_no", "recvd_date", "closing_date", "CategoryV7", "pincode"] + CODED_FIELDS
+
+
+def factorize(values: List[Any], index: Optional[Dict[str, int]] = None) -> Tuple[np.ndarray, Dict[str, int]]:
+    """Encode values as int32 codes, extending a label -> code index (missing -> "Unknown")."""
+    index = {} if index is None else index
+    codes = np.empty(len(values), dtype=np.int32)
+    for i, value in enumerate(values):
+        label = "Unknown" if value is None or value == "" else str(value)
+        code = index.get(label)
+        if code is None:
+            code = index[label] = len(index)
+        codes[i] = code
+    return codes, index
+
+
+def count_by_code(codes: np.ndarray, n_labels: int, mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """Count rows per integer code, optionally restricted to a boolean mask."""
+    if mask is not None:
+        codes = codes[mask]
+    return np.bincount(codes, minlength=n_labels)
+
+
+def count_by_value(values: np.ndarray, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Count rows per distinct value; returns (distinct values, counts)."""
+    if mask is not None:
+        values = values[mask]
+    return np.unique(values, return_counts=True)
+
+
+def merge_counts(keys: np.ndarray, counts: np.ndarray, new_keys: np.ndarray, new_counts: np.ndarray):
+    """Add sparse (key, count) pairs into another sorted set, dropping zero counts."""
+    all_keys, inverse = np.unique(np.concatenate([keys, new_keys]), return_inverse=True)
+    merged = np.bincount(inverse.reshape(-1), weights=np.concatenate([counts, new_counts]), minlength=len(all_keys))
+    merged = merged.astype(np.int64)
+    nonzero = merged != 0
+    return all_keys[nonzero], merged[nonzero]
+
+
+def _series_from_cube(cube: TrendCube, metric: str) -> Dict[int, int]:
+    """Monthly counts of a cube metric keyed by months since 1970-01."""
+    buckets, counts = cube.series("month", metric)
+    return dict(zip(days_to_month_index(buckets).tolist(), counts.tolist()))
+
+
+def monthly_series(cube: TrendCube) -> Tuple[int, np.ndarray, np.ndarray]:
+    """First month and the dense monthly received / closed counts of a cube."""
+    received = _series_from_cube(cube, "received")
+    closed = _series_from_cube(cube, "closed")
+    months = list(received) + list(closed)
+    if months:
+        first_month = min(months)
+        n_months = max(months) - first_month + 1
+    else:
+        first_month, n_months = 0, 0
+    monthly_received = np.zeros(n_months, dtype=np.int64)
+    monthly_closed = np.zeros(n_months, dtype=np.int64)
+    for month, count in received.items():
+        monthly_received[month - first_month] = count
+    for month, count in closed.items():
+        monthly_closed[month - first_month] = count
+    return first_month, monthly_received, monthly_closed
+
+
+def category_totals(cube: TrendCube) -> Tuple[np.ndarray, np.ndarray]:
+    """CategoryV7 values with grievances received in a cube, and their counts."""
+    cells = cube.cells
+    categories, inverse = np.unique(cells["category"], return_inverse=True)
+    counts = np.bincount(inverse.reshape(-1), weights=cells["received"], minlength=len(categories)).astype(np.int64)
+    nonzero = counts > 0
+    return categories[nonzero], counts[nonzero]
+
+
+def top_labels(counts: np.ndarray, labels: List[str], limit: Optional[int] = None) -> List[Tuple[str, int]]:
+    """(label, count) pairs of per-code counts, largest first, zeros dropped."""
+    order = np.argsort(-counts, kind="stable")
+    if limit is not None:
+        order = order[:limit]
+    return [(labels[i], int(counts[i])) for i in order if counts[i] > 0]
+
+
+def top_categories(categories: np.ndarray, counts: np.ndarray, limit: Optional[int] = None) -> List[Tuple[int, int]]:
+    """(CategoryV7, count) pairs, largest first."""
+    order = np.argsort(-counts, kind="stable")
+    if limit is not None:
+        order = order[:limit]
+    return [(int(categories[i]), int(counts[i])) for i in order]
+
+
+class GrievanceStore:
+    """Column-oriented, in-memory view of the converted grievance dataset.
+
+    Each grievance field is held as a NumPy array, rows sorted by received
+    date. Text fields with few distinct values are integer codes into a label
+    list. Aggregates used by the chart endpoints are computed once, when the
+    store is built, so requests only format precomputed arrays. Ingested
+    deltas update rows and aggregates incrementally into a copy of the
+    store (see apply_records); a store is never changed once published.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], labels: Dict[str, List[str]], source: str = ""):
+        self.columns = self._latest_rows(columns)
+        self.labels = labels
+        self.label_index = {field: {label: i for i, label in enumerate(labels[field])} for field in CODED_FIELDS}
+        self.source = source
+        # Set by load_store to the source file's identity, saved with the store
+        self.source_stamp: Dict[str, Any] = {}
+        self.version = 1
+        self._row_index: Optional[Dict[str, int]] = None
+        self.memory_mapped = False
+        # Column store directory of a memory-mapped store (see open)
+        self.store_path = ""
+        self.load_seconds = 0.0
+        self.bitmaps = BitmapIndex()
+        self._sort_rows()
+        self._build_aggregates()
+
+    @property
+    def size(self) -> int:
+        """Number of grievances."""
+        return len(self.columns["recvd_date"])
+
+    @classmethod
+    def empty(cls) -> "GrievanceStore":
+        """Create a store with no rows."""
+        return cls.from_records({field: [] for field in GRIEVANCE_FIELDS})
+
+    @classmethod
+    def from_records(cls, data: Dict[str, List[Any]], source: str = "") -> "GrievanceStore":
+        """Build a store from column lists of converted grievance values."""
+        indexes: Dict[str, Dict[str, int]] = {field: {} for field in CODED_FIELDS}
+        columns = encode_columns(data, indexes)
+        return cls(columns, {field: list(indexes[field]) for field in CODED_FIELDS}, source)
+
+    def save(self, path: str) -> None:
+        """Write the columns and aggregates to a column store directory."""
+        arrays = {f"column.{name}": values for name, values in self.columns.items()}
+        arrays.update({f"cube.{name}": values for name, values in self.cube.cells.items()})
+        arrays.update({f"resolution.{name}": values for name, values in self.resolution.cells.items()})
+        arrays.update({f"counts.{field}": values for field, values in self.counts.items()})
+        for field, sketch in self.heavy_hitters.items():
+            arrays[f"heavy_hitters.{field}.counts"] = sketch.counts
+            arrays[f"heavy_hitters.{field}.candidates"] = sketch.candidates
+            arrays[f"heavy_hitters.{field}.candidate_counts"] = sketch.candidate_counts
+        arrays["month_district.keys"] = self.month_district_keys
+        arrays["month_district.counts"] = self.month_district_counts
+        write_column_store(path, arrays, {
+            "source": self.source,
+            "source_stamp": self.source_stamp,
+            "labels": self.labels,
+            "closed_total": self.closed_total,
+            "disposal_ms_total": self.disposal_ms_total,
+            "disposal_count": self.disposal_count,
+            "month_district_base": self._month_district_base,
+            "heavy_hitter_months": {field: sketch.first_month for field, sketch in self.heavy_hitters.items()},
+        })
+
+    @classmethod
+    def open(cls, path: str) -> "GrievanceStore":
+        """Open a column store written by save, memory-mapping every array.
+
+        Nothing is rebuilt: only the small derived series are computed, and
+        array pages are read on first access and shared between processes.
+        """
+        arrays, meta = open_column_store(path)
+        groups: Dict[str, Dict[str, np.ndarray]] = {}
+        for key, values in arrays.items():
+            group, name = key.split(".", 1)
+            groups.setdefault(group, {})[name] = values
+
+        store = cls.__new__(cls)
+        store.columns = groups["column"]
+        store.labels = meta["labels"]
+        store.label_index = {field: {label: i for i, label in enumerate(store.labels[field])} for field in CODED_FIELDS}
+        store.source = meta["source"]
+        store.source_stamp = meta.get("source_stamp", {})
+        store.version = 1
+        store._row_index = None
+        store.memory_mapped = True
+        store.store_path = path
+        store.load_seconds = 0.0
+        store.bitmaps = BitmapIndex()
+        store.counts = groups["counts"]
+        store.cube = TrendCube(groups["cube"])
+        store.resolution = ResolutionSketch(groups["resolution"])
+        heavy = groups["heavy_hitters"]
+        store.heavy_hitters = {
+            field: HeavyHitters(
+                first_month,
+                heavy[f"{field}.counts"],
+                heavy[f"{field}.candidates"],
+                heavy[f"{field}.candidate_counts"],
+            )
+            for field, first_month in meta["heavy_hitter_months"].items()
+        }
+        store.closed_total = meta["closed_total"]
+        store.disposal_ms_total = meta["disposal_ms_total"]
+        store.disposal_count = meta["disposal_count"]
+        store.month_district_keys = groups["month_district"]["keys"]
+        store.month_district_counts = groups["month_district"]["counts"]
+        store._month_district_base = meta["month_district_base"]
+        store._refresh_series()
+        return store
+
+    @timed("store.select")
+    def select(self, mask: np.ndarray) -> "GrievanceStore":
+        """A store of the rows in a boolean mask, with aggregates of those rows only.
+
+        Labels are shared, so codes mean the same in both stores. Rows are
+        already unique and sorted, so only the aggregates are built.
+        """
+        store = GrievanceStore.__new__(GrievanceStore)
+        store.columns = {name: values[mask] for name, values in self.columns.items()}
+        store.labels = self.labels
+        store.label_index = self.label_index
+        store.source = self.source
+        store.source_stamp = self.source_stamp
+        store.version = self.version
+        store._row_index = None
+        store.memory_mapped = False
+        store.store_path = ""
+        store.load_seconds = 0.0
+        store.bitmaps = BitmapIndex()
+        store._build_aggregates(heavy_hitters=False)
+        return store
+
+    @timed("store.select_cells")
+    def select_cells(self, mask: np.ndarray) -> "CubeSelection":
+        """Chart aggregates of the trend cube cells in a boolean mask (see TrendCube.mask).
+
+        For filters the cube has cells for, in place of select: nothing is
+        rebuilt from rows.
+        """
+        return CubeSelection(self.cube.select(mask), self.labels)
+
+    @staticmethod
+    def _latest_rows(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Keep only the last copy of each registration_no (appended updates win)."""
+        keys = columns["registration_no"]
+        if len(keys) == 0:
+            return columns
+        _, last_in_reversed = np.unique(keys[::-1], return_index=True)
+        keep = len(keys) - 1 - last_in_reversed
+        keep = np.union1d(keep, np.flatnonzero(keys == ""))
+        if len(keep) == len(keys):
+            return columns
+        return {name: values[keep] for name, values in columns.items()}
+
+    def _sort_rows(self) -> None:
+        """Order rows by received date (keeps date-range filters contiguous)."""
+        recvd = self.columns["recvd_date"]
+        if len(recvd) > 1 and np.any(recvd[1:] < recvd[:-1]):
+            order = np.argsort(recvd, kind="stable")
+            self.columns = {name: values[order] for name, values in self.columns.items()}
+            self._row_index = None
+
+    def _build_aggregates(self, heavy_hitters: bool = True) -> None:
+        """Precompute the group-by counts served by the chart endpoints.
+
+        Heavy-hitter sketches are only needed for whole-store windows, so
+        stores of selected rows skip them.
+        """
+        self.counts = {field: np.zeros(len(self.labels[field]), dtype=np.int64) for field in CODED_FIELDS}
+        self.cube = TrendCube.build(self.columns)
+        self.resolution = ResolutionSketch.build(self.columns)
+        self.heavy_hitters = build_heavy_hitters(self.columns) if heavy_hitters else {}
+        self.closed_total = 0
+        self.disposal_ms_total = 0
+        self.disposal_count = 0
+        self.month_district_keys = np.array([], dtype=np.int64)
+        self.month_district_counts = np.array([], dtype=np.int64)
+        self._month_district_base = len(self.labels["dist_name"]) + 1
+        self._update_aggregates(self.columns, sign=1, update_cube=False)
+        self._refresh_series()
+
+    def _update_aggregates(self, columns: Dict[str, np.ndarray], sign: int, update_cube: bool = True) -> None:
+        """Add (sign=1) or remove (sign=-1) the contribution of some rows."""
+        counts = {}
+        for field in CODED_FIELDS:
+            n_labels = len(self.labels[field])
+            current = self.counts[field]
+            if len(current) < n_labels:
+                current = np.pad(current, (0, n_labels - len(current)))
+            counts[field] = current + sign * count_by_code(columns[field], n_labels)
+        self.counts = counts
+
+        if update_cube:
+            self.cube = self.cube.merge(TrendCube.build(columns), sign)
+            self.resolution = self.resolution.merge(ResolutionSketch.build(columns), sign)
+            delta = build_heavy_hitters(columns)
+            self.heavy_hitters = {field: sketch.merge(delta[field], sign) for field, sketch in self.heavy_hitters.items()}
+
+        recvd = columns["recvd_date"]
+        closing = columns["closing_date"]
+        has_recvd = recvd != NAT
+        closed = closing != NAT
+        both = has_recvd & closed
+        self.closed_total += sign * int(closed.sum())
+        self.disposal_ms_total += sign * int((closing[both] - recvd[both]).sum())
+        self.disposal_count += sign * int(both.sum())
+
+        # (month, district) pair counts, for "districts reporting" per month
+        n_dists = len(self.labels["dist_name"]) + 1
+        keys = to_month_index(recvd[has_recvd]) * n_dists + columns["dist_name"][has_recvd]
+        if n_dists != self._month_district_base:
+            # Re-key existing pairs when the district label list grew
+            months, dists = np.divmod(self.month_district_keys, self._month_district_base)
+            self.month_district_keys = months * n_dists + dists
+        self._month_district_base = n_dists
+        new_keys, new_counts = np.unique(keys, return_counts=True)
+        self.month_district_keys, self.month_district_counts = merge_counts(
+            self.month_district_keys, self.month_district_counts, new_keys, sign * new_counts
+        )
+
+    def _refresh_series(self) -> None:
+        """Derive the monthly/daily series and category totals from the cube."""
+        self.first_month, self.monthly_received, self.monthly_closed = monthly_series(self.cube)
+        n_months = len(self.monthly_received)
+
+        district_months = self.month_district_keys // self._month_district_base - self.first_month
+        in_range = (district_months >= 0) & (district_months < n_months)
+        self.monthly_districts = np.bincount(district_months[in_range], minlength=n_months)
+
+        days, self.daily_received = self.cube.series("day", "received")
+        self.first_day = int(days[0]) if len(days) else 0
+        self.categories, self.category_counts = category_totals(self.cube)
+
+    @property
+    def avg_disposal_days(self) -> float:
+        """Mean days from receipt to closing over closed grievances."""
+        if not self.disposal_count:
+            return 0.0
+        return self.disposal_ms_total / self.disposal_count / MS_PER_DAY
+
+    @property
+    def months(self) -> List[str]:
+        """Month labels (YYYY-MM) matching the monthly series."""
+        return [month_label(self.first_month + i) for i in range(len(self.monthly_received))]
+
+    @property
+    def days(self) -> List[str]:
+        """Day labels (YYYY-MM-DD) matching the daily series."""
+        start = np.datetime64(self.first_day, "D")
+        return np.datetime_as_string(start + np.arange(len(self.daily_received))).tolist()
+
+    def top(self, field: str, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Return (label, count) pairs for a coded field, largest first."""
+        return top_labels(self.counts[field], self.labels[field], limit)
+
+    def code_of(self, field: str, label: Optional[str]) -> Optional[int]:
+        """Return the integer code of a label (None if no label given, -1 if unknown)."""
+        if label is None:
+            return None
+        return self.label_index[field].get(label, -1)
+
+    def top_categories(self, limit: Optional[int] = None) -> List[Tuple[int, int]]:
+        """Return (CategoryV7, count) pairs, largest first."""
+        return top_categories(self.categories, self.category_counts, limit)
+
+    def apply_records(self, data: Dict[str, List[Any]]) -> Tuple["GrievanceStore", Dict[str, Any]]:
+        """A copy of the store with converted grievance records upserted, and what changed.
+
+        Records are matched on registration_no. New records are appended,
+        changed ones overwrite their row, and only the affected rows are
+        added to / removed from the copy's aggregates. This store, and
+        everything it shares with stores made by select and with export
+        snapshots, is left untouched, so the copy can be built while
+        requests read this one and then published in one assignment (see
+        ingest).
+        """
+        store = copy.copy(self)
+        store.label_index = {field: dict(index) for field, index in self.label_index.items()}
+        store._row_index = dict(self._row_index) if self._row_index is not None else None
+        store.bitmaps = BitmapIndex()
+        store.memory_mapped = False
+        store.store_path = ""
+        return store, store._upsert(data)
+
+    def _upsert(self, data: Dict[str, List[Any]]) -> Dict[str, Any]:
+        """Upsert records into this (unpublished) store; every attribute is replaced, never mutated"""
+        start = time.perf_counter()
+        new = encode_columns(data, self.label_index)
+        self.labels = {field: list(self.label_index[field]) for field in CODED_FIELDS}
+
+        # Last copy of each key wins inside the delta as well
+        new = self._latest_rows(new)
+        if self._row_index is None:
+            self._row_index = {key: row for row, key in enumerate(self.columns["registration_no"].tolist()) if key}
+        rows = np.array([self._row_index.get(key, -1) if key else -1 for key in new["registration_no"].tolist()],
+                        dtype=np.int64)
+
+        existing = rows >= 0
+        changed = existing.copy()
+        if existing.any():
+            same = np.ones(int(existing.sum()), dtype=bool)
+            for name, values in new.items():
+                same &= self.columns[name][rows[existing]] == values[existing]
+            changed[existing] = ~same
+        added = ~existing
+
+        old_rows = rows[changed]
+        removed = {name: values[old_rows] for name, values in self.columns.items()}
+        upserts = {name: values[changed | added] for name, values in new.items()}
+        self._update_aggregates(removed, sign=-1)
+        self._update_aggregates(upserts, sign=1)
+
+        columns = {}
+        for name, values in new.items():
+            # A new array (widened to the delta's dtype if needed); the old one is left untouched
+            column = np.concatenate([self.columns[name], values[added]])
+            column[old_rows] = values[changed]
+            columns[name] = column
+        self.columns = columns
+        if added.any() and self._row_index is not None:
+            first_new = self.size - int(added.sum())
+            for offset, key in enumerate(new["registration_no"][added].tolist()):
+                if key:
+                    self._row_index[key] = first_new + offset
+        self._sort_rows()
+        self._refresh_series()
+        self.version += 1
+
+        return {
+            "added": int(added.sum()),
+            "updated": int(changed.sum()),
+            "unchanged": int(existing.sum() - changed.sum()),
+            "version": self.version,
+            "seconds": round(time.perf_counter() - start, 4),
+        }
+
+
+class CubeSelection:
+    """The aggregates of some trend cube cells that the chart endpoints read.
+
+    Has the monthly series, state / org_code / CategoryV7 counts and totals
+    of a store, summed from cells: grievances are counted on the day they
+    were received and closings on the day they were closed. Grievances with
+    no recvd_date are not in any received count.
+    """
+
+    def __init__(self, cube: TrendCube, labels: Dict[str, List[str]]):
+        self.cube = cube
+        self.labels = labels
+        self.first_month, self.monthly_received, self.monthly_closed = monthly_series(cube)
+        self.categories, self.category_counts = category_totals(cube)
+        received = cube.cells["received"]
+        self.counts = {
+            field: np.bincount(cube.cells[field], weights=received, minlength=len(labels[field])).astype(np.int64)
+            for field in ("state", "org_code")
+        }
+        self.size = int(received.sum())
+        self.closed_total = int(cube.cells["closed"].sum())
+
+    @property
+    def months(self) -> List[str]:
+        """Month labels (YYYY-MM) matching the monthly series."""
+        return [month_label(self.first_month + i) for i in range(len(self.monthly_received))]
+
+    def top(self, field: str, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Return (label, count) pairs for state or org_code, largest first."""
+        return top_labels(self.counts[field], self.labels[field], limit)
+
+    def top_categories(self, limit: Optional[int] = None) -> List[Tuple[int, int]]:
+        """Return (CategoryV7, count) pairs, largest first."""
+        return top_categories(self.categories, self.category_counts, limit)
+
+
+def encode_columns(data: Dict[str, List[Any]], indexes: Dict[str, Dict[str, int]]) -> Dict[str, np.ndarray]:
+    """Encode column lists of converted values into typed store columns."""
+    size = len(data.get("registration_no") or [])
+    columns = {
+        "registration_no": np.array([value or "" for value in data.get("registration_no", [])], dtype=str),
+        "recvd_date": parse_dates(data["recvd_date"]),
+        "closing_date": parse_dates(data["closing_date"]),
+        "CategoryV7": np.fromiter(
+            (int(v) if isinstance(v, (int, float)) else -1 for v in data["CategoryV7"]),
+            dtype=np.int64,
+            count=size,
+        ),
+        # Pincodes are digit strings in the dumps; anything else is missing (-1)
+        "pincode": np.fromiter(
+            (int(v) if isinstance(v, (int, float)) or (isinstance(v, str) and v.isdigit()) else -1
+             for v in data.get("pincode", [None] * size)),
+            dtype=np.int64,
+            count=size,
+        ),
+    }
+    for field in CODED_FIELDS:
+        columns[field], _ = factorize(data[field], indexes[field])
+    return columns
+
+
+_store: Optional[GrievanceStore] = None
+# Serializes ingests, so each builds on the store the previous one published
+_ingest_lock = threading.Lock()
+
+
+def get_data_path() -> str:
+    """Dataset location, overridable with the GRIEVANCE_DATA_PATH environment variable.
+
+    Defaults to the column store when one has been built, else the JSON file
+    (load_store reads the JSON instead of a store built before it changed).
+    """
+    default = DEFAULT_STORE_PATH if is_column_store(str(DEFAULT_STORE_PATH)) else DEFAULT_DATA_PATH
+    return os.getenv("GRIEVANCE_DATA_PATH", str(default))
+
+
+def load_store(path: Optional[str] = None) -> GrievanceStore:
+    """Load the grievance dataset (or open its column store) into the shared store."""
+    global _store
+    path = path or get_data_path()
+    start = time.perf_counter()
+    # Versions keep increasing across reloads so caches never confuse datasets
+    version = _store.version + 1 if _store is not None else 1
+    if not os.path.exists(path):
+        logger.warning(f"Grievance dataset not found at {path}; serving an empty store")
+        _store = GrievanceStore.empty()
+        _store.version = version
+        _store.load_seconds = time.perf_counter() - start
+        return _store
+
+    if is_column_store(path):
+        source = stale_source(path)
+        if source is not None:
+            logger.warning(f"Column store {path} is older than {source}; loading {source} instead "
+                           f"(rebuild with `python -m app.services.grievance_store`)")
+            path = source
+    if is_column_store(path):
+        store = GrievanceStore.open(path)
+    else:
+        stamp = source_stamp(path)
+        store = GrievanceStore.from_records(read_columns(path, GRIEVANCE_FIELDS, GRIEVANCE_LAYOUT), source=path)
+        store.source_stamp = stamp
+    store.version = version
+    store.load_seconds = time.perf_counter() - start
+    _store = store
+    if store.memory_mapped:
+        logger.info(f"Opened {_store.size} grievances from column store {path} in {store.load_seconds * 1000:.0f} ms")
+        return _store
+    logger.info(f"Loaded {_store.size} grievances from {path}")
+    logger.info(
+        f"Built trend cube: {_store.cube.size} cells, "
+        f"{_store.cube.nbytes / (1024 * 1024):.1f} MB in {_store.cube.build_seconds * 1000:.0f} ms"
+    )
+    logger.info(
+        f"Built resolution sketch: {_store.resolution.size} entries, "
+        f"{_store.resolution.nbytes / (1024 * 1024):.1f} MB in {_store.resolution.build_seconds * 1000:.0f} ms"
+    )
+    return _store
+
+
+def ingest(data: Dict[str, List[Any]]) -> Dict[str, Any]:
+    """Upsert converted grievance records into the shared store.
+
+    The updated store is built aside (see GrievanceStore.apply_records)
+    and published in one assignment, so a reader sees either the old store
+    or the new one. Blocking: call it from a worker thread.
+    """
+    global _store
+    with _ingest_lock:
+        store, result = get_store().apply_records(data)
+        _store = store
+    return result
+
+
+def use_store(store: GrievanceStore) -> None:
+    """Make a store the shared one, e.g. a column store opened in a worker process."""
+    global _store
+    _store = store
+
+
+def get_store() -> GrievanceStore:
+    """Return the shared store, loading it on first use."""
+    if _store is None:
+        return load_store()
+    return _store
+
+
+def main():
+    """Convert the grievance dataset into a memory-mappable column store."""
+    parser = argparse.ArgumentParser(description="Build the grievance column store opened at startup")
+    parser.add_argument("--data", default=None, help="Converted grievance dataset (default: GRIEVANCE_DATA_PATH)")
+    parser.add_argument("--output", default=str(DEFAULT_STORE_PATH), help="Column store directory to write")
+    args = parser.parse_args()
+
+    data_path = args.data or os.getenv("GRIEVANCE_DATA_PATH", str(DEFAULT_DATA_PATH))
+    if is_column_store(data_path):
+        parser.error(f"{data_path} is already a column store")
+    start = time.perf_counter()
+    store = load_store(data_path)
+    store.save(args.output)
+    build_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    opened = GrievanceStore.open(args.output)
+    print(f"Dataset:    {data_path} ({store.size:,} grievances)")
+    print(f"Store:      {args.output}")
+    print(f"Build time: {build_seconds:.2f} s")
+    print(f"Open time:  {(time.perf_counter() - start) * 1000:.1f} ms ({opened.size:,} grievances)")
+
+
+if __name__ == "__main__":
+    main()
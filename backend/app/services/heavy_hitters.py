@@ -0,0 +1,259 @@
+import argparse
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from app.services.dates import NAT, to_month_index
+from app.services.metrics import timed
+
+# High-cardinality fields with heavy-hitter sketches
+HEAVY_HITTER_FIELDS = ["dist_name", "pincode", "CategoryV7"]
+
+# Count-Min sketch shape: estimates overshoot by at most e / WIDTH of the
+# window total, with probability 1 - e**-DEPTH
+WIDTH = 4096
+DEPTH = 4
+# Most frequent values kept per month; a window's top-K is drawn from these
+CANDIDATES = 256
+
+# Multiply-shift hashing (one odd multiplier per sketch row), fixed so that
+# sketches built at different times can be merged
+_SHIFT = np.uint64(64 - int(np.log2(WIDTH)))
+_rng = np.random.default_rng(1_000_003)
+_MULTIPLIERS = _rng.integers(1, 2**62, size=DEPTH, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_OFFSETS = _rng.integers(0, 2**62, size=DEPTH, dtype=np.uint64)
+
+
+def hash_rows(keys: np.ndarray) -> np.ndarray:
+    """Count-Min column of each key in each sketch row, shape (DEPTH, len(keys))."""
+    x = keys.astype(np.int64).view(np.uint64)
+    return ((_MULTIPLIERS[:, None] * x[None, :] + _OFFSETS[:, None]) >> _SHIFT).astype(np.int64)
+
+
+def error_bound(total: int) -> int:
+    """Count-Min overestimate bound for a window holding `total` values."""
+    return int(np.ceil(np.e / WIDTH * total))
+
+
+@timed("top_k.count")
+def count_values(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Distinct values and their counts (bincount when the value range is small)."""
+    if len(values) == 0:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+    low, high = int(values.min()), int(values.max())
+    if high - low > 4 * len(values) + 4096:
+        return np.unique(values, return_counts=True)
+    counts = np.bincount(values.astype(np.int64) - low)
+    present = np.flatnonzero(counts)
+    return present + low, counts[present]
+
+
+def lookup_counts(values: np.ndarray, counted: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Counts of values in sorted distinct (counted, counts) pairs, 0 for absent values."""
+    index = np.searchsorted(counted, values)
+    found = index < len(counted)
+    found[found] = counted[index[found]] == values[found]
+    result = np.zeros(len(values), dtype=np.int64)
+    result[found] = counts[index[found]]
+    return result
+
+
+def top_k(counts: np.ndarray, k: int) -> np.ndarray:
+    """Indexes of the k largest counts, largest first.
+
+    argpartition finds the k largest in linear time; only those k are sorted.
+    """
+    if k < len(counts):
+        candidates = np.argpartition(-counts, k - 1)[:k]
+    else:
+        candidates = np.arange(len(counts))
+    return candidates[np.argsort(-counts[candidates], kind="stable")]
+
+
+def _top_candidates(slots: np.ndarray, keys: np.ndarray, weights: np.ndarray, n_months: int):
+    """Sum weights per (month slot, key) and keep each month's CANDIDATES largest positive sums.
+
+    Returns (keys, counts) of shape (n_months, CANDIDATES), padded with
+    key -1 and count 0.
+    """
+    candidates = np.full((n_months, CANDIDATES), -1, dtype=np.int64)
+    candidate_counts = np.zeros((n_months, CANDIDATES), dtype=np.int64)
+    if len(keys) == 0:
+        return candidates, candidate_counts
+
+    order = np.lexsort((keys, slots))
+    slots, keys, weights = slots[order], keys[order], weights[order]
+    starts = np.flatnonzero(np.concatenate([[True], (slots[1:] != slots[:-1]) | (keys[1:] != keys[:-1])]))
+    slots, keys, sums = slots[starts], keys[starts], np.add.reduceat(weights, starts)
+    positive = sums > 0
+    slots, keys, sums = slots[positive], keys[positive], sums[positive]
+
+    # Largest first within each month, then rank within the month
+    order = np.lexsort((-sums, slots))
+    slots, keys, sums = slots[order], keys[order], sums[order]
+    rank = np.arange(len(slots)) - np.searchsorted(slots, slots)
+    keep = rank < CANDIDATES
+    candidates[slots[keep], rank[keep]] = keys[keep]
+    candidate_counts[slots[keep], rank[keep]] = sums[keep]
+    return candidates, candidate_counts
+
+
+class HeavyHitters:
+    """Per-month Count-Min sketches and frequent-value candidates of one field.
+
+    counts[m] is a DEPTH × WIDTH Count-Min sketch of the values of the
+    grievances received in month first_month + m; the sketch of any window
+    of months is their sum. A value's estimate is its minimum over the
+    sketch rows, never below its true count. candidates[m] holds the
+    CANDIDATES most frequent values of month m (a mergeable Space-Saving
+    style summary), from which top-K answers are drawn. Both are merged by
+    addition, so ingested deltas never rescan rows.
+    """
+
+    def __init__(
+        self,
+        first_month: int,
+        counts: np.ndarray,
+        candidates: np.ndarray,
+        candidate_counts: np.ndarray,
+        build_seconds: float = 0.0,
+    ):
+        self.first_month = first_month
+        self.counts = counts
+        self.candidates = candidates
+        self.candidate_counts = candidate_counts
+        self.build_seconds = build_seconds
+
+    @classmethod
+    def build(cls, months: np.ndarray, keys: np.ndarray) -> "HeavyHitters":
+        """Sketch integer keys by the month (index since 1970-01) they were received."""
+        start = time.perf_counter()
+        if len(keys) == 0:
+            empty = np.array([], dtype=np.int64)
+            return cls(0, np.zeros((0, DEPTH, WIDTH), dtype=np.int32), *_top_candidates(empty, empty, empty, 0))
+        first_month = int(months.min())
+        n_months = int(months.max()) - first_month + 1
+        slots = months.astype(np.int64) - first_month
+        keys = keys.astype(np.int64)
+
+        cells = (slots[None, :] * DEPTH + np.arange(DEPTH)[:, None]) * WIDTH + hash_rows(keys)
+        counts = np.bincount(cells.ravel(), minlength=n_months * DEPTH * WIDTH)
+        counts = counts.reshape(n_months, DEPTH, WIDTH).astype(np.int32)
+        candidates = _top_candidates(slots, keys, np.ones(len(keys), dtype=np.int64), n_months)
+        return cls(first_month, counts, *candidates, time.perf_counter() - start)
+
+    @property
+    def n_months(self) -> int:
+        """Number of months covered."""
+        return len(self.counts)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the sketch and candidate arrays."""
+        return self.counts.nbytes + self.candidates.nbytes + self.candidate_counts.nbytes
+
+    def _slots(self, start_month: Optional[int], end_month: Optional[int]) -> slice:
+        """Month slots of an inclusive window (None = unbounded)."""
+        first = 0 if start_month is None else start_month - self.first_month
+        last = self.n_months if end_month is None else end_month - self.first_month + 1
+        return slice(min(max(first, 0), self.n_months), min(max(last, 0), self.n_months))
+
+    def sketch(self, start_month: Optional[int] = None, end_month: Optional[int] = None) -> np.ndarray:
+        """Count-Min sketch of a window of months."""
+        return self.counts[self._slots(start_month, end_month)].sum(axis=0, dtype=np.int64)
+
+    def window_candidates(self, start_month: Optional[int] = None, end_month: Optional[int] = None) -> np.ndarray:
+        """Distinct candidate values of a window of months."""
+        slots = self._slots(start_month, end_month)
+        return np.unique(self.candidates[slots][self.candidate_counts[slots] > 0])
+
+    @staticmethod
+    def estimate(sketch: np.ndarray, keys: np.ndarray) -> np.ndarray:
+        """Count-Min estimates of keys from a window sketch."""
+        if len(keys) == 0:
+            return np.array([], dtype=np.int64)
+        return sketch[np.arange(DEPTH)[:, None], hash_rows(keys)].min(axis=0)
+
+    @timed("heavy_hitters.top")
+    def top(
+        self,
+        k: int,
+        start_month: Optional[int] = None,
+        end_month: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Approximate k most frequent values of a window: (values, estimates, window total)."""
+        sketch = self.sketch(start_month, end_month)
+        keys = self.window_candidates(start_month, end_month)
+        estimates = self.estimate(sketch, keys)
+        order = top_k(estimates, k)
+        return keys[order], estimates[order], int(sketch[0].sum()) if len(sketch) else 0
+
+    def merge(self, other: "HeavyHitters", sign: int = 1) -> "HeavyHitters":
+        """Return sketches with another's counts added (sign=1) or removed (sign=-1)."""
+        if other.n_months == 0:
+            return self
+        if self.n_months == 0:
+            first_month, last_month = other.first_month, other.first_month + other.n_months
+        else:
+            first_month = min(self.first_month, other.first_month)
+            last_month = max(self.first_month + self.n_months, other.first_month + other.n_months)
+        n_months = last_month - first_month
+        counts = np.zeros((n_months, DEPTH, WIDTH), dtype=np.int32)
+        slots, keys, weights = [], [], []
+        for sketch, factor in ((self, 1), (other, sign)):
+            if sketch.n_months == 0:
+                continue
+            offset = sketch.first_month - first_month
+            counts[offset:offset + sketch.n_months] += factor * sketch.counts
+            present = sketch.candidate_counts > 0
+            slots.append(np.nonzero(present)[0] + offset)
+            keys.append(sketch.candidates[present])
+            weights.append(factor * sketch.candidate_counts[present])
+        candidates = _top_candidates(np.concatenate(slots), np.concatenate(keys), np.concatenate(weights), n_months)
+        return HeavyHitters(first_month, counts, *candidates, self.build_seconds)
+
+
+def build_heavy_hitters(columns: Dict[str, np.ndarray]) -> Dict[str, HeavyHitters]:
+    """Sketch every HEAVY_HITTER_FIELDS column of store columns by month received."""
+    recvd = columns["recvd_date"]
+    has_recvd = recvd != NAT
+    months = to_month_index(recvd[has_recvd])
+    return {field: HeavyHitters.build(months, columns[field][has_recvd]) for field in HEAVY_HITTER_FIELDS}
+
+
+def main():
+    """Build the heavy-hitter sketches and compare their top values with exact counts."""
+    from app.services.grievance_store import get_data_path, load_store
+
+    parser = argparse.ArgumentParser(description="Check heavy-hitter sketches against exact top-K")
+    parser.add_argument("--data", default=None, help="Converted grievance dataset (default: GRIEVANCE_DATA_PATH)")
+    parser.add_argument("--k", type=int, default=20, help="Values per top-K (default: 20)")
+    args = parser.parse_args()
+
+    data_path = args.data or get_data_path()
+    store = load_store(data_path)
+    sketches = build_heavy_hitters(store.columns)
+    recvd = store.columns["recvd_date"]
+    months = to_month_index(recvd[recvd != NAT])
+    print(f"Dataset: {data_path} ({store.size:,} grievances)")
+    for field, sketch in sketches.items():
+        last_month = sketch.first_month + sketch.n_months - 1
+        values = store.columns[field][recvd != NAT][months == last_month]
+        start = time.perf_counter()
+        exact_values, exact_counts = count_values(values)
+        exact = exact_values[top_k(exact_counts, args.k)]
+        exact_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        approximate, estimates, total = sketch.top(args.k, last_month, last_month)
+        approximate_ms = (time.perf_counter() - start) * 1000
+        true_counts = dict(zip(exact_values.tolist(), exact_counts.tolist()))
+        overshoot = max((e - true_counts.get(v, 0) for v, e in zip(approximate.tolist(), estimates.tolist())), default=0)
+        print(f"  {field:<11} {sketch.nbytes / (1024 * 1024):6.2f} MB, built in {sketch.build_seconds * 1000:6.1f} ms; "
+              f"last month top {args.k}: recall {len(np.intersect1d(exact, approximate)) / max(len(exact), 1):.2f}, "
+              f"max overshoot {overshoot} (bound {error_bound(total)}), "
+              f"exact {exact_ms:.2f} ms, sketch {approximate_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Prefix of every exported metric name
+NAMESPACE = "cpgrams"
+
+# Hot-path timings of the current request, as (timer, seconds); None unless
+# the request asked for a Server-Timing header
+request_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_timings", default=None)
+
+
+class Histogram:
+    """Fixed-bucket histogram of durations, as Prometheus exports them.
+
+    counts[i] counts observations in (bounds[i - 1], bounds[i]]; the last
+    slot is +Inf. Observing is a bisect and three additions.
+    """
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RouteStats:
+    """Latency, response bytes and request counts (by status and cache result) of one route"""
+    __slots__ = ("latency", "bytes", "requests")
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.bytes = 0
+        self.requests: Dict[Tuple[int, str], int] = {}
+
+
+def format_metric(name: str, kind: str, help_text: str, samples: Iterable[Tuple[str, Dict[str, str], float]]) -> List[str]:
+    """Prometheus text lines of one metric: (suffix, labels, value) per sample"""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for suffix, labels, value in samples:
+        label_text = ",".join('%s="%s"' % (key, str(label).replace("\\", "\\\\").replace('"', '\\"'))
+                              for key, label in labels.items())
+        lines.append(f"{name}{suffix}{{{label_text}}} {value:g}" if label_text else f"{name}{suffix} {value:g}")
+    return lines
+
+
+def histogram_samples(histogram: Histogram, labels: Dict[str, str]) -> List[Tuple[str, Dict[str, str], float]]:
+    """Cumulative _bucket samples plus _sum and _count of a histogram"""
+    samples, cumulative = [], 0
+    for bound, count in zip(histogram.bounds + (float("inf"),), histogram.counts):
+        cumulative += count
+        le = "+Inf" if bound == float("inf") else f"{bound:g}"
+        samples.append(("_bucket", {**labels, "le": le}, cumulative))
+    samples.append(("_sum", labels, histogram.sum))
+    samples.append(("_count", labels, histogram.count))
+    return samples
+
+
+class Metrics:
+    """In-process registry of request and hot-path metrics.
+
+    Requests are recorded per route template by MetricsMiddleware; hot-path
+    timers (see timed) record the aggregation code. Everything is plain
+    Python counters updated on the event loop thread, so recording costs a
+    few dict lookups and no locking.
+    """
+
+    def __init__(self):
+        self.routes: Dict[str, RouteStats] = {}
+        self.timers: Dict[str, Histogram] = {}
+
+    def observe_request(self, route: str, status: int, cache: str, seconds: float, nbytes: int) -> None:
+        stats = self.routes.get(route)
+        if stats is None:
+            stats = self.routes[route] = RouteStats()
+        stats.latency.observe(seconds)
+        stats.bytes += nbytes
+        key = (status, cache)
+        stats.requests[key] = stats.requests.get(key, 0) + 1
+
+    def observe_timer(self, name: str, seconds: float) -> None:
+        histogram = self.timers.get(name)
+        if histogram is None:
+            histogram = self.timers[name] = Histogram()
+        histogram.observe(seconds)
+
+    def reset(self) -> None:
+        """Drop every recorded value."""
+        self.routes.clear()
+        self.timers.clear()
+
+    def render(self) -> List[str]:
+        """Prometheus text lines of every request and timer metric"""
+        routes = sorted(self.routes.items())
+        lines = format_metric(
+            f"{NAMESPACE}_http_requests_total", "counter", "Chart requests by route, status and cache result",
+            [("", {"route": route, "status": str(status), "cache": cache}, count)
+             for route, stats in routes for (status, cache), count in sorted(stats.requests.items())]
+        )
+        lines += format_metric(
+            f"{NAMESPACE}_http_request_duration_seconds", "histogram", "Chart request latency by route",
+            [sample for route, stats in routes for sample in histogram_samples(stats.latency, {"route": route})]
+        )
+        lines += format_metric(
+            f"{NAMESPACE}_http_response_bytes_total", "counter", "Chart response body bytes by route",
+            [("", {"route": route}, stats.bytes) for route, stats in routes]
+        )
+        lines += format_metric(
+            f"{NAMESPACE}_hot_path_duration_seconds", "histogram", "Time spent in aggregation code by timer",
+            [sample for name, histogram in sorted(self.timers.items())
+             for sample in histogram_samples(histogram, {"timer": name})]
+        )
+        return lines
+
+
+metrics = Metrics()
+
+
+def record(name: str, seconds: float) -> None:
+    """Record a hot-path timing in the registry and, if asked for, the current request's Server-Timing"""
+    metrics.observe_timer(name, seconds)
+    timings = request_timings.get()
+    if timings is not None:
+        timings.append((name, seconds))
+
+
+def timed(name: str):
+    """Decorator recording each call's duration under a hot-path timer name"""
+    def decorate(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def server_timing(total_seconds: float, cache: str) -> bytes:
+    """Server-Timing header value: the total, then each timer summed over the request"""
+    totals: Dict[str, List[float]] = {}
+    for name, seconds in request_timings.get() or ():
+        entry = totals.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+    parts = [f'total;dur={total_seconds * 1000:.3f};desc="cache {cache}"']
+    parts += [f'{name};dur={seconds * 1000:.3f};desc="{calls}x"' for name, (seconds, calls) in totals.items()]
+    return ", ".join(parts).encode("latin-1")
@@ -0,0 +1,294 @@
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from starlette.routing import Route
+from starlette.types import ASGIApp
+
+from app.middleware.response_cache import ResponseCache, cache_key, compress_all, response_cache
+from app.services.grievance_store import GrievanceStore, get_store, use_store
+from app.services.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+# Worker processes rendering payloads (0 renders them in a thread of the
+# server process). Workers are spawned, not forked: forking the threaded
+# server could copy a lock held by another thread into a child and hang it
+DEFAULT_WORKERS = int(os.getenv("PRECOMPUTE_WORKERS", "2"))
+# Where stores that are not already a column store (loaded from JSON, or
+# ingested into) are saved for the workers to memory-map; "" is the system
+# temporary directory
+SNAPSHOT_DIR = os.getenv("PRECOMPUTE_SNAPSHOT_DIR", "")
+# The app whose routes workers render, imported by each worker
+DEFAULT_APP_IMPORT = "app.main:app"
+
+# Values of path parameters to precompute, by route path
+PATH_PARAMETER_VALUES = {
+    "/api/charts/grievances/by-{dimension}": ["state", "ministry", "district", "category"],
+    "/api/charts/resolution-time/by-{dimension}": ["ministry", "state", "month"],
+    "/api/charts/top/{dimension}": ["district", "pincode", "category"],
+}
+
+# Rendered payload: (path, status, headers, body)
+Rendered = Tuple[str, int, List[Tuple[bytes, bytes]], bytes]
+JSON_HEADERS = [(b"content-type", b"application/json")]
+
+# The app whose routes a worker renders, and the column store it has open
+_app: Optional[ASGIApp] = None
+_worker_store_path: Optional[str] = None
+
+
+async def render(app: ASGIApp, path: str, query_string: bytes = b"") -> Rendered:
+    """Run a GET for path through an ASGI app and keep the response
+
+    Routes are called through the router, below the exception handlers, so
+    errors are turned into JSON bodies here: HTTPException keeps its status,
+    invalid or missing parameters give a 422, anything else a 500.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("latin-1"),
+        "root_path": "",
+        "query_string": query_string,
+        "headers": [],
+        "client": None,
+        "server": None,
+    }
+    response: Dict[str, Any] = {"status": 500, "headers": [], "body": b""}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = [
+                (name, value) for name, value in message.get("headers", []) if name.lower() != b"content-length"
+            ]
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+
+    try:
+        await app(scope, receive, send)
+    except HTTPException as exc:
+        return path, exc.status_code, JSON_HEADERS, dumps({"detail": exc.detail})
+    except RequestValidationError as exc:  # e.g. routes with required parameters
+        return path, 422, JSON_HEADERS, dumps({"detail": jsonable_encoder(exc.errors())})
+    except Exception:
+        logger.exception(f"Rendering {path} failed")
+        return path, 500, JSON_HEADERS, dumps({"detail": "Internal Server Error"})
+    return path, response["status"], response["headers"], response["body"]
+
+
+def render_paths(app: ASGIApp, paths: List[str]) -> List[Tuple[Rendered, Dict[str, bytes]]]:
+    """Render routes on a private event loop (blocking), each payload with its compressed copies"""
+    async def render_all():
+        return [await render(app, path) for path in paths]
+
+    return [(rendered, compress_all(rendered[3]) if rendered[1] == 200 else {})
+            for rendered in asyncio.run(render_all())]
+
+
+def init_worker(app_import: str) -> None:
+    """Import the app in a spawned worker ("module:attribute")"""
+    global _app
+    module, _, attribute = app_import.partition(":")
+    _app = getattr(importlib.import_module(module), attribute)
+
+
+def render_in_worker(store_path: str, version: int, paths: List[str]) -> List[Tuple[Rendered, Dict[str, bytes]]]:
+    """Render routes in a worker, from the column store at store_path
+
+    The store is memory-mapped (GrievanceStore.open), so its pages are
+    shared with the server and the other workers through the page cache,
+    and it stays open until a later run names another store.
+    """
+    global _worker_store_path
+    if store_path != _worker_store_path:
+        store = GrievanceStore.open(store_path)
+        store.version = version
+        use_store(store)
+        _worker_store_path = store_path
+    return render_paths(_app.router, paths)
+
+
+def chart_paths(app: ASGIApp, prefix: str = "/api/charts") -> List[str]:
+    """Paths of every GET route under prefix, with path parameters expanded"""
+    paths = []
+    for route in app.routes:
+        if not isinstance(route, Route) or "GET" not in (route.methods or ()) or not route.path.startswith(prefix):
+            continue
+        if not route.param_convertors:
+            paths.append(route.path)
+            continue
+        (name,) = route.param_convertors
+        for value in PATH_PARAMETER_VALUES.get(route.path, []):
+            paths.append(route.path.replace("{%s}" % name, value))
+    return paths
+
+
+class PrecomputeScheduler:
+    """Warms the response cache with the default payload of every chart route.
+
+    A background task renders every GET route under /api/charts with no
+    query parameters whenever the dataset version changes (after a load or
+    an ingest, see notify) and again before cached entries expire. Routes
+    are rendered in a pool of spawned worker processes that memory-map the
+    store: the column store it was opened from, or else a snapshot saved
+    once per dataset version. Aggregation and compression thus never run
+    on the event loop; each response replaces its cache entry, with its
+    compressed copies, in one assignment, and results of a version that is
+    no longer current are discarded. With 0 workers routes are rendered in
+    a thread of this process instead.
+    """
+
+    def __init__(self, app: ASGIApp, cache: ResponseCache = response_cache, workers: int = DEFAULT_WORKERS,
+                 app_import: str = DEFAULT_APP_IMPORT):
+        self.app = app
+        self.cache = cache
+        self.workers = workers
+        self.app_import = app_import
+        self.pool: Optional[ProcessPoolExecutor] = None
+        # Snapshots of stores that are not a column store: (version, path)
+        self.snapshot_root: Optional[str] = None
+        self.snapshot: Optional[Tuple[int, str]] = None
+        # Re-warm before entries reach their TTL
+        self.interval = cache.ttl_seconds * 0.8
+        self.version: Optional[int] = None
+        self.runs = 0
+        self.routes = 0
+        self.seconds = 0.0
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self.wake = asyncio.Event()
+
+    def start(self) -> None:
+        """Start the background task (call from the running event loop)."""
+        if self.cache.max_entries <= 0 or self.cache.ttl_seconds <= 0:
+            logger.info("Response cache disabled; not precomputing chart payloads")
+            return
+        self.task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        """Cancel the background task, stop the workers and remove the snapshots."""
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        self.close()
+
+    def close(self) -> None:
+        """Stop the workers and remove the snapshots."""
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+        if self.snapshot_root is not None:
+            shutil.rmtree(self.snapshot_root, ignore_errors=True)
+            self.snapshot_root = self.snapshot = None
+
+    async def store_path(self, store: GrievanceStore) -> str:
+        """Column store the workers open for a store, saved (off the event loop) if there is none"""
+        if store.memory_mapped:
+            return store.store_path
+        if self.snapshot is not None and self.snapshot[0] == store.version:
+            return self.snapshot[1]
+        if self.snapshot_root is None:
+            self.snapshot_root = tempfile.mkdtemp(prefix="precompute-", dir=SNAPSHOT_DIR or None)
+        path = os.path.join(self.snapshot_root, f"v{store.version}")
+        await asyncio.get_running_loop().run_in_executor(None, store.save, path)
+        if self.snapshot is not None:
+            # Workers still mapping the old snapshot keep their open files
+            shutil.rmtree(self.snapshot[1], ignore_errors=True)
+        self.snapshot = (store.version, path)
+        return path
+
+    def notify(self) -> None:
+        """Warm again now, e.g. after the dataset version changed."""
+        self.wake.set()
+
+    async def run(self) -> None:
+        """Warm on start, on notify and every interval."""
+        while True:
+            self.wake.clear()
+            try:
+                await self.warm()
+            except Exception:
+                logger.exception("Precomputing chart payloads failed")
+            try:
+                await asyncio.wait_for(self.wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def warm(self) -> int:
+        """Render every chart route for the current dataset version and cache the results."""
+        start = time.perf_counter()
+        store = get_store()
+        version = store.version
+        paths = chart_paths(self.app)
+        loop = asyncio.get_running_loop()
+        if self.workers > 0:
+            store_path = await self.store_path(store)
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                                initializer=init_worker, initargs=(self.app_import,))
+            chunks = [paths[i::self.workers] for i in range(self.workers)]
+            try:
+                results = await asyncio.gather(*[
+                    loop.run_in_executor(self.pool, render_in_worker, store_path, version, chunk)
+                    for chunk in chunks if chunk
+                ])
+            except BrokenProcessPool:
+                # A worker died; start a new pool next run
+                self.pool = None
+                raise
+            rendered = [item for chunk in results for item in chunk]
+        else:
+            rendered = await loop.run_in_executor(None, render_paths, self.app.router, paths)
+
+        if get_store().version != version:
+            logger.info(f"Dataset changed while precomputing version {version}; discarding")
+            return 0
+        stored = 0
+        for (path, status, headers, body), encoded in rendered:
+            if status == 200:
+                entry = self.cache.put(cache_key({"path": path, "query_string": b""}), body, headers, version)
+                entry.encoded.update(encoded)
+                stored += 1
+        self.version = version
+        self.runs += 1
+        self.routes = stored
+        self.seconds = time.perf_counter() - start
+        self.finished_at = time.time()
+        logger.info(f"Precomputed {stored} chart payloads for dataset version {version} in {self.seconds * 1000:.0f} ms")
+        return stored
+
+    def snapshot(self) -> Dict[str, Any]:
+        """State of the last run, for the admin endpoint"""
+        return {
+            "workers": self.workers,
+            "interval_seconds": self.interval,
+            "runs": self.runs,
+            "dataset_version": self.version,
+            "routes": self.routes,
+            "seconds": round(self.seconds, 4),
+            "finished_at": self.finished_at,
+        }
@@ -0,0 +1,288 @@
+import gc
+import itertools
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Requests slower than this are profiled (0 turns profiling off)
+DEFAULT_THRESHOLD_MS = float(os.getenv("PROFILE_SLOW_MS", "500"))
+# Time between stack samples while requests are in flight
+DEFAULT_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+# Profiles kept (oldest dropped first)
+DEFAULT_KEEP = int(os.getenv("PROFILE_KEEP", "20"))
+# Frames kept per sample (innermost first) and samples kept per request
+MAX_DEPTH = 64
+MAX_SAMPLES = 20_000
+# Functions listed per profile summary
+TOP_FUNCTIONS = 20
+
+# A stack sample: frame names, outermost first
+Stack = Tuple[str, ...]
+
+
+# (code object, module:function name) of each code object seen in a sample,
+# by id: hashing a code object hashes its contents
+_frame_names: Dict[int, Tuple[Any, str]] = {}
+
+
+def frame_name(frame) -> str:
+    """module:function name of a frame"""
+    code = frame.f_code
+    entry = _frame_names.get(id(code))
+    if entry is None or entry[0] is not code:
+        module = frame.f_globals.get("__name__") or os.path.basename(code.co_filename)
+        entry = _frame_names[id(code)] = (code, f"{module}:{getattr(code, 'co_qualname', code.co_name)}")
+    return entry[1]
+
+
+def sample_stack(frame) -> Stack:
+    """Names of the frames of a thread's stack, outermost first"""
+    names = []
+    while frame is not None and len(names) < MAX_DEPTH:
+        names.append(frame_name(frame))
+        frame = frame.f_back
+    names.reverse()
+    return tuple(names)
+
+
+_collections = 0
+
+
+def _count_collection(phase: str, info: Dict[str, Any]) -> None:
+    global _collections
+    if phase == "start":
+        _collections += 1
+
+
+gc.callbacks.append(_count_collection)
+
+
+def gc_collections() -> int:
+    """Garbage collections run so far, over all generations (counted by a gc callback)"""
+    return _collections
+
+
+class ActiveRequest:
+    """Samples and counters of a request in flight"""
+    __slots__ = ("thread_id", "started", "allocated_blocks", "collections", "samples", "max_concurrent")
+
+    def __init__(self, thread_id: int, started: float, allocated_blocks: int, collections: int):
+        self.thread_id = thread_id
+        self.started = started
+        self.allocated_blocks = allocated_blocks
+        self.collections = collections
+        self.samples: List[Stack] = []
+        self.max_concurrent = 1
+
+
+@dataclass
+class Profile:
+    """Stack samples and allocation counters of one slow request.
+
+    Samples are taken from the thread serving the request at a fixed
+    interval, so a function's share of samples estimates its share of the
+    request's wall time. While several requests are in flight on the same
+    event loop each sample is credited to all of them (see concurrent).
+    Allocation counts are process-wide deltas over the request.
+    """
+    id: int
+    method: str
+    path: str
+    query: str
+    status: int
+    started_at: float
+    duration_ms: float
+    interval_ms: float
+    stacks: Dict[Stack, int]
+    allocated_blocks: int
+    gc_collections: int
+    concurrent: int
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def functions(self, limit: int = TOP_FUNCTIONS) -> List[Dict[str, Any]]:
+        """Functions by samples in them (self) and under them (total)"""
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for name in set(stack):
+                total[name] += count
+        return [
+            {"function": name, "self": own[name], "total": count}
+            for name, count in sorted(total.items(), key=lambda item: (-own[item[0]], -item[1]))[:limit]
+            if own[name]
+        ]
+
+    def summary(self) -> Dict[str, Any]:
+        """Request, timing and allocation fields, without stacks"""
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "query": self.query,
+            "status": self.status,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms, 3),
+            "samples": self.samples,
+            "interval_ms": self.interval_ms,
+            "allocated_blocks": self.allocated_blocks,
+            "gc_collections": self.gc_collections,
+            "concurrent": self.concurrent,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary, top functions and folded stacks ("outer;...;inner": samples, flamegraph input)"""
+        return {
+            **self.summary(),
+            "functions": self.functions(),
+            "folded": {";".join(stack): count for stack, count in sorted(self.stacks.items(), key=lambda item: -item[1])},
+        }
+
+
+class SlowRequestProfiler:
+    """Statistical profiler that keeps the profiles of slow requests.
+
+    begin() registers a request; a daemon thread wakes every interval while
+    any request is in flight and records the stack of each in-flight
+    request's thread (sys._current_frames, so nothing is instrumented and
+    fast requests only pay for registration). end() turns a request that
+    took at least the threshold into a Profile, keeps the last `keep` in a
+    ring buffer and passes it to every hook (e.g. to log or ship it).
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = DEFAULT_THRESHOLD_MS,
+        interval_ms: float = DEFAULT_INTERVAL_MS,
+        keep: int = DEFAULT_KEEP,
+    ):
+        self.threshold_ms = threshold_ms
+        self.interval_ms = interval_ms
+        self.profiles: Deque[Profile] = deque(maxlen=keep)
+        self.hooks: List[Callable[[Profile], None]] = []
+        self.active: Dict[int, ActiveRequest] = {}
+        self.lock = threading.Lock()
+        self.busy = threading.Event()
+        self.ids = itertools.count(1)
+        self.requests = 0
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms > 0
+
+    def begin(self) -> int:
+        """Start sampling the calling thread for a request; returns its token."""
+        request = ActiveRequest(threading.get_ident(), time.perf_counter(), sys.getallocatedblocks(), gc_collections())
+        token = next(self.ids)
+        with self.lock:
+            self.active[token] = request
+            concurrent = len(self.active)
+            if concurrent > 1:
+                for other in self.active.values():
+                    other.max_concurrent = max(other.max_concurrent, concurrent)
+            # The sampling thread clears it once nothing is in flight
+            if not self.busy.is_set():
+                self.busy.set()
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._sample, name="slow-request-profiler", daemon=True)
+            self.thread.start()
+        return token
+
+    def end(self, token: int, method: str, path: str, query: str, status: int) -> Optional[Profile]:
+        """Stop sampling a request; keep and return its Profile if it was slow."""
+        with self.lock:
+            request = self.active.pop(token)
+        self.requests += 1
+        duration_ms = (time.perf_counter() - request.started) * 1000
+        if duration_ms < self.threshold_ms:
+            return None
+
+        profile = Profile(
+            id=token,
+            method=method,
+            path=path,
+            query=query,
+            status=status,
+            started_at=time.time() - duration_ms / 1000,
+            duration_ms=duration_ms,
+            interval_ms=self.interval_ms,
+            stacks=dict(Counter(request.samples)),
+            allocated_blocks=sys.getallocatedblocks() - request.allocated_blocks,
+            gc_collections=gc_collections() - request.collections,
+            concurrent=request.max_concurrent,
+        )
+        self.profiles.append(profile)
+        for hook in self.hooks:
+            try:
+                hook(profile)
+            except Exception:
+                logger.exception("Slow request profile hook failed")
+        return profile
+
+    def _sample(self) -> None:
+        """Sampling thread: record the stacks of in-flight requests every interval"""
+        interval = self.interval_ms / 1000
+        while True:
+            self.busy.wait()
+            time.sleep(interval)
+            frames = sys._current_frames()
+            with self.lock:
+                if not self.active:
+                    self.busy.clear()
+                stacks: Dict[int, Stack] = {}
+                for request in self.active.values():
+                    frame = frames.get(request.thread_id)
+                    if frame is None or len(request.samples) >= MAX_SAMPLES:
+                        continue
+                    if request.thread_id not in stacks:
+                        stacks[request.thread_id] = sample_stack(frame)
+                    request.samples.append(stacks[request.thread_id])
+            del frames
+
+    def get(self, profile_id: int) -> Optional[Profile]:
+        """A kept profile by id"""
+        return next((profile for profile in self.profiles if profile.id == profile_id), None)
+
+    def clear(self) -> None:
+        """Drop every kept profile."""
+        self.profiles.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Settings, counters and kept profile summaries, newest first"""
+        return {
+            "enabled": self.enabled,
+            "threshold_ms": self.threshold_ms,
+            "interval_ms": self.interval_ms,
+            "keep": self.profiles.maxlen,
+            "requests": self.requests,
+            "in_flight": len(self.active),
+            "profiles": [profile.summary() for profile in reversed(self.profiles)],
+        }
+
+
+slow_request_profiler = SlowRequestProfiler()
+
+
+def log_profile(profile: Profile) -> None:
+    """Hook: log a one-line summary of a slow request and its hottest function"""
+    functions = profile.functions(1)
+    hottest = f"; hottest {functions[0]['function']} ({functions[0]['self']} samples)" if functions else ""
+    logger.warning(
+        f"Slow request {profile.method} {profile.path}"
+        f"{'?' + profile.query if profile.query else ''}: {profile.duration_ms:.0f} ms, "
+        f"{profile.samples} samples{hottest} (profile {profile.id})"
+    )
+
+
+slow_request_profiler.hooks.append(log_profile)
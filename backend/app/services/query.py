@@ -0,0 +1,161 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.dates import NAT, MS_PER_DAY
+from app.services.metrics import timed
+
+EPOCH_DATE = date(1970, 1, 1)
+
+# Filterable fields and the store column each one tests
+FILTER_COLUMNS = {
+    "state": "state",
+    "org_code": "org_code",
+    "dist_name": "dist_name",
+    "sex": "sex",
+    "category": "CategoryV7",
+}
+# Low-cardinality fields answered from bitmaps; the rest compare codes row by row
+BITMAP_FIELDS = ("state", "org_code", "sex", "category")
+# Bitmaps kept per store (each is one bit per row)
+BITMAP_CACHE_SIZE = 256
+
+
+class BitmapIndex:
+    """Packed row bitmaps of column values, built on first use.
+
+    The bitmap of (column, value) is np.packbits(column == value): one bit
+    per row, so combining filters is a bytewise AND over an eighth of the
+    memory a boolean mask would touch. The least recently used bitmaps are
+    dropped beyond max_bitmaps; clear() whenever rows change.
+    """
+
+    def __init__(self, max_bitmaps: int = BITMAP_CACHE_SIZE):
+        self.max_bitmaps = max_bitmaps
+        self.bitmaps: "OrderedDict[Tuple[str, int], np.ndarray]" = OrderedDict()
+
+    def bitmap(self, name: str, column: np.ndarray, value: int) -> np.ndarray:
+        """Packed bitmap of the rows where column == value."""
+        key = (name, value)
+        bits = self.bitmaps.get(key)
+        if bits is None:
+            bits = self.bitmaps[key] = np.packbits(column == value)
+            while len(self.bitmaps) > self.max_bitmaps:
+                self.bitmaps.popitem(last=False)
+        else:
+            self.bitmaps.move_to_end(key)
+        return bits
+
+    def clear(self) -> None:
+        """Drop every bitmap."""
+        self.bitmaps.clear()
+
+
+@dataclass
+class RowPredicate:
+    """A filter compiled against one store: a row range plus equality terms.
+
+    Rows are sorted by recvd_date, so the date range is the contiguous rows
+    lo:hi. Bitmap terms are ANDed bytewise over that range before unpacking;
+    scan terms are then compared on the range only.
+    """
+    lo: int
+    hi: int
+    bitmap_terms: List[Tuple[str, int]] = field(default_factory=list)
+    scan_terms: List[Tuple[str, int]] = field(default_factory=list)
+    matches_nothing: bool = False
+
+    def mask(self, store) -> np.ndarray:
+        """Boolean mask of the matching rows of the store it was compiled for."""
+        mask = np.zeros(store.size, dtype=bool)
+        if self.matches_nothing or self.hi <= self.lo:
+            return mask
+        lo, hi = self.lo, self.hi
+        if self.bitmap_terms:
+            first_byte, last_byte = lo // 8, (hi + 7) // 8
+            bits = None
+            for name, value in self.bitmap_terms:
+                column = store.columns[FILTER_COLUMNS[name]]
+                term = store.bitmaps.bitmap(name, column, value)[first_byte:last_byte]
+                bits = term.copy() if bits is None else np.bitwise_and(bits, term, out=bits)
+            offset = first_byte * 8
+            mask[lo:hi] = np.unpackbits(bits)[lo - offset:hi - offset].view(bool)
+        else:
+            mask[lo:hi] = True
+        for name, value in self.scan_terms:
+            mask[lo:hi] &= store.columns[FILTER_COLUMNS[name]][lo:hi] == value
+        return mask
+
+    def scan(self, columns: Dict[str, np.ndarray], lo: int, hi: int) -> np.ndarray:
+        """Boolean mask of the matching rows among rows lo:hi of the columns, without bitmaps.
+
+        For reading a snapshot of the columns in chunks: memory is
+        proportional to the chunk, and nothing depends on the store's
+        bitmaps still matching its rows.
+        """
+        lo, hi = max(lo, self.lo), min(hi, self.hi)
+        if self.matches_nothing or hi <= lo:
+            return np.zeros(0, dtype=bool)
+        mask = np.ones(hi - lo, dtype=bool)
+        for name, value in self.bitmap_terms + self.scan_terms:
+            mask &= columns[FILTER_COLUMNS[name]][lo:hi] == value
+        return mask
+
+
+@dataclass
+class GrievanceFilter:
+    """Grievance filters from a request: recvd_date range plus field values.
+
+    start/end are inclusive days; the other fields are labels (category is
+    a CategoryV7 number). None means "not filtered".
+    """
+    start: Optional[date] = None
+    end: Optional[date] = None
+    state: Optional[str] = None
+    org_code: Optional[str] = None
+    dist_name: Optional[str] = None
+    sex: Optional[str] = None
+    category: Optional[int] = None
+
+    @property
+    def values(self) -> Dict[str, object]:
+        """Field filters that are set, by field name."""
+        return {name: getattr(self, name) for name in FILTER_COLUMNS if getattr(self, name) is not None}
+
+    @property
+    def empty(self) -> bool:
+        """Whether nothing is filtered."""
+        return self.start is None and self.end is None and not self.values
+
+    def without(self, *names: str) -> "GrievanceFilter":
+        """The same filter with some fields cleared."""
+        return replace(self, **{name: None for name in names})
+
+    def compile(self, store) -> RowPredicate:
+        """Resolve labels to codes and dates to a row range of the store."""
+        recvd = store.columns["recvd_date"]
+        lo, hi = 0, store.size
+        if self.start is not None or self.end is not None:
+            # Grievances with no recvd_date sort first and never match a range
+            lo = int(np.searchsorted(recvd, NAT, side="right"))
+        if self.start is not None:
+            lo = max(lo, int(np.searchsorted(recvd, (self.start - EPOCH_DATE).days * MS_PER_DAY)))
+        if self.end is not None:
+            hi = int(np.searchsorted(recvd, ((self.end - EPOCH_DATE).days + 1) * MS_PER_DAY))
+
+        predicate = RowPredicate(lo, hi)
+        for name, value in self.values.items():
+            code = int(value) if name == "category" else store.code_of(name, value)
+            if code == -1 and name != "category":
+                predicate.matches_nothing = True
+            terms = predicate.bitmap_terms if name in BITMAP_FIELDS else predicate.scan_terms
+            terms.append((name, code))
+        return predicate
+
+    @timed("filter.mask")
+    def mask(self, store) -> np.ndarray:
+        """Boolean mask of the store rows matching this filter."""
+        return self.compile(store).mask(store)
@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from typing import Tuple
+
+
+@dataclass(frozen=True)
+class RecordLayout:
+    """How dataset.read_columns decodes the fields of a record type
+
+    dates: ISO date strings, parsed to int64 epoch milliseconds
+    interned: repeated strings, one str object kept per distinct value
+
+    Other fields come back as they are decoded.
+    """
+    dates: Tuple[str, ...] = ()
+    interned: Tuple[str, ...] = ()
+
+
+# Fields of the converted grievance dumps
+GRIEVANCE_LAYOUT = RecordLayout(
+    dates=("recvd_date", "closing_date", "DiaryDate"),
+    interned=("state", "org_code", "dist_name", "sex", "pincode", "UserCode"),
+)
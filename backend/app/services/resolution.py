@@ -0,0 +1,214 @@
+import argparse
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.dates import NAT, MS_PER_DAY, to_month_index
+from app.services.metrics import timed
+
+# Dimensions of a sketch cell, in key order. month is the month received.
+SKETCH_DIMENSIONS = ["month", "state", "org_code"]
+
+# Log-spaced disposal time buckets with 1% relative accuracy (DDSketch-style):
+# bucket i >= 1 holds times in (MIN_MS * GAMMA**(i-1), MIN_MS * GAMMA**i],
+# bucket 0 holds anything up to MIN_MS (including closings before receipt)
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+MIN_MS = 60_000
+MAX_MS = 20 * 366 * MS_PER_DAY
+N_BUCKETS = int(np.ceil(np.log(MAX_MS / MIN_MS) / np.log(GAMMA))) + 1
+# Extra bucket counting grievances that are still open
+OPEN_BUCKET = N_BUCKETS
+
+# Value reported for each bucket, in days (within RELATIVE_ACCURACY of any time in it)
+BUCKET_DAYS = np.concatenate([
+    [0.0],
+    MIN_MS * 2 * GAMMA ** np.arange(1, N_BUCKETS) / (GAMMA + 1) / MS_PER_DAY,
+])
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+def bucket_of(duration_ms: np.ndarray) -> np.ndarray:
+    """Map disposal times in milliseconds to sketch buckets."""
+    scaled = np.maximum(duration_ms, 1) / MIN_MS
+    buckets = np.ceil(np.log(scaled) / np.log(GAMMA))
+    return np.clip(buckets, 0, N_BUCKETS - 1).astype(np.int16)
+
+
+def quantiles(histograms: np.ndarray, qs: Sequence[float] = QUANTILES) -> np.ndarray:
+    """Disposal time quantiles in days for each row of bucket counts.
+
+    Returns an array of shape (rows, len(qs)); rows with no closed
+    grievances are NaN.
+    """
+    closed = histograms[:, :N_BUCKETS]
+    cumulative = np.cumsum(closed, axis=1)
+    totals = cumulative[:, -1]
+    result = np.full((len(closed), len(qs)), np.nan)
+    for j, q in enumerate(qs):
+        # First bucket whose cumulative count passes the q-th rank
+        rank = q * (totals - 1)
+        index = np.argmax(cumulative > rank[:, None], axis=1)
+        result[:, j] = BUCKET_DAYS[index]
+    result[totals == 0] = np.nan
+    return result
+
+
+class ResolutionSketch:
+    """Mergeable disposal time histograms per month × state × org_code.
+
+    Each cell is the grievances received in one month by one ministry in
+    one state: a sparse histogram of their recvd_date -> closing_date times
+    over log-spaced buckets, plus the number still open. Quantiles for any
+    filter or grouping are read from summed histograms, so sub-group
+    queries never sort raw rows, and deltas are applied by merging.
+    """
+
+    def __init__(self, cells: Dict[str, np.ndarray], build_seconds: float = 0.0):
+        self.cells = cells
+        self.build_seconds = build_seconds
+
+    @classmethod
+    def build(cls, columns: Dict[str, np.ndarray]) -> "ResolutionSketch":
+        """Aggregate store columns into sketch cells."""
+        start = time.perf_counter()
+        recvd = columns["recvd_date"]
+        closing = columns["closing_date"]
+        has_recvd = recvd != NAT
+        recvd, closing = recvd[has_recvd], closing[has_recvd]
+        closed = closing != NAT
+
+        buckets = np.full(len(recvd), OPEN_BUCKET, dtype=np.int64)
+        buckets[closed] = bucket_of(closing[closed] - recvd[closed])
+        keys = {
+            "month": to_month_index(recvd),
+            "state": columns["state"][has_recvd].astype(np.int64),
+            "org_code": columns["org_code"][has_recvd].astype(np.int64),
+            "bucket": buckets,
+        }
+        return cls(_count_cells(keys, np.ones(len(recvd), dtype=np.int64)), time.perf_counter() - start)
+
+    @property
+    def size(self) -> int:
+        """Number of non-empty (cell, bucket) entries."""
+        return len(self.cells["count"])
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the cell arrays."""
+        return sum(values.nbytes for values in self.cells.values())
+
+    def mask(
+        self,
+        state: Optional[int] = None,
+        org_code: Optional[int] = None,
+        start_month: Optional[int] = None,
+        end_month: Optional[int] = None,
+    ) -> np.ndarray:
+        """Boolean mask of the entries matching the given filters (codes / month indexes)."""
+        mask = np.ones(self.size, dtype=bool)
+        if state is not None:
+            mask &= self.cells["state"] == state
+        if org_code is not None:
+            mask &= self.cells["org_code"] == org_code
+        if start_month is not None:
+            mask &= self.cells["month"] >= start_month
+        if end_month is not None:
+            mask &= self.cells["month"] <= end_month
+        return mask
+
+    @timed("resolution.histograms")
+    def histograms(
+        self,
+        dimension: Optional[str] = None,
+        mask: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Sum matching entries into one histogram per value of a dimension.
+
+        Returns (dimension values, counts of shape (values, N_BUCKETS + 1));
+        the last column counts open grievances. With no dimension there is a
+        single row for everything matched.
+        """
+        buckets = self.cells["bucket"] if mask is None else self.cells["bucket"][mask]
+        counts = self.cells["count"] if mask is None else self.cells["count"][mask]
+        n_columns = N_BUCKETS + 1
+        if dimension is None:
+            flat = np.bincount(buckets, weights=counts, minlength=n_columns)
+            return np.zeros(1, dtype=np.int64), flat.reshape(1, n_columns).astype(np.int64)
+
+        # Dimension values are small integers (codes, months), so rows are
+        # addressed directly instead of sorting for distinct values
+        values = self.cells[dimension] if mask is None else self.cells[dimension][mask]
+        if len(values) == 0:
+            return np.array([], dtype=np.int64), np.zeros((0, n_columns), dtype=np.int64)
+        first = int(values.min())
+        n_groups = int(values.max()) - first + 1
+        keys = (values.astype(np.int64) - first) * n_columns + buckets
+        histograms = np.bincount(keys, weights=counts, minlength=n_groups * n_columns).reshape(n_groups, n_columns)
+        present = histograms.any(axis=1)
+        return np.flatnonzero(present) + first, histograms[present].astype(np.int64)
+
+    def merge(self, other: "ResolutionSketch", sign: int = 1) -> "ResolutionSketch":
+        """Return a sketch with another sketch's counts added (sign=1) or removed (sign=-1)."""
+        keys = {
+            name: np.concatenate([self.cells[name], other.cells[name]]).astype(np.int64)
+            for name in SKETCH_DIMENSIONS + ["bucket"]
+        }
+        counts = np.concatenate([self.cells["count"], sign * other.cells["count"]])
+        return ResolutionSketch(_count_cells(keys, counts), self.build_seconds)
+
+
+def _count_cells(keys: Dict[str, np.ndarray], counts: np.ndarray) -> Dict[str, np.ndarray]:
+    """Sum counts per distinct (month, state, org_code, bucket), dropping zeros."""
+    if len(counts) == 0:
+        cells = {name: np.array([], dtype=np.int32) for name in SKETCH_DIMENSIONS}
+        cells["bucket"] = np.array([], dtype=np.int16)
+        cells["count"] = np.array([], dtype=np.int64)
+        return cells
+
+    month_base = int(keys["month"].min())
+    n_state = int(keys["state"].max()) + 1
+    n_org = int(keys["org_code"].max()) + 1
+    n_bucket = N_BUCKETS + 1
+    combined = (((keys["month"] - month_base) * n_state + keys["state"]) * n_org + keys["org_code"]) * n_bucket
+    combined += keys["bucket"]
+    unique_keys, inverse = np.unique(combined, return_inverse=True)
+    summed = np.bincount(inverse.reshape(-1), weights=counts, minlength=len(unique_keys)).astype(np.int64)
+    nonzero = summed != 0
+    unique_keys, summed = unique_keys[nonzero], summed[nonzero]
+
+    remainder, bucket = np.divmod(unique_keys, n_bucket)
+    remainder, org = np.divmod(remainder, n_org)
+    month, state = np.divmod(remainder, n_state)
+    return {
+        "month": (month + month_base).astype(np.int32),
+        "state": state.astype(np.int32),
+        "org_code": org.astype(np.int32),
+        "bucket": bucket.astype(np.int16),
+        "count": summed,
+    }
+
+
+def main():
+    """Rebuild the resolution sketch from the grievance dataset and report its size."""
+    from app.services.grievance_store import get_data_path, load_store
+
+    parser = argparse.ArgumentParser(description="Rebuild the grievance resolution-time sketch")
+    parser.add_argument("--data", default=None, help="Converted grievance dataset (default: GRIEVANCE_DATA_PATH)")
+    args = parser.parse_args()
+
+    data_path = args.data or get_data_path()
+    store = load_store(data_path)
+    sketch = ResolutionSketch.build(store.columns)
+    _, histogram = sketch.histograms()
+    median, p90, p99 = quantiles(histogram)[0]
+    print(f"Dataset:    {data_path} ({store.size:,} grievances)")
+    print(f"Entries:    {sketch.size:,} ({sketch.nbytes / (1024 * 1024):.2f} MB)")
+    print(f"Build time: {sketch.build_seconds * 1000:.1f} ms")
+    print(f"Disposal:   median {median:.1f} days, p90 {p90:.1f} days, p99 {p99:.1f} days")
+
+
+if __name__ == "__main__":
+    main()
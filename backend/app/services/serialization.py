@@ -0,0 +1,95 @@
+import json
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Sequence
+
+from fastapi.responses import Response
+
+from app.services.metrics import timed
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # Arrow responses are optional; records are then always JSON
+    pa = None
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Encoding of columnar responses negotiated for the current request ("json"
+# or "arrow"); set by ResponseCacheMiddleware from the Accept header
+response_format: ContextVar[str] = ContextVar("response_format", default="json")
+
+
+def negotiate_format(accept: Optional[str]) -> str:
+    """Columnar response encoding for an Accept header: "arrow" if it lists Arrow (and pyarrow is installed)"""
+    if pa is not None and accept and ARROW_MEDIA_TYPE in accept:
+        return "arrow"
+    return "json"
+
+
+def dumps(content: Any) -> bytes:
+    """Encode JSON-compatible Python objects to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+@timed("encode_records")
+def encode_records(columns: Dict[str, Sequence[Any]]) -> bytes:
+    """Encode parallel columns as a JSON array of records, one per row.
+
+    Columns must already hold plain Python values (use ``ndarray.tolist()``);
+    no models are built and nothing is validated, so the caller is
+    responsible for producing values of the declared response_model types.
+    """
+    names = list(columns)
+    return dumps([dict(zip(names, row)) for row in zip(*columns.values())])
+
+
+class RawJSONResponse(Response):
+    """JSON response whose body is pre-encoded bytes.
+
+    Returning one from a route skips response_model validation and
+    FastAPI's generic encoder; bytes are sent as-is, anything else is
+    encoded with ``dumps``.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+@timed("encode_arrow")
+def encode_arrow(columns: Dict[str, Sequence[Any]]) -> bytes:
+    """Encode parallel columns as an Arrow IPC stream: one record batch, one array per column.
+
+    Column types are inferred from the values (None becomes null). Unlike a
+    JSON array of records, names are written once, numbers are stored as
+    fixed-width binary and repetitive string columns (e.g. a series label)
+    are dictionary-encoded.
+    """
+    arrays = {}
+    for name, values in columns.items():
+        array = pa.array(list(values))
+        if pa.types.is_string(array.type) and len(array) > 1:
+            encoded = array.dictionary_encode()
+            if len(encoded.dictionary) * 2 <= len(array):
+                array = encoded
+        arrays[name] = array
+    table = pa.table(arrays)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def records_response(columns: Dict[str, Sequence[Any]]) -> Response:
+    """Response for parallel columns in the negotiated encoding: JSON records or an Arrow stream"""
+    if response_format.get() == "arrow":
+        return Response(encode_arrow(columns), media_type=ARROW_MEDIA_TYPE)
+    return RawJSONResponse(encode_records(columns))
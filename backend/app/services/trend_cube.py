@@ -0,0 +1,220 @@
+import argparse
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.dates import NAT, MS_PER_DAY
+from app.services.metrics import timed
+
+# Dimensions of a cube cell, in key order
+CUBE_DIMENSIONS = ["day", "state", "org_code", "category"]
+GRANULARITIES = ("day", "week", "month")
+
+
+def bucket_days(days: np.ndarray, granularity: str) -> np.ndarray:
+    """Map days since 1970-01-01 to day/week/month bucket numbers.
+
+    Weeks start on Monday (day 0 was a Thursday); buckets are always
+    expressed as the first day of the bucket, in days since the epoch.
+    """
+    if granularity == "day":
+        return days
+    if granularity == "week":
+        return (days + 3) // 7 * 7 - 3
+    if granularity == "month":
+        months = days.astype("datetime64[D]").astype("datetime64[M]")
+        return months.astype("datetime64[D]").astype(np.int64)
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+
+class TrendCube:
+    """Sparse day × state × org_code × CategoryV7 grievance counts.
+
+    Only non-empty cells are stored, as parallel arrays sorted by day. Each
+    cell holds the grievances received on that day and the grievances closed
+    on that day (by closing_date). Coarser time buckets and any combination of
+    filters are answered by masking and summing cells, never raw rows.
+    """
+
+    def __init__(self, cells: Dict[str, np.ndarray], build_seconds: float = 0.0):
+        self.cells = cells
+        self.build_seconds = build_seconds
+
+    @classmethod
+    def build(cls, columns: Dict[str, np.ndarray]) -> "TrendCube":
+        """Aggregate store columns into cube cells."""
+        start = time.perf_counter()
+        recvd = columns["recvd_date"]
+        closing = columns["closing_date"]
+        state = columns["state"].astype(np.int64)
+        org = columns["org_code"].astype(np.int64)
+        categories, category = np.unique(columns["CategoryV7"], return_inverse=True)
+        category = category.reshape(-1).astype(np.int64)
+
+        has_recvd = recvd != NAT
+        has_closing = closing != NAT
+        recvd_day = recvd[has_recvd] // MS_PER_DAY
+        closed_day = closing[has_closing] // MS_PER_DAY
+        all_days = np.concatenate([recvd_day, closed_day])
+        first_day = int(all_days.min()) if len(all_days) else 0
+
+        n_state = int(state.max()) + 1 if len(state) else 1
+        n_org = int(org.max()) + 1 if len(org) else 1
+        n_cat = max(len(categories), 1)
+
+        def encode(day, mask):
+            return (((day - first_day) * n_state + state[mask]) * n_org + org[mask]) * n_cat + category[mask]
+
+        keys = np.concatenate([encode(recvd_day, has_recvd), encode(closed_day, has_closing)])
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        n_recvd = len(recvd_day)
+        received = np.bincount(inverse[:n_recvd], minlength=len(unique_keys))
+        closed = np.bincount(inverse[n_recvd:], minlength=len(unique_keys))
+
+        remainder, cell_category = np.divmod(unique_keys, n_cat)
+        remainder, cell_org = np.divmod(remainder, n_org)
+        cell_day, cell_state = np.divmod(remainder, n_state)
+
+        cells = {
+            "day": (cell_day + first_day).astype(np.int32),
+            "state": cell_state.astype(np.int32),
+            "org_code": cell_org.astype(np.int32),
+            "category": categories[cell_category] if len(categories) else cell_category,
+            "received": received.astype(np.int32),
+            "closed": closed.astype(np.int32),
+        }
+        return cls(cells, time.perf_counter() - start)
+
+    @property
+    def size(self) -> int:
+        """Number of non-empty cells."""
+        return len(self.cells["day"])
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the cell arrays."""
+        return sum(values.nbytes for values in self.cells.values())
+
+    def mask(
+        self,
+        state: Optional[int] = None,
+        org_code: Optional[int] = None,
+        category: Optional[int] = None,
+        start_day: Optional[int] = None,
+        end_day: Optional[int] = None,
+    ) -> np.ndarray:
+        """Boolean mask of the cells matching the given filters (codes / day numbers)."""
+        mask = np.ones(self.size, dtype=bool)
+        if state is not None:
+            mask &= self.cells["state"] == state
+        if org_code is not None:
+            mask &= self.cells["org_code"] == org_code
+        if category is not None:
+            mask &= self.cells["category"] == category
+        if start_day is not None:
+            mask &= self.cells["day"] >= start_day
+        if end_day is not None:
+            mask &= self.cells["day"] <= end_day
+        return mask
+
+    def select(self, mask: np.ndarray) -> "TrendCube":
+        """A cube of the cells in a boolean mask."""
+        return TrendCube({name: values[mask] for name, values in self.cells.items()})
+
+    @timed("cube.series")
+    def series(
+        self,
+        granularity: str = "day",
+        metric: str = "received",
+        mask: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Roll matching cells up into a dense time series.
+
+        Returns (bucket start days, counts); buckets with no grievances inside
+        the matched range are included with a count of zero.
+        """
+        days = self.cells["day"] if mask is None else self.cells["day"][mask]
+        values = self.cells[metric] if mask is None else self.cells[metric][mask]
+        nonzero = values > 0
+        days, values = days[nonzero], values[nonzero]
+        if len(days) == 0:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+
+        buckets = bucket_days(days.astype(np.int64), granularity)
+        first, last = int(buckets.min()), int(buckets.max())
+        all_buckets = np.unique(bucket_days(np.arange(first, last + 1), granularity))
+        counts = np.bincount(np.searchsorted(all_buckets, buckets), weights=values, minlength=len(all_buckets))
+        return all_buckets, counts.astype(np.int64)
+
+    def merge(self, other: "TrendCube", sign: int = 1) -> "TrendCube":
+        """Return a cube with another cube's counts added (sign=1) or removed (sign=-1).
+
+        Used to apply ingested deltas without rebuilding from raw rows; cells
+        whose counts drop to zero are dropped.
+        """
+        cells = {
+            dimension: np.concatenate([self.cells[dimension], other.cells[dimension]])
+            for dimension in CUBE_DIMENSIONS
+        }
+        received = np.concatenate([self.cells["received"], sign * other.cells["received"]]).astype(np.int64)
+        closed = np.concatenate([self.cells["closed"], sign * other.cells["closed"]]).astype(np.int64)
+
+        if len(received) == 0:
+            return TrendCube(self.cells, self.build_seconds)
+
+        order = np.lexsort([cells[dimension] for dimension in reversed(CUBE_DIMENSIONS)])
+        same_as_previous = np.zeros(len(order), dtype=bool)
+        same_as_previous[1:] = True
+        for dimension in CUBE_DIMENSIONS:
+            cells[dimension] = cells[dimension][order]
+            same_as_previous[1:] &= cells[dimension][1:] == cells[dimension][:-1]
+        starts = np.flatnonzero(~same_as_previous)
+
+        merged = {dimension: cells[dimension][starts] for dimension in CUBE_DIMENSIONS}
+        merged["received"] = np.add.reduceat(received[order], starts)
+        merged["closed"] = np.add.reduceat(closed[order], starts)
+        keep = (merged["received"] != 0) | (merged["closed"] != 0)
+        merged = {name: values[keep] for name, values in merged.items()}
+        merged["received"] = merged["received"].astype(np.int32)
+        merged["closed"] = merged["closed"].astype(np.int32)
+        return TrendCube(merged, self.build_seconds)
+
+    def save(self, path: str) -> None:
+        """Write the cube cells to a compressed .npz file."""
+        np.savez_compressed(path, **self.cells)
+
+
+def day_labels(days: np.ndarray) -> List[str]:
+    """Format days since 1970-01-01 as YYYY-MM-DD strings."""
+    return np.datetime_as_string(days.astype("datetime64[D]")).tolist()
+
+
+def main():
+    """Rebuild the trend cube from the grievance dataset and report its size."""
+    from app.services.grievance_store import get_data_path, load_store
+
+    parser = argparse.ArgumentParser(description="Rebuild the grievance trend cube")
+    parser.add_argument("--data", default=None, help="Converted grievance dataset (default: GRIEVANCE_DATA_PATH)")
+    parser.add_argument("--output", default=None, help="Optionally save the cube cells to this .npz file")
+    args = parser.parse_args()
+
+    data_path = args.data or get_data_path()
+    load_start = time.perf_counter()
+    store = load_store(data_path)
+    load_seconds = time.perf_counter() - load_start
+
+    cube = TrendCube.build(store.columns)
+    print(f"Dataset:    {data_path} ({store.size:,} grievances, loaded in {load_seconds:.2f}s)")
+    print(f"Cube cells: {cube.size:,} ({cube.size / max(store.size, 1):.2%} of rows)")
+    print(f"Cube size:  {cube.nbytes / (1024 * 1024):.2f} MB")
+    print(f"Build time: {cube.build_seconds * 1000:.1f} ms")
+
+    if args.output:
+        cube.save(args.output)
+        print(f"Saved to:   {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+import pytest
+
+STATES = ["Delhi", "Kerala", "Punjab", "Assam"]
+MINISTRIES = ["DOPOS", "MORLY", "CBODT"]
+DISTRICTS = ["North", "South", "East", "West", "Central"]
+
+
+def iso(moment: datetime) -> str:
+    """A date as the converters write it (2023-01-01T00:00:19.977Z)"""
+    return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def make_records(count: int, start: int = 0, seed: int = 0) -> List[Dict[str, Any]]:
+    """Converted grievance records numbered from start, spread over 2023"""
+    first = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    records = []
+    for i in range(start, start + count):
+        n = i * 7919 + seed
+        recvd = first + timedelta(minutes=n % 500_000, milliseconds=i)
+        records.append({
+            "registration_no": f"{MINISTRIES[n % 3]}/E/2023/{i:07d}",
+            "recvd_date": iso(recvd),
+            "closing_date": iso(recvd + timedelta(days=n % 40)) if n % 5 else None,
+            "CategoryV7": n % 11 if n % 13 else None,
+            "pincode": str(110000 + n % 17),
+            "state": STATES[n % 4],
+            "org_code": MINISTRIES[n % 3],
+            "dist_name": DISTRICTS[n % 5] if n % 9 else None,
+            "sex": "M" if n % 2 else "F",
+        })
+    return records
+
+
+def to_columns(records: List[Dict[str, Any]], fields: List[str]) -> Dict[str, List[Any]]:
+    """Column lists of records, as GrievanceStore.from_records takes them"""
+    return {field: [record.get(field) for record in records] for field in fields}
+
+
+@pytest.fixture
+def records() -> List[Dict[str, Any]]:
+    return make_records(2000)
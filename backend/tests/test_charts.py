@@ -0,0 +1,67 @@
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.middleware.response_cache import response_cache
+from app.routers.charts import cube_mask
+from app.services import grievance_store
+from app.services.grievance_store import GRIEVANCE_FIELDS, GrievanceStore
+from app.services.query import GrievanceFilter
+
+from conftest import to_columns
+
+FILTERS = [
+    {"state": "Kerala"},
+    {"org_code": "MORLY", "category": 3},
+    {"state": "Nowhere"},
+    {"state": "Assam", "start": date(2023, 3, 1), "end": date(2023, 6, 30)},
+]
+
+
+@pytest.fixture
+def store(records) -> GrievanceStore:
+    return GrievanceStore.from_records(to_columns(records, GRIEVANCE_FIELDS))
+
+
+@pytest.mark.parametrize("values", FILTERS)
+def test_cube_cells_match_selected_rows(store, values):
+    filters = GrievanceFilter(**values)
+    cells = store.select_cells(cube_mask(store, filters))
+    rows = store.select(filters.mask(store))
+
+    assert cells.size == rows.size
+    assert cells.top("state") == rows.top("state") and cells.top("org_code", 2) == rows.top("org_code", 2)
+    assert cells.top_categories() == rows.top_categories()
+    if filters.start is None:
+        # Closings are only the same when no date range applies
+        assert cells.months == rows.months
+        assert cells.monthly_received.tolist() == rows.monthly_received.tolist()
+        assert cells.monthly_closed.tolist() == rows.monthly_closed.tolist()
+        assert cells.closed_total == rows.closed_total
+
+
+def test_cube_filters_do_not_select_rows(store, monkeypatch):
+    monkeypatch.setattr(grievance_store, "_store", store)
+    response_cache.clear()
+    selections = []
+    select = GrievanceStore.select
+    monkeypatch.setattr(GrievanceStore, "select", lambda self, mask: selections.append(mask) or select(self, mask))
+    client = TestClient(app)
+
+    by_state = client.get("/api/charts/grievances/by-state", params={"org_code": "MORLY", "start": "2023-02-01"})
+    revenue = client.get("/api/charts/revenue-by-month", params={"state": "Kerala"})
+    assert by_state.status_code == revenue.status_code == 200
+    assert not selections
+
+    rows = store.select(GrievanceFilter(start=date(2023, 2, 1), org_code="MORLY").mask(store))
+    assert [(group["name"], group["count"]) for group in by_state.json()] == rows.top("state", 50)
+    rows = store.select(GrievanceFilter(state="Kerala").mask(store))
+    assert [month["revenue"] for month in revenue.json()] == rows.monthly_received.tolist()
+
+    selections.clear()
+    assert client.get("/api/charts/grievances/by-district", params={"state": "Kerala"}).status_code == 200
+    assert client.get("/api/charts/revenue-by-month", params={"state": "Kerala", "end": "2023-06-30"}).status_code == 200
+    assert len(selections) == 2
+    response_cache.clear()
@@ -0,0 +1,62 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from app.services import action_history, grievance_store
+from app.services.dataset import open_column_store, write_column_store
+
+from conftest import make_records
+
+
+@pytest.fixture(autouse=True)
+def restore_shared(monkeypatch):
+    monkeypatch.setattr(grievance_store, "_store", None)
+    monkeypatch.setattr(action_history, "_actions", None)
+
+
+def write_json(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(records, f)
+
+
+def test_stale_store_falls_back_to_json(tmp_path):
+    data, store_path = str(tmp_path / "grievances.json"), str(tmp_path / "store")
+    write_json(data, make_records(200))
+    grievance_store.load_store(data).save(store_path)
+
+    opened = grievance_store.load_store(store_path)
+    assert opened.memory_mapped and opened.size == 200
+
+    # e.g. fix_json_files.py --incremental appending to the dataset
+    write_json(data, make_records(250))
+    reloaded = grievance_store.load_store(store_path)
+    assert not reloaded.memory_mapped and reloaded.size == 250
+
+    reloaded.save(store_path)
+    assert grievance_store.load_store(store_path).memory_mapped
+
+
+def test_stale_action_store_falls_back_to_json(tmp_path):
+    data, store_path = str(tmp_path / "actions.json"), str(tmp_path / "store")
+    actions = [{"registration_no": f"R{i % 7}", "action_srno": i, "action_date": "2023-01-01T00:00:00.000Z",
+                "action_name": "Forwarded", "from_org_code": "A", "to_org_code": "B"} for i in range(20)]
+    write_json(data, actions)
+    action_history.load_actions(data).save(store_path)
+    assert action_history.load_actions(store_path).memory_mapped
+
+    write_json(data, actions[:10])
+    reloaded = action_history.load_actions(store_path)
+    assert not reloaded.memory_mapped and reloaded.size == 10
+
+
+def test_write_column_store_replaces_whole_store(tmp_path):
+    path = str(tmp_path / "store")
+    write_column_store(path, {"a": np.arange(3)}, {"source": "first"})
+    write_column_store(path, {"b": np.arange(5)}, {"source": "second"})
+
+    arrays, meta = open_column_store(path)
+    assert list(arrays) == ["b"] and meta["source"] == "second"
+    assert sorted(os.listdir(tmp_path)) == ["store"]
+    assert sorted(os.listdir(path)) == ["b.npy", "meta.json"]
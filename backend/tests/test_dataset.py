@@ -0,0 +1,44 @@
+import io
+import json
+
+import numpy as np
+
+from app.services.dataset import iter_json_chunks, read_columns
+from app.services.dates import NAT, parse_dates
+from app.services.grievance_store import GRIEVANCE_FIELDS
+from app.services.records import GRIEVANCE_LAYOUT
+
+from conftest import make_records
+
+
+def test_json_chunks_split_only_between_records():
+    records = [{"id": i, "text": 'a "}, {" b', "nested": {"x": {"y": i}}, "list": [{"z": 1}, 2]}
+               for i in range(500)]
+    text = "[\n" + ",\n".join(map(json.dumps, records)) + "\n]\n"
+
+    chunks = list(iter_json_chunks(io.StringIO(text), buffer_size=100))
+
+    assert len(chunks) > 1
+    assert [record for chunk in chunks for record in chunk] == records
+    assert list(iter_json_chunks(io.StringIO(" [ ] "))) == [[]]
+
+
+def test_read_columns_matches_json(tmp_path):
+    records = make_records(3000)
+    records[5]["pincode"] = ["not", "hashable"]
+    path = tmp_path / "grievances.json"
+    path.write_text(json.dumps(records, indent=2))
+
+    data = read_columns(str(path), GRIEVANCE_FIELDS, GRIEVANCE_LAYOUT)
+
+    for field in GRIEVANCE_FIELDS:
+        values = [record.get(field) for record in records]
+        if field in GRIEVANCE_LAYOUT.dates:
+            assert data[field].dtype == np.int64
+            assert np.array_equal(data[field], parse_dates(values))
+            assert (data[field] == NAT).sum() == values.count(None)
+        else:
+            assert data[field] == values
+    assert read_columns(str(path))["sex"] == [record["sex"] for record in records]
+    # One str object per distinct value of an interned field
+    assert len(set(map(id, data["state"]))) == len(set(data["state"]))
@@ -0,0 +1,30 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+def test_route_404_keeps_detail():
+    response = TestClient(app).get("/api/charts/top/nowhere")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Unknown dimension: nowhere"}
+
+
+def test_unknown_route_lists_endpoints():
+    response = TestClient(app).get("/api/nowhere")
+    assert response.status_code == 404
+    assert response.json()["message"] == "Endpoint not found"
+    assert "/api/health" in response.json()["available_endpoints"]
+
+
+def test_group_limit_is_bounded():
+    client = TestClient(app)
+    assert client.get("/api/charts/grievances/by-state", params={"limit": 0}).status_code == 422
+    assert client.get("/api/charts/grievances/by-state", params={"limit": 1001}).status_code == 422
+    assert client.get("/api/charts/grievances/by-state", params={"limit": 5}).status_code == 200
+
+
+def test_resolution_time_limit_is_bounded():
+    client = TestClient(app)
+    assert client.get("/api/charts/resolution-time/by-state", params={"limit": -1}).status_code == 422
+    assert client.get("/api/charts/resolution-time/by-state", params={"limit": 5000}).status_code == 422
+    assert client.get("/api/charts/resolution-time/by-state", params={"limit": 5}).status_code == 200
@@ -0,0 +1,59 @@
+import asyncio
+import json
+
+from app.services.export import Snapshot, page_records, stream_records
+from app.services.grievance_store import GRIEVANCE_FIELDS, GrievanceStore
+from app.services.query import GrievanceFilter
+
+from conftest import make_records, to_columns
+
+
+async def collect(chunks, on_chunk=None):
+    """Body of a streamed export, calling on_chunk after each chunk"""
+    body = b""
+    async for chunk in chunks:
+        body += chunk
+        if on_chunk is not None:
+            on_chunk()
+    return body
+
+
+def ingest(store, records):
+    """The store with the state and received date of existing records changed and new ones added"""
+    changed = [dict(record, state="Goa", recvd_date="2022-06-01T00:00:00.000Z") for record in records[::7]]
+    updated, _ = store.apply_records(to_columns(changed + make_records(300, start=len(records), seed=2),
+                                                GRIEVANCE_FIELDS))
+    return updated
+
+
+def test_export_unchanged_by_ingest_during_stream(records):
+    store = GrievanceStore.from_records(to_columns(records, GRIEVANCE_FIELDS))
+    expected = asyncio.run(collect(stream_records(Snapshot(store), GrievanceFilter(), "ndjson", batch_rows=100)))
+
+    ingested = []
+
+    def ingest_once():
+        if not ingested:
+            ingested.append(ingest(store, records))
+
+    snapshot = Snapshot(store)
+    body = asyncio.run(collect(stream_records(snapshot, GrievanceFilter(), "ndjson", batch_rows=100), ingest_once))
+    assert ingested and ingested[0].version == snapshot.version + 1
+    assert body == expected
+    exported = [json.loads(line) for line in body.splitlines()]
+    assert len(exported) == len(records)
+    assert "Goa" not in {record["state"] for record in exported}
+
+
+def test_export_pages_unchanged_by_ingest(records):
+    store = GrievanceStore.from_records(to_columns(records, GRIEVANCE_FIELDS))
+    snapshot = Snapshot(store)
+    expected = page_records(snapshot, GrievanceFilter(), 1000)["records"]
+
+    first = page_records(snapshot, GrievanceFilter(), 500)
+    updated = ingest(store, records)
+    second = page_records(snapshot, GrievanceFilter(), 500, first["next_cursor"])
+    assert first["records"] + second["records"] == expected
+
+    fresh = page_records(Snapshot(updated), GrievanceFilter(), 1000)["records"]
+    assert fresh != expected
@@ -0,0 +1,114 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routers import admin
+from app.services import grievance_store
+from app.services.grievance_store import CODED_FIELDS, GRIEVANCE_FIELDS, GrievanceStore
+
+from conftest import make_records, to_columns
+
+
+def decoded_rows(store: GrievanceStore):
+    """Store columns ordered by registration_no, coded fields as labels"""
+    order = np.argsort(store.columns["registration_no"], kind="stable")
+    return {
+        name: np.asarray(store.labels[name])[values[order]] if name in CODED_FIELDS else values[order]
+        for name, values in store.columns.items()
+    }
+
+
+def aggregates(store: GrievanceStore):
+    """Aggregates served by the chart endpoints, independent of label order"""
+    return {
+        "top": {field: sorted(store.top(field)) for field in CODED_FIELDS},
+        "months": store.months,
+        "monthly_received": store.monthly_received.tolist(),
+        "monthly_closed": store.monthly_closed.tolist(),
+        "monthly_districts": store.monthly_districts.tolist(),
+        "days": store.days,
+        "daily_received": store.daily_received.tolist(),
+        "categories": sorted(store.top_categories()),
+        "closed_total": store.closed_total,
+        "disposal_ms_total": store.disposal_ms_total,
+        "disposal_count": store.disposal_count,
+        "cube_cells": store.cube.size,
+        "resolution": store.resolution.histograms()[1].tolist(),
+    }
+
+
+def test_apply_records_matches_rebuild(records):
+    store = GrievanceStore.from_records(to_columns(records, GRIEVANCE_FIELDS))
+
+    changed = [dict(record, state="Goa", closing_date=None) for record in records[:300:3]]
+    added = make_records(500, start=len(records), seed=1)
+    unchanged = records[1000:1100]
+    store, result = store.apply_records(to_columns(changed + added + unchanged, GRIEVANCE_FIELDS))
+    assert (result["added"], result["updated"], result["unchanged"]) == (500, len(changed), 100)
+
+    merged = {record["registration_no"]: record for record in records}
+    merged.update((record["registration_no"], record) for record in changed + added)
+    rebuilt = GrievanceStore.from_records(to_columns(list(merged.values()), GRIEVANCE_FIELDS))
+
+    assert store.size == rebuilt.size
+    recvd = store.columns["recvd_date"]
+    assert np.all(recvd[1:] >= recvd[:-1])
+    for name, values in decoded_rows(rebuilt).items():
+        np.testing.assert_array_equal(decoded_rows(store)[name], values, err_msg=name)
+    assert aggregates(store) == aggregates(rebuilt)
+
+
+def test_apply_records_leaves_store_untouched(records):
+    store = GrievanceStore.from_records(to_columns(records, GRIEVANCE_FIELDS))
+    selected = store.select(store.columns["state"] == 0)
+    before = {name: values.copy() for name, values in store.columns.items()}
+    before_aggregates = aggregates(store)
+
+    changed = [dict(record, state="Goa", recvd_date="2022-06-01T00:00:00.000Z") for record in records[:50]]
+    updated, _ = store.apply_records(to_columns(changed + make_records(10, start=len(records)), GRIEVANCE_FIELDS))
+
+    for name, values in before.items():
+        np.testing.assert_array_equal(store.columns[name], values, err_msg=name)
+    assert aggregates(store) == before_aggregates
+    assert (store.version, store.size) == (1, len(records))
+    for shared in (store, selected):
+        assert "Goa" not in shared.labels["state"] and "Goa" not in shared.label_index["state"]
+    assert "Goa" in updated.labels["state"] and updated.size == len(records) + 10
+
+
+def test_ingest_publishes_new_store(records, monkeypatch, admin_token):
+    store = GrievanceStore.from_records(to_columns(records, GRIEVANCE_FIELDS))
+    monkeypatch.setattr(grievance_store, "_store", store)
+    notified = []
+    monkeypatch.setattr(app.state, "precompute", SimpleNamespace(notify=lambda: notified.append(True)), raising=False)
+
+    added = make_records(5, start=len(records))
+    response = TestClient(app).post("/api/admin/ingest", json=added,
+                                    headers={"Authorization": f"Bearer {admin_token}"})
+
+    assert response.status_code == 200 and response.json()["added"] == 5
+    assert grievance_store.get_store() is not store
+    assert grievance_store.get_store().size == len(records) + 5 and store.size == len(records)
+    assert notified
+
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+    return "secret"
+
+
+def test_admin_disabled_without_token(monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "")
+    response = TestClient(app).post("/api/admin/ingest", json=[], headers={"Authorization": "Bearer "})
+    assert response.status_code == 403
+
+
+def test_admin_requires_token(admin_token):
+    client = TestClient(app)
+    assert client.get("/api/admin/cache").status_code == 401
+    assert client.get("/api/admin/cache", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/api/admin/cache", headers={"Authorization": f"Bearer {admin_token}"}).status_code == 200
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from app.main import app
+from app.middleware.response_cache import ResponseCache
+from app.services import action_history, grievance_store
+from app.services.action_history import ActionHistoryIndex
+from app.services.grievance_store import GRIEVANCE_FIELDS, GrievanceStore
+from app.services.precompute import PrecomputeScheduler
+
+from conftest import to_columns
+
+
+@pytest.fixture(autouse=True)
+def shared_store(records, monkeypatch):
+    store = GrievanceStore.from_records(to_columns(records, GRIEVANCE_FIELDS))
+    monkeypatch.setattr(grievance_store, "_store", store)
+    monkeypatch.setattr(action_history, "_actions", ActionHistoryIndex.empty())
+    return store
+
+
+def warm(workers):
+    """Cached bodies after one precompute run"""
+    cache = ResponseCache()
+    scheduler = PrecomputeScheduler(app, cache, workers=workers)
+
+    async def run():
+        try:
+            return await scheduler.warm()
+        finally:
+            scheduler.close()
+
+    stored = asyncio.run(run())
+    assert stored == len(cache.entries)
+    return {key: entry.body for key, entry in cache.entries.items()}
+
+
+def test_spawned_workers_render_like_the_server():
+    in_thread = warm(workers=0)
+    assert len(in_thread) > 10
+    assert warm(workers=2) == in_thread
+
+
+def test_workers_open_column_store_directly(shared_store, tmp_path, monkeypatch):
+    path = str(tmp_path / "store")
+    shared_store.save(path)
+    opened = GrievanceStore.open(path)
+    monkeypatch.setattr(grievance_store, "_store", opened)
+
+    scheduler = PrecomputeScheduler(app, ResponseCache(), workers=1)
+    assert asyncio.run(scheduler.store_path(opened)) == path
+    assert scheduler.snapshot is None
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Batched Chart Benchmark
+
+Measures a filtered dashboard load, on a store built from a synthetic dump
+converted with fix_json_streaming, with the response cache disabled:
+
+- separate: one GET per dashboard chart, each compiling the filter and
+  selecting the matching rows again
+- batch: one POST /api/charts/batch of the same charts, sharing one row
+  mask and one filtered store
+
+Both must return the same payloads.
+
+Usage: python benchmarks/bench_batch.py [--records N] [--repeat N]
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "scripts"))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "backend"))
+# Every request must reach the handler
+os.environ["RESPONSE_CACHE_TTL"] = "0"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from fix_json_streaming import stream_json_file  # noqa: E402
+from generate_data import GRIEVANCE_FILE, generate  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.services.grievance_store import load_store  # noqa: E402
+
+# Charts of the dashboard page
+DASHBOARD = ["/kpi-cards", "/analytics", "/time-series", "/donut-data", "/revenue-by-month"]
+
+
+def median_ms(repeat, function):
+    """Median of ``repeat`` timed calls, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched chart requests")
+    parser.add_argument("--records", type=int, default=1_000_000, help="Grievances to generate (default: 1000000)")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per measurement (default: 10)")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        generate(args.records, tmp_dir)
+        dataset = os.path.join(tmp_dir, "fixed_grievance_v2.json")
+        stream_json_file(os.path.join(tmp_dir, GRIEVANCE_FILE), dataset)
+        os.environ["GRIEVANCE_DATA_PATH"] = dataset
+        os.environ["ACTION_HISTORY_DATA_PATH"] = os.path.join(tmp_dir, "missing.json")
+        store = load_store(dataset)
+        state = store.top("state", 1)[0][0]
+        sex = store.top("sex", 1)[0][0]
+        district = store.top("dist_name", 1)[0][0]
+        cases = {
+            "none": {},
+            "state+sex": {"state": state, "sex": sex},
+            "2024 + state": {"start": "2024-01-01", "end": "2024-12-31", "state": state},
+            "district": {"dist_name": district},
+        }
+
+        print(f"Input: {store.size:,} grievances, {len(DASHBOARD)} charts")
+        print(f"\n{'filter':<14} {'separate ms':>12} {'batch ms':>9} {'speedup':>8}")
+        with TestClient(app) as client:
+            for name, filters in cases.items():
+                batch = {"charts": [{"route": route} for route in DASHBOARD], "filters": filters}
+
+                def separate():
+                    return [client.get("/api/charts" + route, params=filters).json() for route in DASHBOARD]
+
+                def batched():
+                    return [result["data"] for result in client.post("/api/charts/batch", json=batch).json()["results"]]
+
+                assert separate() == batched()
+                separate_ms = median_ms(args.repeat, separate)
+                batch_ms = median_ms(args.repeat, batched)
+                print(f"{name:<14} {separate_ms:>12.2f} {batch_ms:>9.2f} {separate_ms / batch_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
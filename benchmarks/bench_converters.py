@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+MongoDB Wrapper Converter Benchmark
+
+Compares the three ways fix_json_streaming can convert $date / $numberLong /
+$oid wrappers, on synthetic grievance and action history dumps:
+
+- recursive: convert_mongodb_objects on every parsed record
+- schema:    SchemaConverter, converting only the learned wrapper fields
+- hook:      mongodb_object_hook, converting while json parses
+
+"Convert" is the time spent on conversion alone: the converter run over
+already parsed records, or for the hook, hooked parsing minus plain parsing.
+"Stream" is the end-to-end stream_json_file time with that converter. All
+converters must produce identical records.
+
+Usage: python benchmarks/bench_converters.py [--records N] [--repeat N]
+"""
+
+import argparse
+import copy
+import gc
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from fix_json_streaming import (  # noqa: E402
+    SchemaConverter,
+    convert_mongodb_objects,
+    mongodb_object_hook,
+    stream_json_file,
+)
+from generate_data import ACTION_HISTORY_FILE, GRIEVANCE_FILE, generate  # noqa: E402
+
+
+def best_of(repeat, function):
+    """Fastest of ``repeat`` timed calls, with the garbage collector paused."""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MongoDB wrapper converters")
+    parser.add_argument("--records", type=int, default=100_000, help="Grievances to generate (default: 100000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (default: 3)")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        generate(args.records, tmp_dir)
+        for dump in (GRIEVANCE_FILE, ACTION_HISTORY_FILE):
+            path = os.path.join(tmp_dir, dump)
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            records = json.loads(text)
+            expected = [convert_mongodb_objects(record) for record in records]
+            converter = SchemaConverter()
+            assert [converter.convert(record) for record in copy.deepcopy(records)] == expected
+            assert json.loads(text, object_hook=mongodb_object_hook) == expected
+
+            parse = best_of(args.repeat, lambda: json.loads(text))
+            convert = {
+                "recursive": best_of(args.repeat, lambda: [convert_mongodb_objects(r) for r in records]),
+                "hook": best_of(args.repeat, lambda: json.loads(text, object_hook=mongodb_object_hook)) - parse,
+            }
+            # SchemaConverter converts in place, so every run needs fresh records
+            copies = [json.loads(text) for _ in range(args.repeat)]
+            convert["schema"] = best_of(
+                args.repeat, lambda: list(map(SchemaConverter().convert, copies.pop()))
+            )
+
+            print(f"\n{dump}: {len(records):,} records, {len(text) / (1024 * 1024):.1f} MB "
+                  f"(json.loads alone {parse:.2f}s)")
+            for name in ("recursive", "schema", "hook"):
+                output = os.path.join(tmp_dir, f"{name}.json")
+                stream = best_of(1, lambda: stream_json_file(path, output, converter=name))
+                print(f"  {name:<10} convert {convert[name]:6.3f}s "
+                      f"({len(records) / convert[name]:>12,.0f} rec/s, "
+                      f"{convert['recursive'] / convert[name]:4.1f}x)   "
+                      f"stream {stream:6.2f}s ({len(records) / stream:>9,.0f} rec/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Date Column Parsing Benchmark
+
+Compares converting a column of grievance dates to epoch milliseconds one
+value at a time with to_epoch_ms against the vectorized parse_dates
+(app/services/dates.py), as done when the grievance store is built. Dates
+are written like the converted dumps ("...T00:00:19.977Z"), or like the raw
+exports ("...+0000") with --raw; about 10% are missing, like closing_date.
+Both routes must produce identical arrays.
+
+Usage: python benchmarks/bench_dates.py [--rows N] [--repeat N] [--raw]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from app.services.dates import parse_dates, to_epoch_ms  # noqa: E402
+
+
+def make_dates(rows, suffix, seed=0):
+    """ISO date strings over 2023-2025, with about one in ten missing."""
+    rng = random.Random(seed)
+    start = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    dates = []
+    for _ in range(rows):
+        if rng.random() < 0.1:
+            dates.append(None)
+            continue
+        when = start + timedelta(milliseconds=rng.randrange(80_000_000_000))
+        dates.append(when.strftime("%Y-%m-%dT%H:%M:%S.") + f"{when.microsecond // 1000:03d}{suffix}")
+    return dates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark date column parsing")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Dates per column (default: 1000000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per method (default: 5)")
+    parser.add_argument("--raw", action="store_true", help="Use +0000 dates as in the raw exports")
+    args = parser.parse_args()
+
+    values = make_dates(args.rows, "+0000" if args.raw else "Z")
+    methods = {
+        "to_epoch_ms": lambda: np.fromiter((to_epoch_ms(v) for v in values), dtype=np.int64, count=len(values)),
+        "parse_dates": lambda: parse_dates(values),
+    }
+    assert np.array_equal(methods["to_epoch_ms"](), methods["parse_dates"]())
+
+    print(f"Input: {args.rows:,} dates like {values[0]!r}")
+    medians = {}
+    for name, method in methods.items():
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            method()
+            timings.append((time.perf_counter() - start) * 1000)
+        medians[name] = statistics.median(timings)
+        print(f"{name:>12}: median {medians[name]:8.1f} ms, min {min(timings):8.1f} ms")
+    print(f"Speedup: {medians['to_epoch_ms'] / medians['parse_dates']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
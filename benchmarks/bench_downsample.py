@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Time-Series Downsampling Benchmark
+
+Times LTTB downsampling (app/services/downsample.py) of a long random-walk
+series, as applied by /api/charts/time-series?max_points=N, for several
+output sizes.
+
+Usage: python benchmarks/bench_downsample.py [--points N] [--max-points N ...] [--repeat N]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from app.services.downsample import lttb  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LTTB downsampling")
+    parser.add_argument("--points", type=int, default=1_000_000, help="Input points (default: 1000000)")
+    parser.add_argument("--max-points", type=int, nargs="+", default=[500, 1000, 5000],
+                        help="Output sizes to time (default: 500 1000 5000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per output size (default: 5)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    days = np.arange(args.points, dtype=np.int64)
+    counts = np.abs(rng.normal(size=args.points).cumsum()).astype(np.int64)
+
+    print(f"Input: {args.points:,} points")
+    for max_points in args.max_points:
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            keep = lttb(days, counts, max_points)
+            timings.append((time.perf_counter() - start) * 1000)
+        assert len(keep) == min(max_points, args.points)
+        print(f"max_points={max_points:>6,}: median {statistics.median(timings):7.2f} ms, "
+              f"min {min(timings):7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Response Encoding Benchmark
+
+Compares the encodings the chart API negotiates for columnar payloads, on a
+store built from a synthetic dump converted with fix_json_streaming:
+
+- size: JSON records and the Arrow stream (Accept:
+  application/vnd.apache.arrow.stream), each uncompressed and with every
+  available content coding (gzip, and br if brotli is installed)
+- decode: time for a client to turn each body back into data (JSON
+  records, or an Arrow table whose columns are read in place)
+- cached: latency of a cached GET with Accept-Encoding: gzip, where the
+  compressed copy is kept on the cache entry, against compressing per
+  request
+
+Usage: python benchmarks/bench_encodings.py [--records N] [--repeat N]
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "scripts"))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "backend"))
+
+import pyarrow as pa  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from fix_json_streaming import stream_json_file  # noqa: E402
+from generate_data import GRIEVANCE_FILE, generate  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.middleware.response_cache import COMPRESSORS  # noqa: E402
+from app.services.serialization import ARROW_MEDIA_TYPE  # noqa: E402
+
+ENDPOINTS = [
+    "/api/charts/time-series",
+    "/api/charts/time-series?granularity=week",
+    "/api/charts/resolution-time/by-month",
+    "/api/charts/grievances/by-district?limit=1000",
+]
+
+
+def median_ms(repeat, function):
+    """Median of ``repeat`` timed calls, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chart response encodings")
+    parser.add_argument("--records", type=int, default=1_000_000, help="Grievances to generate (default: 1000000)")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per measurement (default: 20)")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        generate(args.records, tmp_dir)
+        dataset = os.path.join(tmp_dir, "fixed_grievance_v2.json")
+        stream_json_file(os.path.join(tmp_dir, GRIEVANCE_FILE), dataset)
+        os.environ["GRIEVANCE_DATA_PATH"] = dataset
+        os.environ["ACTION_HISTORY_DATA_PATH"] = os.path.join(tmp_dir, "missing.json")
+
+        with TestClient(app) as client:
+            print(f"Input: {args.records:,} grievances; codings: {', '.join(COMPRESSORS)}")
+            print(f"\n{'endpoint':<46} {'body':<6} {'bytes':>9} " + " ".join(f"{c:>8}" for c in COMPRESSORS)
+                  + f" {'decode ms':>10}")
+            for endpoint in ENDPOINTS:
+                plain = {"accept-encoding": "identity"}
+                bodies = {
+                    "json": client.get(endpoint, headers=plain).content,
+                    "arrow": client.get(endpoint, headers={**plain, "accept": ARROW_MEDIA_TYPE}).content,
+                }
+                decoders = {
+                    "json": lambda body: json.loads(body),
+                    "arrow": lambda body: pa.ipc.open_stream(body).read_all(),
+                }
+                for name, body in bodies.items():
+                    sizes = " ".join(f"{len(compress(body)):>8,}" for compress in COMPRESSORS.values())
+                    decode = median_ms(args.repeat, lambda: decoders[name](body))
+                    print(f"{endpoint:<46} {name:<6} {len(body):>9,} {sizes} {decode:>10.3f}")
+
+            endpoint = ENDPOINTS[0]
+            body = client.get(endpoint, headers={"accept-encoding": "identity"}).content
+            gzip_per_request = median_ms(args.repeat, lambda: COMPRESSORS["gzip"](body))
+
+            def fetch(coding):
+                # Raw body: the time a client spends decompressing is not the server's
+                with client.stream("GET", endpoint, headers={"accept-encoding": coding}) as response:
+                    for _ in response.iter_raw():
+                        pass
+
+            identity = median_ms(args.repeat, lambda: fetch("identity"))
+            cached_gzip = median_ms(args.repeat, lambda: fetch("gzip"))
+            print(f"\n{endpoint} ({len(body):,} bytes), cached")
+            print(f"  identity hit:              {identity:8.3f} ms")
+            print(f"  gzip hit (kept on entry):  {cached_gzip:8.3f} ms")
+            print(f"  gzip per request would add {gzip_per_request:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Grievance Export Benchmark
+
+Exports every grievance of a store built from a synthetic dump converted
+with fix_json_streaming, and compares throughput and peak Python memory
+(tracemalloc) of:
+
+- list: every record decoded and encoded as one JSON array, as a response
+  built in memory would be
+- ndjson / csv: the chunks of the streaming export, consumed and dropped
+  one batch at a time, for several batch sizes
+
+Both must contain the same records.
+
+Usage: python benchmarks/bench_export.py [--records N] [--repeat N]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "scripts"))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "backend"))
+
+from fix_json_streaming import stream_json_file  # noqa: E402
+from generate_data import GRIEVANCE_FILE, generate  # noqa: E402
+
+from app.services.export import Snapshot, record_columns, stream_records  # noqa: E402
+from app.services.grievance_store import load_store  # noqa: E402
+from app.services.query import GrievanceFilter  # noqa: E402
+from app.services.serialization import encode_records  # noqa: E402
+
+BATCH_SIZES = [1_000, 5_000, 20_000]
+NO_FILTER = GrievanceFilter()
+
+
+def export_list(snapshot):
+    """The whole export as one in-memory JSON array"""
+    return len(encode_records(record_columns(snapshot, np.arange(snapshot.size))))
+
+
+def export_stream(snapshot, fmt, batch_rows):
+    """Bytes of a streaming export, dropping each chunk once counted"""
+    async def consume():
+        total = 0
+        async for chunk in stream_records(snapshot, NO_FILTER, fmt, batch_rows):
+            total += len(chunk)
+        return total
+    return asyncio.run(consume())
+
+
+def measure(repeat, function):
+    """(median seconds, peak traced MB) of a function"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(timings), peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the streaming grievance export")
+    parser.add_argument("--records", type=int, default=1_000_000, help="Grievances to generate (default: 1000000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (default: 3)")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        generate(args.records, tmp_dir)
+        dataset = os.path.join(tmp_dir, "fixed_grievance_v2.json")
+        stream_json_file(os.path.join(tmp_dir, GRIEVANCE_FILE), dataset)
+        snapshot = Snapshot(load_store(dataset))
+
+        async def ndjson_records():
+            return [json.loads(line) async for chunk in stream_records(snapshot, NO_FILTER, "ndjson")
+                    for line in chunk.splitlines()]
+        assert asyncio.run(ndjson_records()) == json.loads(encode_records(record_columns(snapshot, np.arange(snapshot.size))))
+
+        print(f"Input: {snapshot.size:,} grievances")
+        print(f"\n{'export':<16} {'seconds':>8} {'rows/s':>11} {'peak MB':>8}")
+        cases = {"list": lambda: export_list(snapshot)}
+        for fmt in ("ndjson", "csv"):
+            for batch_rows in BATCH_SIZES:
+                cases[f"{fmt} {batch_rows}"] = lambda fmt=fmt, batch_rows=batch_rows: export_stream(snapshot, fmt, batch_rows)
+        for name, function in cases.items():
+            seconds, peak = measure(args.repeat, function)
+            print(f"{name:<16} {seconds:>8.2f} {snapshot.size / seconds:>11,.0f} {peak:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Filtered Query Benchmark
+
+Measures the chart API with and without grievance filters, on a store built
+from a synthetic dump converted with fix_json_streaming:
+
+- mask: compiling a filter to a row mask with GrievanceFilter (date range
+  from the recvd_date order, bitmap ANDs for low-cardinality fields)
+  against comparing every column over every row; both must agree
+- endpoint: request latency of chart endpoints unfiltered (precomputed
+  aggregates) and filtered, with the response cache disabled
+
+Usage: python benchmarks/bench_filters.py [--records N] [--repeat N]
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "scripts"))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "backend"))
+# Every request must reach the handler
+os.environ["RESPONSE_CACHE_TTL"] = "0"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from fix_json_streaming import stream_json_file  # noqa: E402
+from generate_data import GRIEVANCE_FILE, generate  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.services.dates import NAT, MS_PER_DAY  # noqa: E402
+from app.services.grievance_store import load_store  # noqa: E402
+from app.services.query import EPOCH_DATE, FILTER_COLUMNS, GrievanceFilter  # noqa: E402
+
+ENDPOINTS = [
+    "/api/charts/kpi-cards",
+    "/api/charts/grievances/by-district",
+    "/api/charts/time-series?granularity=month",
+    "/api/charts/resolution-time/by-state",
+]
+
+
+def median_ms(repeat, function):
+    """Median of ``repeat`` timed calls, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def scan_mask(store, filters):
+    """Row mask by comparing each filtered column on every row."""
+    mask = np.ones(store.size, dtype=bool)
+    recvd = store.columns["recvd_date"]
+    if filters.start is not None:
+        mask &= (recvd != NAT) & (recvd >= (filters.start - EPOCH_DATE).days * MS_PER_DAY)
+    if filters.end is not None:
+        mask &= (recvd != NAT) & (recvd < ((filters.end - EPOCH_DATE).days + 1) * MS_PER_DAY)
+    for name, value in filters.values.items():
+        code = value if name == "category" else store.code_of(name, value)
+        mask &= store.columns[FILTER_COLUMNS[name]] == code
+    return mask
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark filtered chart queries")
+    parser.add_argument("--records", type=int, default=1_000_000, help="Grievances to generate (default: 1000000)")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per measurement (default: 10)")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        generate(args.records, tmp_dir)
+        dataset = os.path.join(tmp_dir, "fixed_grievance_v2.json")
+        stream_json_file(os.path.join(tmp_dir, GRIEVANCE_FILE), dataset)
+        os.environ["GRIEVANCE_DATA_PATH"] = dataset
+        os.environ["ACTION_HISTORY_DATA_PATH"] = os.path.join(tmp_dir, "missing.json")
+        store = load_store(dataset)
+
+        state = store.top("state", 1)[0][0]
+        org_code = store.top("org_code", 1)[0][0]
+        sex = store.top("sex", 1)[0][0]
+        district = store.top("dist_name", 1)[0][0]
+        cases = {
+            "state": GrievanceFilter(state=state),
+            "state+sex": GrievanceFilter(state=state, sex=sex),
+            "state+org+sex": GrievanceFilter(state=state, org_code=org_code, sex=sex),
+            "2024 + state+sex": GrievanceFilter(date(2024, 1, 1), date(2024, 12, 31), state=state, sex=sex),
+            "district": GrievanceFilter(dist_name=district),
+        }
+
+        print(f"Input: {store.size:,} grievances")
+        print(f"\n{'filter':<18} {'rows':>9} {'scan ms':>9} {'bitmap ms':>10} {'speedup':>8}")
+        for name, filters in cases.items():
+            expected = scan_mask(store, filters)
+            assert np.array_equal(filters.mask(store), expected)  # also builds the bitmaps
+            scan = median_ms(args.repeat, lambda: scan_mask(store, filters))
+            compiled = median_ms(args.repeat, lambda: filters.mask(store))
+            print(f"{name:<18} {int(expected.sum()):>9,} {scan:>9.2f} {compiled:>10.2f} {scan / compiled:>7.1f}x")
+
+        query = f"state={state}&sex={sex}"
+        print(f"\n{'endpoint':<44} {'unfiltered ms':>14} {'?' + query:>24}")
+        with TestClient(app) as client:
+            for endpoint in ENDPOINTS:
+                separator = "&" if "?" in endpoint else "?"
+                filtered = endpoint + separator + query
+                assert client.get(filtered).status_code == 200
+                plain = median_ms(args.repeat, lambda: client.get(endpoint))
+                with_filter = median_ms(args.repeat, lambda: client.get(filtered))
+                print(f"{endpoint:<44} {plain:>14.2f} {with_filter:>24.2f}")
+
+
+if __name__ == "__main__":
+    main()
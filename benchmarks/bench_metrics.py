@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Metrics Overhead Benchmark
+
+Measures what request instrumentation adds per request and per hot-path
+call, without a dataset:
+
+- middleware: an ASGI app answering a fixed chart-sized body, called
+  directly and through MetricsMiddleware (with and without a requested
+  Server-Timing header); the difference is the per-request overhead
+- timer: a no-op function called directly and decorated with @timed
+
+Usage: python benchmarks/bench_metrics.py [--requests N] [--repeat N]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "backend"))
+
+from fastapi import FastAPI  # noqa: E402
+
+from app.middleware.metrics import MetricsMiddleware  # noqa: E402
+from app.services.metrics import Metrics, timed  # noqa: E402
+
+BODY = b"x" * 2048
+
+
+def median_us(repeat, calls, function):
+    """Median over ``repeat`` runs of the time per call of ``function(calls)``, in microseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(calls)
+        timings.append((time.perf_counter() - start) / calls * 1e6)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark request instrumentation overhead")
+    parser.add_argument("--requests", type=int, default=100_000, help="Calls per run (default: 100000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (default: 5)")
+    args = parser.parse_args()
+
+    app = FastAPI()
+
+    @app.get("/api/charts/kpi-cards")
+    async def kpi_cards():  # registers a route for route_of to find
+        return {}
+
+    async def endpoint(scope, receive, send):
+        scope["route"] = app.router.routes[-1]
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json"), (b"x-cache", b"MISS")]})
+        await send({"type": "http.response.body", "body": BODY})
+
+    instrumented = MetricsMiddleware(endpoint, registry=Metrics())
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    def scope(headers):
+        return {"type": "http", "method": "GET", "path": "/api/charts/kpi-cards", "headers": headers, "app": app}
+
+    def requests(target, headers):
+        async def run(calls):
+            request = scope(headers)
+            for _ in range(calls):
+                await target(dict(request), receive, send)
+        return lambda calls: asyncio.run(run(calls))
+
+    cases = {
+        "plain app": requests(endpoint, []),
+        "with metrics": requests(instrumented, []),
+        "with Server-Timing": requests(instrumented, [(b"x-server-timing", b"1")]),
+    }
+    print(f"{'request path':<20} {'us/request':>11} {'overhead us':>12}")
+    baseline = None
+    for name, run in cases.items():
+        us = median_us(args.repeat, args.requests, run)
+        baseline = us if baseline is None else baseline
+        print(f"{name:<20} {us:>11.2f} {us - baseline:>12.2f}")
+
+    def noop():
+        return None
+
+    timed_noop = timed("bench.noop")(noop)
+    print(f"\n{'hot-path call':<20} {'us/call':>11} {'overhead us':>12}")
+    plain = median_us(args.repeat, args.requests, lambda calls: [noop() for _ in range(calls)])
+    wrapped = median_us(args.repeat, args.requests, lambda calls: [timed_noop() for _ in range(calls)])
+    print(f"{'plain function':<20} {plain:>11.2f} {0:>12.2f}")
+    print(f"{'@timed':<20} {wrapped:>11.2f} {wrapped - plain:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Slow Request Profiler Overhead Benchmark
+
+Measures what SlowRequestProfilerMiddleware costs requests that are not
+slow enough to keep, without a dataset:
+
+- registration: an ASGI app answering immediately, called directly and
+  through the middleware (no samples are taken in so short a request)
+- sampling: an ASGI app doing about --work-ms of Python and NumPy work,
+  called directly and through the middleware at several sampling
+  intervals; the slowdown is what stack sampling takes from the request
+
+Usage: python benchmarks/bench_profiler.py [--requests N] [--work-ms MS] [--repeat N]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "backend"))
+
+from app.middleware.profiler import SlowRequestProfilerMiddleware  # noqa: E402
+from app.services.profiler import SlowRequestProfiler  # noqa: E402
+
+SCOPE = {"type": "http", "method": "GET", "path": "/api/charts/kpi-cards", "query_string": b"", "headers": []}
+
+
+def median_us(repeat, calls, app):
+    """Median over ``repeat`` runs of the time per request through ``app``, in microseconds."""
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    async def run():
+        for _ in range(calls):
+            await app(dict(SCOPE), receive, send)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        asyncio.run(run())
+        timings.append((time.perf_counter() - start) / calls * 1e6)
+    return statistics.median(timings)
+
+
+def endpoint(work):
+    """ASGI app doing ``work()`` before answering"""
+    async def app(scope, receive, send):
+        work()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark slow request profiler overhead")
+    parser.add_argument("--requests", type=int, default=100_000, help="Requests per registration run (default: 100000)")
+    parser.add_argument("--work-ms", type=float, default=20.0, help="Work per sampled request (default: 20)")
+    parser.add_argument("--repeat", type=int, default=7, help="Runs per measurement (default: 5)")
+    args = parser.parse_args()
+
+    def profiled(app, interval_ms):
+        # A threshold no request reaches: everything is sampled, nothing kept
+        return SlowRequestProfilerMiddleware(app, SlowRequestProfiler(threshold_ms=1e9, interval_ms=interval_ms))
+
+    noop = endpoint(lambda: None)
+    plain = median_us(args.repeat, args.requests, noop)
+    wrapped = median_us(args.repeat, args.requests, profiled(noop, 5))
+    print(f"{'registration':<22} {'us/request':>11} {'overhead us':>12}")
+    print(f"{'plain app':<22} {plain:>11.2f} {0:>12.2f}")
+    print(f"{'with profiler':<22} {wrapped:>11.2f} {wrapped - plain:>12.2f}")
+
+    values = np.random.default_rng(0).integers(0, 1000, size=200_000)
+
+    def step():
+        # Python-level work around NumPy calls, like aggregation code
+        np.bincount(values[::7])
+        sum(range(2000))
+
+    start = time.perf_counter()
+    for _ in range(100):
+        step()
+    steps = max(int(args.work_ms / ((time.perf_counter() - start) * 10)), 1)
+
+    def work():
+        for _ in range(steps):
+            step()
+
+    app = endpoint(work)
+    calls = max(int(2000 / args.work_ms), 10)
+    base = median_us(args.repeat, calls, app) / 1000
+    print(f"\n{'sampling':<22} {'ms/request':>11} {'slowdown':>12}")
+    print(f"{'plain app':<22} {base:>11.2f} {'':>12}")
+    for interval_ms in (10, 5, 1):
+        ms = median_us(args.repeat, calls, profiled(app, interval_ms)) / 1000
+        print(f"{f'every {interval_ms} ms':<22} {ms:>11.2f} {(ms / base - 1) * 100:>11.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Record Memory Benchmark
+
+Measures the memory held per converted record, on synthetic dumps
+converted with fix_json_streaming:
+
+- dicts: the records as json.load returns them, one dict per record
+- columns: the same fields as the backend reads them (read_columns with
+  the dataset's layout: dates as int64 arrays, repeated strings shared),
+  streamed a buffer at a time
+
+Memory is what tracemalloc counts as still allocated once the records are
+read; the read time is the best of --repeat. Every column must match the
+dicts.
+
+Usage: python benchmarks/bench_records.py [--records N] [--repeat N]
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "scripts"))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "backend"))
+
+from fix_json_streaming import stream_json_file  # noqa: E402
+from generate_data import ACTION_HISTORY_FILE, GRIEVANCE_FILE, generate  # noqa: E402
+
+from app.services.action_history import ACTION_LAYOUT  # noqa: E402
+from app.services.dataset import read_columns  # noqa: E402
+from app.services.dates import parse_dates  # noqa: E402
+from app.services.records import GRIEVANCE_LAYOUT  # noqa: E402
+
+
+def read_dicts(path, layout):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def held_bytes(read, path, layout):
+    """Bytes still allocated by read(path, layout) once it returns, and its result"""
+    gc.collect()
+    tracemalloc.start()
+    result = read(path, layout)
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return held, result
+
+
+def best_seconds(repeat, read, path, layout):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        read(path, layout)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memory per converted record")
+    parser.add_argument("--records", type=int, default=200_000, help="Grievances to generate (default: 200000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per timing (default: 3)")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        generate(args.records, tmp_dir)
+        datasets = {}
+        for name, raw_file, layout in [("grievances", GRIEVANCE_FILE, GRIEVANCE_LAYOUT),
+                                       ("actions", ACTION_HISTORY_FILE, ACTION_LAYOUT)]:
+            converted = os.path.join(tmp_dir, f"fixed_{name}.json")
+            stream_json_file(os.path.join(tmp_dir, raw_file), converted)
+            datasets[name] = (converted, layout)
+
+        print(f"{'dataset':<12} {'records':>9} {'container':<9} {'bytes/record':>13} {'total MB':>9} {'read s':>7}")
+        for name, (path, layout) in datasets.items():
+            reads = {
+                "dicts": read_dicts,
+                "columns": lambda path, layout: read_columns(path, None, layout),
+            }
+            results = {}
+            for container, read in reads.items():
+                held, results[container] = held_bytes(read, path, layout)
+                seconds = best_seconds(args.repeat, read, path, layout)
+                count = len(results["dicts"])
+                print(f"{name:<12} {count:>9,} {container:<9} {held / count:>13,.0f} {held / 1e6:>9.1f} {seconds:>7.2f}")
+            records, columns = results["dicts"], results["columns"]
+            for field, values in columns.items():
+                expected = [record.get(field) for record in records]
+                if field in layout.dates:
+                    assert (values == parse_dates(expected)).all(), field
+                else:
+                    assert values == expected, field
+
+
+if __name__ == "__main__":
+    main()
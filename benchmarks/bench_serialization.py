@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Chart Response Serialization Benchmark
+
+Compares the two ways a chart endpoint can return a long time series:
+
+- models:  build one TimeSeriesData per point and let FastAPI validate the
+           list against response_model and encode it (the original handlers)
+- raw:     encode the columns straight to JSON bytes with encode_records and
+           return a RawJSONResponse (the current handlers)
+
+Both routes are served from the same in-process app over the same synthetic
+series, so the difference is serialization cost only.
+
+Usage: python benchmarks/bench_serialization.py [--points N] [--repeat N]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import List
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.models.chart_models import TimeSeriesData  # noqa: E402
+from app.services.serialization import RawJSONResponse, encode_records, orjson  # noqa: E402
+from app.services.trend_cube import day_labels  # noqa: E402
+
+LABEL = "Grievances Received"
+
+
+def build_app(points: int) -> FastAPI:
+    """App with a model-based and a raw route over the same series"""
+    rng = np.random.default_rng(7)
+    days = np.arange(points, dtype=np.int64) + 10_000
+    counts = rng.integers(0, 5_000, size=points)
+
+    app = FastAPI()
+
+    @app.get("/models", response_model=List[TimeSeriesData])
+    async def models_route():
+        return [
+            TimeSeriesData(date=day, value=float(count), category=LABEL)
+            for day, count in zip(day_labels(days), counts.tolist())
+        ]
+
+    @app.get("/raw", response_model=List[TimeSeriesData])
+    async def raw_route():
+        return RawJSONResponse(encode_records({
+            "date": day_labels(days),
+            "value": counts.astype(float).tolist(),
+            "category": [LABEL] * len(days)
+        }))
+
+    return app
+
+
+def time_route(client: TestClient, path: str, repeat: int) -> List[float]:
+    """Request a route repeatedly, returning latencies in milliseconds"""
+    client.get(path)  # warm up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(path)
+        timings.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chart response serialization")
+    parser.add_argument("--points", type=int, default=10_000, help="Points in the series (default: 10000)")
+    parser.add_argument("--repeat", type=int, default=30, help="Requests per route (default: 30)")
+    args = parser.parse_args()
+
+    client = TestClient(build_app(args.points))
+    models_body = client.get("/models").content
+    raw_body = client.get("/raw").content
+    assert models_body == raw_body, "routes returned different bodies"
+
+    print(f"Series: {args.points:,} points, {len(raw_body) / 1024:.0f} KB of JSON")
+    print(f"Encoder: {'orjson' if orjson is not None else 'json (orjson not installed)'}")
+
+    results = {}
+    for route in ("models", "raw"):
+        timings = time_route(client, f"/{route}", args.repeat)
+        results[route] = statistics.median(timings)
+        print(f"{route:>7}: median {results[route]:7.2f} ms, "
+              f"p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:7.2f} ms")
+
+    print(f"Speedup: {results['models'] / results['raw']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
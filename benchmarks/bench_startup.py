@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Dataset Startup Benchmark
+
+Compares the two ways the API can load its datasets at startup, on
+synthetic dumps converted with fix_json_streaming:
+
+- json: read the converted JSON and build the store / index (aggregates included)
+- mmap: open the column store written by GrievanceStore.save /
+  ActionHistoryIndex.save, memory-mapping every array
+
+Both must serve the same aggregates. The first query after opening is timed
+too, since memory-mapped pages are only read when first touched.
+
+Usage: python benchmarks/bench_startup.py [--records N] [--repeat N]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "scripts"))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "backend"))
+
+from fix_json_streaming import stream_json_file  # noqa: E402
+from generate_data import ACTION_HISTORY_FILE, GRIEVANCE_FILE, generate  # noqa: E402
+
+from app.services.action_history import ActionHistoryIndex, load_actions  # noqa: E402
+from app.services.grievance_store import GrievanceStore, load_store  # noqa: E402
+from app.services.resolution import quantiles  # noqa: E402
+
+
+def best_of(repeat, function):
+    """Fastest of ``repeat`` timed calls, and the last result."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def first_query(store):
+    """A resolution-time query touching the sketch and the monthly series."""
+    _, histograms = store.resolution.histograms("state")
+    return quantiles(histograms), store.monthly_received.sum()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dataset loading at API startup")
+    parser.add_argument("--records", type=int, default=100_000, help="Grievances to generate (default: 100000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (default: 3)")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        counts = generate(args.records, tmp_dir)
+        paths = {}
+        for dump in (GRIEVANCE_FILE, ACTION_HISTORY_FILE):
+            paths[dump] = os.path.join(tmp_dir, dump.replace("no_pii", "fixed"))
+            stream_json_file(os.path.join(tmp_dir, dump), paths[dump])
+        store_dir = os.path.join(tmp_dir, "grievance_store")
+        actions_dir = os.path.join(tmp_dir, "action_history_store")
+
+        json_store, store = best_of(args.repeat, lambda: load_store(paths[GRIEVANCE_FILE]))
+        json_actions, actions = best_of(args.repeat, lambda: load_actions(paths[ACTION_HISTORY_FILE]))
+        store.save(store_dir)
+        actions.save(actions_dir)
+        mmap_store, opened = best_of(args.repeat, lambda: GrievanceStore.open(store_dir))
+        mmap_actions, opened_actions = best_of(args.repeat, lambda: ActionHistoryIndex.open(actions_dir))
+
+        assert store.top("state") == opened.top("state")
+        assert np.array_equal(store.monthly_districts, opened.monthly_districts)
+        assert actions.summary == opened_actions.summary
+        expected, _ = first_query(store)
+        query, (result, _) = best_of(1, lambda: first_query(GrievanceStore.open(store_dir)))
+        assert np.array_equal(expected, result, equal_nan=True)
+
+        print(f"Input: {counts[GRIEVANCE_FILE]:,} grievances, {counts[ACTION_HISTORY_FILE]:,} actions")
+        print(f"  grievances  json {json_store * 1000:8.1f} ms   mmap {mmap_store * 1000:7.1f} ms   "
+              f"({json_store / mmap_store:5.0f}x)")
+        print(f"  actions     json {json_actions * 1000:8.1f} ms   mmap {mmap_actions * 1000:7.1f} ms   "
+              f"({json_actions / mmap_actions:5.0f}x)")
+        print(f"  open + first query (mmap): {query * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Top-K Benchmark
+
+Compares the two modes of /api/charts/top/{dimension} on a store built from
+a synthetic dump converted with fix_json_streaming:
+
+- exact: count the values of the rows in the window (bincount) and
+  partially sort the counts (argpartition)
+- approximate: sum the window's per-month Count-Min sketches and estimate
+  the per-month candidates (app/services/heavy_hitters.py)
+
+The generator draws districts, pincodes and categories uniformly, which
+has no heavy hitters; they are redrawn here from a Zipf distribution, like
+real grievance volumes. Reports latency, recall of the exact top K and the
+largest overestimate of the approximate counts.
+
+Usage: python benchmarks/bench_top_k.py [--records N] [--k N] [--zipf S] [--repeat N]
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "scripts"))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "backend"))
+
+from fix_json_streaming import stream_json_file  # noqa: E402
+from generate_data import GRIEVANCE_FILE, generate  # noqa: E402
+
+from app.services.dates import month_label, to_month_index  # noqa: E402
+from app.services.grievance_store import load_store  # noqa: E402
+from app.services.heavy_hitters import (  # noqa: E402
+    HEAVY_HITTER_FIELDS,
+    build_heavy_hitters,
+    count_values,
+    error_bound,
+    top_k,
+)
+from app.services.query import GrievanceFilter  # noqa: E402
+
+# Distinct values to draw from, per field
+CARDINALITY = {"dist_name": None, "pincode": 20_000, "CategoryV7": 2_000}
+
+
+def median_ms(repeat, function):
+    """Median of ``repeat`` timed calls, in milliseconds, and the last result."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def zipf_values(rng, size, n_values, exponent, first_value):
+    """Values first_value.. with Zipf-distributed frequencies, in random rank order."""
+    weights = 1 / np.arange(1, n_values + 1) ** exponent
+    ranks = rng.choice(n_values, size=size, p=weights / weights.sum())
+    return rng.permutation(n_values)[ranks] + first_value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark exact and approximate top-K")
+    parser.add_argument("--records", type=int, default=1_000_000, help="Grievances to generate (default: 1000000)")
+    parser.add_argument("--k", type=int, default=20, help="Values per top-K (default: 20)")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent of value frequencies (default: 1.1)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (default: 5)")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        generate(args.records, tmp_dir)
+        dataset = os.path.join(tmp_dir, "fixed_grievance_v2.json")
+        stream_json_file(os.path.join(tmp_dir, GRIEVANCE_FILE), dataset)
+        store = load_store(dataset)
+
+    rng = np.random.default_rng(0)
+    firsts = {"dist_name": 0, "pincode": 110_000, "CategoryV7": 10_000}
+    for field in HEAVY_HITTER_FIELDS:
+        n_values = CARDINALITY[field] or len(store.labels[field])
+        store.columns[field] = zipf_values(rng, store.size, n_values, args.zipf, firsts[field])
+    start = time.perf_counter()
+    store.heavy_hitters = build_heavy_hitters(store.columns)
+    print(f"Input: {store.size:,} grievances, sketches built in {time.perf_counter() - start:.2f}s")
+
+    recvd = store.columns["recvd_date"]
+    last_month = int(to_month_index(recvd[-1:])[0])
+    windows = {"last month": last_month, "last 12 months": last_month - 11, "all": None}
+    print(f"\n{'field':<11} {'window':<15} {'exact ms':>9} {'approx ms':>10} {'recall':>7} {'overshoot':>10} {'bound':>7}")
+    for field in HEAVY_HITTER_FIELDS:
+        sketch = store.heavy_hitters[field]
+        for name, first_month in windows.items():
+            filters = GrievanceFilter(start=date.fromisoformat(f"{month_label(first_month)}-01") if first_month else None)
+
+            def exact():
+                # As the endpoint does it: the date range is a slice of the recvd_date order
+                values, counts = count_values(store.columns[field][filters.mask(store)])
+                return values, counts, top_k(counts, args.k)
+
+            exact_ms, (all_values, all_counts, order) = median_ms(args.repeat, exact)
+            values, true_counts = all_values[order], dict(zip(all_values.tolist(), all_counts.tolist()))
+            approx_ms, (approximate, estimates, total) = median_ms(
+                args.repeat, lambda: sketch.top(args.k, first_month, last_month)
+            )
+            recall = len(np.intersect1d(values, approximate)) / len(values)
+            overshoot = max(e - true_counts.get(v, 0) for v, e in zip(approximate.tolist(), estimates.tolist()))
+            print(f"{field:<11} {name:<15} {exact_ms:>9.2f} {approx_ms:>10.2f} {recall:>7.2f} "
+                  f"{overshoot:>10,} {error_bound(total):>7,}")
+
+
+if __name__ == "__main__":
+    main()
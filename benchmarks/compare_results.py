@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Compare Two Benchmark Result Files
+
+Prints the change of every conversion and API metric between a baseline and
+a new run_benchmarks.py result file, and exits with status 1 if any metric
+got worse by more than the threshold (default 10%).
+
+Usage: python benchmarks/compare_results.py BASELINE.json NEW.json [--threshold PCT]
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, Tuple
+
+# Metric name -> True if higher is better
+CONVERSION_METRICS = {"seconds": False, "records_per_second": True, "peak_rss_mb": False}
+API_METRICS = {"p50_ms": False, "p90_ms": False, "p99_ms": False, "requests_per_second": True}
+
+
+def flatten(results: Dict) -> Dict[Tuple[str, ...], Tuple[float, bool]]:
+    """Map (size, kind, name, metric) keys to (value, higher is better)."""
+    metrics = {}
+    for run in results["runs"]:
+        size = str(run["size"])
+        for row in run.get("conversion", []):
+            for metric, higher_is_better in CONVERSION_METRICS.items():
+                key = (size, "conversion", f"{row['converter']} {row['dump']}", metric)
+                metrics[key] = (row[metric], higher_is_better)
+        for row in run.get("api", {}).get("endpoints", []):
+            for metric, higher_is_better in API_METRICS.items():
+                metrics[(size, "api", row["endpoint"], metric)] = (row[metric], higher_is_better)
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline", help="Baseline results JSON")
+    parser.add_argument("new", help="New results JSON")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Percent change counted as a regression (default: 10)")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+
+    print(f"Baseline: {baseline['meta']['git_commit']} ({baseline['meta']['timestamp']})")
+    print(f"New:      {new['meta']['git_commit']} ({new['meta']['timestamp']})\n")
+
+    old_metrics, new_metrics = flatten(baseline), flatten(new)
+    regressions = 0
+    for key in sorted(old_metrics.keys() & new_metrics.keys()):
+        (old_value, higher_is_better), (new_value, _) = old_metrics[key], new_metrics[key]
+        change = (new_value - old_value) / old_value * 100 if old_value else 0.0
+        worse = -change if higher_is_better else change
+        flag = ""
+        if worse > args.threshold:
+            flag = "  ❌ regression"
+            regressions += 1
+        elif worse < -args.threshold:
+            flag = "  ✅ improvement"
+        size, kind, name, metric = key
+        print(f"{size:>8} {kind:<10} {name:<64} {metric:<18} {old_value:>12,.2f} -> {new_value:>12,.2f} "
+              f"({change:+6.1f}%){flag}")
+
+    print(f"\n{regressions} regression(s) beyond {args.threshold:g}%")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Synthetic CPGrams Dump Generator
+
+Writes MongoDB-style exports shaped like the real CPGrams dumps, for
+benchmarking the conversion scripts and the API without real data:
+
+- no_pii_grievance_v2.json:      one record per grievance, with $date and
+                                 $numberLong fields
+- no_pii_action_history_v2.json: 1-6 actions per grievance (received,
+                                 forwarded, ..., disposed), with $oid ids,
+                                 $numberLong serial numbers and $date fields
+
+Records are written one per line inside a single top-level array, like
+mongoexport --jsonArray. Output is deterministic for a given size and seed.
+
+Usage: python benchmarks/generate_data.py RECORDS [--output-dir DIR] [--seed N]
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+GRIEVANCE_FILE = "no_pii_grievance_v2.json"
+ACTION_HISTORY_FILE = "no_pii_action_history_v2.json"
+
+# Grievances are received over this window; nothing happens after the export date
+FIRST_RECEIVED = datetime(2023, 1, 1, tzinfo=timezone.utc)
+EXPORT_DATE = datetime(2025, 6, 30, tzinfo=timezone.utc)
+
+STATES = ["UP", "MH", "DL", "WB", "TS", "KA", "TN", "BR", "RJ", "GJ", "MP", "KL", "PB", "HR", "OR"]
+ORG_CODES = ["MORLY", "DOPPW", "MOHFW", "DEABD", "CBODT", "DOTEL", "MOLBR", "DOPOS", "MHA", "DHIGH"]
+ACTIONS = ["RECEIVED", "FORWARDED", "UNDER PROCESS", "FORWARDED TO SUBORDINATE", "DISPOSED"]
+
+
+def mongo_date(value: datetime) -> Dict[str, str]:
+    """Format a datetime like mongoexport: {"$date": "2023-01-01T00:00:19.977+0000"}"""
+    return {"$date": value.strftime("%Y-%m-%dT%H:%M:%S.") + f"{value.microsecond // 1000:03d}+0000"}
+
+
+def make_grievance(rng: random.Random, index: int) -> Tuple[Dict, List[datetime], List[str]]:
+    """Build one grievance record plus the dates and orgs of its actions."""
+    org_code = rng.choice(ORG_CODES)
+    registration_no = f"{org_code}/E/{2023 + index % 3}/{index:07d}"
+    span = (EXPORT_DATE - FIRST_RECEIVED).total_seconds()
+    recvd = FIRST_RECEIVED + timedelta(seconds=rng.random() * span * 0.98)
+
+    action_dates = [recvd]
+    for _ in range(rng.randint(0, 5)):
+        action_dates.append(action_dates[-1] + timedelta(days=rng.expovariate(1 / 7)))
+    # Actions after the export date have not happened yet; of the grievances
+    # with any follow-up action, most were closed by their last one
+    action_dates = [day for day in action_dates if day < EXPORT_DATE]
+    closed = len(action_dates) > 1 and rng.random() < 0.85
+    orgs = [org_code] + [rng.choice(ORG_CODES) for _ in action_dates[1:]]
+
+    record = {
+        "_id": registration_no,
+        "CategoryV7": {"$numberLong": str(rng.randint(10000, 12000))},
+        "DiaryDate": mongo_date(recvd),
+        "UserCode": str(rng.randint(100000, 130000)),
+        "closing_date": mongo_date(action_dates[-1]) if closed else None,
+        "dist_name": f"District {rng.randint(1, 700)}",
+        "org_code": org_code,
+        "pincode": str(rng.randint(110000, 855000)),
+        "recvd_date": mongo_date(recvd),
+        "registration_no": registration_no,
+        "sex": rng.choice("MFT"),
+        "state": rng.choice(STATES),
+    }
+    return record, action_dates, orgs
+
+
+def make_actions(rng: random.Random, registration_no: str, dates: List[datetime], orgs: List[str], closed: bool) -> List[Dict]:
+    """Build the action history records of one grievance."""
+    actions = []
+    for srno, (when, org_code) in enumerate(zip(dates, orgs), start=1):
+        if srno == 1:
+            name = "RECEIVED"
+        elif closed and srno == len(dates):
+            name = "DISPOSED"
+        else:
+            name = rng.choice(ACTIONS[1:4])
+        actions.append({
+            "_id": {"$oid": "%024x" % rng.getrandbits(96)},
+            "registration_no": registration_no,
+            "action_srno": {"$numberLong": str(srno)},
+            "action_date": mongo_date(when),
+            "action_name": name,
+            "from_org_code": orgs[srno - 2] if srno > 1 else None,
+            "to_org_code": org_code,
+        })
+    return actions
+
+
+def generate(records: int, output_dir: str, seed: int = 0) -> Dict[str, int]:
+    """Write a grievance dump of ``records`` records and its action history.
+
+    Returns the number of records written to each file.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    rng = random.Random(seed)
+    counts = {GRIEVANCE_FILE: 0, ACTION_HISTORY_FILE: 0}
+
+    with open(os.path.join(output_dir, GRIEVANCE_FILE), "w", encoding="utf-8") as grievances, \
+            open(os.path.join(output_dir, ACTION_HISTORY_FILE), "w", encoding="utf-8") as history:
+        grievances.write("[")
+        history.write("[")
+        for index in range(records):
+            record, dates, orgs = make_grievance(rng, index)
+            grievances.write((",\n" if index else "\n") + json.dumps(record))
+            counts[GRIEVANCE_FILE] += 1
+
+            closed = record["closing_date"] is not None
+            for action in make_actions(rng, record["registration_no"], dates, orgs, closed):
+                history.write((",\n" if counts[ACTION_HISTORY_FILE] else "\n") + json.dumps(action))
+                counts[ACTION_HISTORY_FILE] += 1
+        grievances.write("\n]\n")
+        history.write("\n]\n")
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic CPGrams grievance and action history dumps")
+    parser.add_argument("records", type=int, help="Number of grievances (e.g. 10000 to 5000000)")
+    parser.add_argument("--output-dir", default="benchmarks/.work/data", help="Directory to write the dumps to")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = generate(args.records, args.output_dir, args.seed)
+    elapsed = time.perf_counter() - start
+    for name, count in counts.items():
+        path = os.path.join(args.output_dir, name)
+        print(f"{path}: {count:,} records, {os.path.getsize(path) / (1024 * 1024):.1f} MB")
+    print(f"Generated in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
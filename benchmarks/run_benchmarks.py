@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+CPGrams Benchmark Suite
+
+For each requested dataset size this:
+
+1. generates synthetic grievance and action history dumps (generate_data.py)
+2. runs each conversion function on each dump in a fresh process, recording
+   wall time, throughput and peak memory (max RSS)
+3. serves the converted grievances with uvicorn and measures latency
+   percentiles of every /api/charts/* endpoint under concurrent load
+
+Results are written as JSON (one file per run, named after the time and git
+commit) so that runs can be compared with compare_results.py.
+
+Usage: python benchmarks/run_benchmarks.py [--sizes 10000 100000 ...] [--concurrency N]
+                                           [--requests N] [--skip-conversion] [--skip-api]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import secrets
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List
+
+import httpx
+
+from generate_data import ACTION_HISTORY_FILE, GRIEVANCE_FILE, generate
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARKS_DIR)
+SCRIPTS_DIR = os.path.join(REPO_ROOT, "scripts")
+BACKEND_DIR = os.path.join(REPO_ROOT, "backend")
+
+# Conversion functions to benchmark: name -> (module, function)
+CONVERTERS = {
+    "fix_json_file": ("fix_json_files", "fix_json_file"),
+    "convert_validate_file": ("fix_json_files", "convert_validate_file"),
+    "process_json_chunks": ("fix_json_streaming", "process_json_chunks"),
+    "stream_json_file": ("fix_json_streaming", "stream_json_file"),
+}
+
+# Chart endpoints hit by the load test
+ENDPOINTS = [
+    "/api/charts/sales",
+    "/api/charts/performance",
+    "/api/charts/analytics",
+    "/api/charts/kpi-cards",
+    "/api/charts/time-series",
+    "/api/charts/time-series?granularity=week&state=UP",
+    "/api/charts/time-series?max_points=200",
+    "/api/charts/donut-data",
+    "/api/charts/revenue-by-month",
+    "/api/charts/grievances/monthly",
+    "/api/charts/grievances/monthly?org_code=MORLY&start=2024-01-01",
+    "/api/charts/grievances/by-state",
+    "/api/charts/grievances/by-ministry",
+    "/api/charts/grievances/by-district",
+    "/api/charts/grievances/by-category",
+    "/api/charts/resolution-time",
+    "/api/charts/resolution-time/by-ministry",
+    "/api/charts/resolution-time/by-state?org_code=MORLY",
+    "/api/charts/resolution-time/by-month",
+    "/api/charts/top/district?start=2024-06-01&end=2024-06-30",
+    "/api/charts/top/pincode?mode=approximate",
+    "/api/charts/top/category/growing?start=2024-06-01&end=2024-06-30",
+    "/api/charts/actions/summary",
+]
+
+# Requests the dashboard page fires in parallel on load
+DASHBOARD = [
+    "/api/charts/kpi-cards",
+    "/api/charts/analytics",
+    "/api/charts/time-series",
+    "/api/charts/donut-data",
+    "/api/charts/revenue-by-month",
+]
+
+
+def run_converter(work_dir: str, name: str, input_file: str, output_file: str) -> Dict[str, float]:
+    """Run one converter (in a fresh worker process) and measure it."""
+    # fix_json_files logs to data/fix_json.log relative to the working directory
+    os.chdir(work_dir)
+    sys.path.insert(0, SCRIPTS_DIR)
+    module_name, function_name = CONVERTERS[name]
+    function = getattr(__import__(module_name), function_name)
+    logging.disable(logging.INFO)
+
+    baseline_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    start = time.perf_counter()
+    result = function(input_file, output_file)
+    seconds = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    # Converters return True/False, or a stats dict with a "valid" flag
+    ok = result.get("valid", False) if isinstance(result, dict) else result
+    return {"ok": bool(ok), "seconds": seconds, "peak_rss_mb": peak_mb, "baseline_rss_mb": baseline_mb}
+
+
+def measure_converter(work_dir: str, name: str, input_file: str, output_file: str) -> Dict[str, float]:
+    """Run one converter in a new process, so max RSS belongs to this run alone."""
+    spawn = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+        return pool.submit(run_converter, work_dir, name, input_file, output_file).result()
+
+
+def benchmark_conversion(work_dir: str, counts: Dict[str, int]) -> List[Dict[str, Any]]:
+    """Benchmark every converter on every generated dump."""
+    results = []
+    for dump, records in counts.items():
+        input_file = os.path.join(work_dir, "data", dump)
+        size_mb = os.path.getsize(input_file) / (1024 * 1024)
+        for name in CONVERTERS:
+            output_file = os.path.join(work_dir, "data", f"{name}_{dump}")
+            measured = measure_converter(work_dir, name, input_file, output_file)
+            result = {
+                "converter": name,
+                "dump": dump,
+                "records": records,
+                "input_mb": round(size_mb, 2),
+                **{key: round(value, 3) if isinstance(value, float) else value for key, value in measured.items()},
+                "records_per_second": round(records / measured["seconds"]),
+                "mb_per_second": round(size_mb / measured["seconds"], 2),
+            }
+            results.append(result)
+            print(f"  {name:<22} {dump:<32} {result['seconds']:8.2f}s "
+                  f"{result['records_per_second']:>10,} rec/s  peak {result['peak_rss_mb']:8.1f} MB"
+                  f"{'' if result['ok'] else '  FAILED'}")
+            if name != "fix_json_file":
+                os.remove(output_file)
+    return results
+
+
+def free_port() -> int:
+    """Ask the OS for an unused local port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+async def load_endpoint(client: httpx.AsyncClient, path: str, requests: int, concurrency: int) -> Dict[str, Any]:
+    """Send ``requests`` GETs to one endpoint from ``concurrency`` concurrent workers."""
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            response = await client.get(path)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "endpoint": path,
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(statistics.mean(latencies), 3),
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p90_ms": round(percentile(latencies, 0.90), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "max_ms": round(latencies[-1], 3),
+    }
+
+
+def benchmark_api(dataset: str, actions: str, requests: int, concurrency: int, cache: bool) -> Dict[str, Any]:
+    """Serve converted grievance and action history datasets with uvicorn and load every chart endpoint."""
+    port = free_port()
+    admin_token = secrets.token_urlsafe(16)
+    env = dict(os.environ, GRIEVANCE_DATA_PATH=dataset, ACTION_HISTORY_DATA_PATH=actions, ADMIN_TOKEN=admin_token)
+    if not cache:
+        # Measure the handlers themselves, not response cache hits
+        env["RESPONSE_CACHE_SIZE"] = "0"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        start = time.perf_counter()
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError("API server exited during startup")
+            try:
+                if httpx.get(f"{base_url}/api/health").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            time.sleep(0.1)
+        startup_seconds = time.perf_counter() - start
+
+        async def first_dashboard_load(client: httpx.AsyncClient) -> Dict[str, Any]:
+            """Wait for the background precompute, then time one parallel dashboard load."""
+            if cache:
+                admin = {"Authorization": f"Bearer {admin_token}"}
+                while not (await client.get("/api/admin/precompute", headers=admin)).json()["runs"]:
+                    await asyncio.sleep(0.05)
+            load_start = time.perf_counter()
+            responses = await asyncio.gather(*[client.get(path) for path in DASHBOARD])
+            return {
+                "ms": round((time.perf_counter() - load_start) * 1000, 3),
+                "cache_hits": sum(response.headers.get("x-cache") == "HIT" for response in responses),
+            }
+
+        async def run_all():
+            limits = httpx.Limits(max_connections=concurrency)
+            async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+                dashboard = await first_dashboard_load(client)
+                print(f"  first dashboard load: {dashboard['ms']:.2f} ms "
+                      f"({dashboard['cache_hits']}/{len(DASHBOARD)} precomputed)")
+                results = []
+                for path in ENDPOINTS:
+                    await client.get(path)  # warm up
+                    result = await load_endpoint(client, path, requests, concurrency)
+                    print(f"  {path:<64} p50 {result['p50_ms']:8.2f} ms  p90 {result['p90_ms']:8.2f} ms  "
+                          f"p99 {result['p99_ms']:8.2f} ms  {result['requests_per_second']:8.1f} req/s")
+                    results.append(result)
+                return dashboard, results
+
+        dashboard, endpoints = asyncio.run(run_all())
+    finally:
+        server.terminate()
+        server.wait()
+
+    return {
+        "concurrency": concurrency,
+        "requests_per_endpoint": requests,
+        "response_cache": cache,
+        "startup_seconds": round(startup_seconds, 3),
+        "first_dashboard_load": dashboard,
+        "endpoints": endpoints,
+    }
+
+
+def git_commit() -> str:
+    """Current commit hash (with a -dirty suffix for uncommitted changes), if available."""
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, text=True).strip()
+        dirty = subprocess.run(["git", "diff", "--quiet", "HEAD"], cwd=REPO_ROOT).returncode != 0
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the conversion scripts and the chart API")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000],
+                        help="Grievance counts to generate (default: 10000 100000; up to 5000000)")
+    parser.add_argument("--work-dir", default=os.path.join(BENCHMARKS_DIR, ".work"),
+                        help="Directory for generated and converted dumps")
+    parser.add_argument("--output", default=None,
+                        help="Results file (default: benchmarks/results/<time>_<commit>.json)")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint (default: 200)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent API clients (default: 8)")
+    parser.add_argument("--cache", action="store_true", help="Keep the API response cache enabled")
+    parser.add_argument("--skip-conversion", action="store_true", help="Only run the API benchmark")
+    parser.add_argument("--skip-api", action="store_true", help="Only run the conversion benchmark")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    commit = git_commit()
+    results: Dict[str, Any] = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": commit,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "runs": [],
+    }
+
+    for size in args.sizes:
+        work_dir = os.path.join(args.work_dir, str(size))
+        data_dir = os.path.join(work_dir, "data")
+        print(f"\n📦 {size:,} grievances")
+
+        start = time.perf_counter()
+        counts = generate(size, data_dir)
+        print(f"  generated {counts[GRIEVANCE_FILE]:,} grievances and "
+              f"{counts[ACTION_HISTORY_FILE]:,} actions in {time.perf_counter() - start:.1f}s")
+
+        run: Dict[str, Any] = {"size": size, "records": counts}
+        if not args.skip_conversion:
+            print("⏱️  Conversion")
+            run["conversion"] = benchmark_conversion(work_dir, counts)
+        if not args.skip_api:
+            converted = {}
+            for dump in (GRIEVANCE_FILE, ACTION_HISTORY_FILE):
+                converted[dump] = os.path.join(data_dir, f"fix_json_file_{dump}")
+                if not os.path.exists(converted[dump]):
+                    measure_converter(work_dir, "fix_json_file", os.path.join(data_dir, dump), converted[dump])
+            print(f"🌐 API ({args.concurrency} concurrent clients, {args.requests} requests per endpoint)")
+            run["api"] = benchmark_api(
+                converted[GRIEVANCE_FILE], converted[ACTION_HISTORY_FILE], args.requests, args.concurrency, args.cache
+            )
+        results["runs"].append(run)
+
+    output = args.output or os.path.join(
+        BENCHMARKS_DIR, "results", f"{datetime.now().strftime('%Y%m%d-%H%M%S')}_{commit}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n📄 Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
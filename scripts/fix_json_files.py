@@ -5,14 +5,18 @@ JSON File Fixer for CPGrams Data
 This script fixes MongoDB-style JSON files by converting MongoDB-specific 
 objects like $date, $numberLong, etc. to standard JSON format.
 
-Usage: python scripts/fix_json_files.py
+Usage: python scripts/fix_json_files.py [--single-pass]
+       python scripts/fix_json_files.py --incremental DELTA_FILE [--dataset FIXED_FILE]
 """
 
+import argparse
+import hashlib
 import json
 import os
 import re
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 import shutil
 import logging
 
@@ -33,10 +37,9 @@ def convert_mongodb_date(date_obj: Dict[str, str]) -> str:
         date_str = date_obj["$date"]
         try:
             # Parse the MongoDB date format
+            # Same rule as fix_json_streaming: only the UTC offset becomes "Z"
             if date_str.endswith("+0000"):
-                date_str = date_str[:-6] + "Z"
-            elif "+" in date_str and date_str.count("+") == 1:
-                date_str = date_str.replace("+0000", "Z")
+                date_str = date_str[:-5] + "Z"
             
             # Return ISO format
             return date_str
@@ -113,6 +116,10 @@ def fix_json_file(input_file: str, output_file: str) -> bool:
             json.load(f)
         
         logger.info(f"✅ Verified {output_file} is valid JSON")
+        
+        # A full rebuild invalidates the incremental ingest index
+        if os.path.exists(get_index_path(output_file)):
+            os.remove(get_index_path(output_file))
         return True
         
     except Exception as e:
@@ -153,8 +160,351 @@ def validate_json_structure(file_path: str) -> Dict[str, Any]:
     except Exception as e:
         return {"valid": False, "error": str(e)}
 
+# Converted records are written (and hashed) in batches of this many
+WRITE_BATCH_SIZE = 1000
+
+def summarize_shapes(shapes: Dict[Tuple, int]) -> Dict[str, Any]:
+    """
+    Turn record shape counts into structure statistics.
+    
+    A shape is (keys, value types, first key of each dict value); MongoDB
+    wrappers are reported by their $ key, e.g. "$date".
+    """
+    key_sets: Dict[Tuple[str, ...], int] = {}
+    types: Dict[str, Dict[str, int]] = {}
+    for (keys, value_types, dict_keys), count in shapes.items():
+        key_sets[keys] = key_sets.get(keys, 0) + count
+        wrappers = iter(dict_keys)
+        for key, value_type in zip(keys, value_types):
+            name = value_type.__name__
+            if value_type is dict:
+                first_key = next(wrappers)
+                if first_key in ("$date", "$numberLong", "$oid"):
+                    name = first_key
+            histogram = types.setdefault(key, {})
+            histogram[name] = histogram.get(name, 0) + count
+    return {
+        "keys": sorted({key for keys in key_sets for key in keys}),
+        "key_sets": len(key_sets),
+        "types": types
+    }
+
+def convert_validate_file(input_file: str, output_file: str) -> Dict[str, Any]:
+    """
+    Convert, validate and checksum a JSON array file in one streaming pass.
+    
+    Replaces the validate -> backup -> fix -> re-parse -> validate sequence:
+    the input is parsed once, record by record, while structure statistics
+    are collected; converted records are written to a temporary file next to
+    the output and hashed as they are written. The temporary file is renamed
+    over the output only once the whole input parsed, so a failed run never
+    leaves a partial output behind and the input is never modified (no
+    backup is needed). The SHA-256 of the output is also written to
+    ``<output>.sha256``.
+    
+    Args:
+        input_file: Path to input JSON file
+        output_file: Path to output fixed JSON file
+        
+    Returns:
+        Dict with "valid", and on success the record "count", "keys" (sorted
+        union of all record keys), "key_sets" (number of distinct key sets),
+        "types" (per-field histogram of raw value types), "sha256" and sizes;
+        on failure an "error" message
+    """
+    from fix_json_streaming import iter_json_array
+    
+    tmp_path = f"{output_file}.tmp"
+    count = 0
+    shapes: Dict[Tuple, int] = {}
+    dict_positions: Dict[Tuple[type, ...], List[int]] = {}
+    digest = hashlib.sha256()
+    
+    try:
+        with open(input_file, 'r', encoding='utf-8') as infile, open(tmp_path, 'wb') as outfile:
+            def write(text: str) -> None:
+                data = text.encode('utf-8')
+                digest.update(data)
+                outfile.write(data)
+            
+            write("[")
+            separator = "\n"
+            batch = []
+            for record in iter_json_array(infile):
+                if isinstance(record, dict):
+                    value_types = tuple(map(type, record.values()))
+                    positions = dict_positions.get(value_types)
+                    if positions is None:
+                        positions = dict_positions[value_types] = [
+                            i for i, value_type in enumerate(value_types) if value_type is dict
+                        ]
+                    dict_keys = ()
+                    if positions:
+                        values = list(record.values())
+                        dict_keys = tuple(next(iter(values[i]), None) for i in positions)
+                    shape = (tuple(record), value_types, dict_keys)
+                    shapes[shape] = shapes.get(shape, 0) + 1
+                batch.append(json.dumps(clean_value(record), ensure_ascii=False))
+                count += 1
+                if len(batch) == WRITE_BATCH_SIZE:
+                    write(separator + ",\n".join(batch))
+                    separator = ",\n"
+                    batch = []
+            if batch:
+                write(separator + ",\n".join(batch))
+            write("\n]\n")
+        
+        os.replace(tmp_path, output_file)
+    except Exception as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return {"valid": False, "error": str(e)}
+    
+    checksum = digest.hexdigest()
+    with open(f"{output_file}.sha256", 'w', encoding='utf-8') as f:
+        f.write(f"{checksum}  {os.path.basename(output_file)}\n")
+    
+    # A full rebuild invalidates the incremental ingest index
+    if os.path.exists(get_index_path(output_file)):
+        os.remove(get_index_path(output_file))
+    
+    return {
+        "valid": True,
+        "type": "list",
+        "count": count,
+        **summarize_shapes(shapes),
+        "sha256": checksum,
+        "input_mb": get_file_size_mb(input_file),
+        "output_mb": get_file_size_mb(output_file)
+    }
+
+def record_key(record: Dict[str, Any]) -> Optional[str]:
+    """Identify a converted record by registration_no, falling back to _id."""
+    key = record.get("registration_no") or record.get("_id")
+    return str(key) if key else None
+
+def record_hash(record: Dict[str, Any]) -> str:
+    """Content hash of a converted record, independent of key order."""
+    canonical = json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+def get_index_path(dataset_file: str) -> str:
+    """Path of the key -> content hash index kept next to a fixed dataset."""
+    return f"{dataset_file}.index.json"
+
+def load_record_index(dataset_file: str) -> Dict[str, str]:
+    """
+    Load the key -> content hash index of a fixed dataset.
+    
+    The index is built by streaming the dataset once if it does not exist yet.
+    """
+    from fix_json_streaming import iter_json_array
+    
+    index_path = get_index_path(dataset_file)
+    if os.path.exists(index_path):
+        with open(index_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    logger.info(f"Building record index for {dataset_file}...")
+    index = {}
+    if os.path.exists(dataset_file):
+        with open(dataset_file, 'r', encoding='utf-8') as f:
+            for record in iter_json_array(f):
+                key = record_key(record)
+                if key:
+                    index[key] = record_hash(record)
+    return index
+
+def save_record_index(dataset_file: str, index: Dict[str, str]) -> None:
+    """Atomically write the key -> content hash index of a fixed dataset."""
+    index_path = get_index_path(dataset_file)
+    tmp_path = f"{index_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(",", ":"))
+    os.replace(tmp_path, index_path)
+
+def append_records(dataset_file: str, records: List[Dict[str, Any]]) -> None:
+    """
+    Append converted records to a fixed JSON array file in place.
+    
+    Only the closing bracket is rewritten, so the cost depends on the number of
+    appended records rather than the size of the dataset. On failure the file
+    is truncated back to its original contents.
+    """
+    if not os.path.exists(dataset_file):
+        with open(dataset_file, 'w', encoding='utf-8') as f:
+            f.write("[]\n")
+    
+    with open(dataset_file, 'r+b') as f:
+        original_size = f.seek(0, os.SEEK_END)
+        # Find the closing bracket and whatever precedes it
+        position = original_size
+        tail = b""
+        while position > 0 and not tail.strip():
+            step = min(4096, position)
+            position -= step
+            f.seek(position)
+            tail = f.read(step) + tail
+        stripped = tail.rstrip()
+        if not stripped.endswith(b"]"):
+            raise ValueError(f"{dataset_file} does not end with a JSON array")
+        close_at = position + len(stripped) - 1
+        before_close = stripped[:-1].rstrip()
+        is_empty = before_close.endswith(b"[") if before_close else True
+        
+        try:
+            f.seek(close_at)
+            f.truncate()
+            for i, record in enumerate(records):
+                separator = "\n" if (is_empty and i == 0) else ",\n"
+                f.write((separator + json.dumps(record, ensure_ascii=False)).encode('utf-8'))
+            f.write(b"\n]\n")
+        except Exception:
+            f.truncate(original_size)
+            raise
+
+def rewrite_records(dataset_file: str, replacements: Dict[str, Dict[str, Any]], index: Dict[str, str]) -> None:
+    """
+    Rewrite a fixed JSON array file with changed records replaced where they are.
+    
+    The dataset is streamed into a temporary file that then replaces it, so
+    readers see either the old or the new file. Each key is written once:
+    records in replacements take the place of their first copy, and copies
+    left over from earlier appends are dropped in favour of the one matching
+    the index. Replacements not found in the file are appended at the end.
+    
+    Args:
+        dataset_file: Fixed dataset to rewrite
+        replacements: Converted records to write, by key
+        index: Key -> content hash of the latest copy of every record
+    """
+    from fix_json_streaming import iter_json_array
+    
+    replacements = dict(replacements)
+    written = set()
+    tmp_path = f"{dataset_file}.tmp"
+    try:
+        with open(dataset_file, 'r', encoding='utf-8') as infile, \
+                open(tmp_path, 'w', encoding='utf-8') as outfile:
+            outfile.write("[")
+            separator = "\n"
+            
+            def write(record: Dict[str, Any]) -> None:
+                nonlocal separator
+                outfile.write(separator + json.dumps(record, ensure_ascii=False))
+                separator = ",\n"
+            
+            for record in iter_json_array(infile):
+                key = record_key(record)
+                if key is None:
+                    write(record)
+                elif key in written:
+                    continue
+                elif key in replacements:
+                    write(replacements.pop(key))
+                    written.add(key)
+                elif record_hash(record) == index.get(key):
+                    write(record)
+                    written.add(key)
+            for record in replacements.values():
+                write(record)
+            outfile.write("\n]\n")
+        os.replace(tmp_path, dataset_file)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def ingest_incremental(delta_file: str, dataset_file: str, delta_output: Optional[str] = None) -> Dict[str, int]:
+    """
+    Ingest a new export into an existing fixed dataset without a full rebuild.
+    
+    Records are identified by registration_no (or _id) and each key is kept
+    once. When the export only adds records they are appended in place;
+    when a record changed, the dataset is rewritten with the new copy in
+    place of the old one (see rewrite_records).
+    
+    Args:
+        delta_file: New MongoDB-style export (JSON array)
+        dataset_file: Existing fixed dataset to update
+        delta_output: Optional path to also write the new/changed records to,
+            e.g. for POSTing to the backend's /api/admin/ingest
+        
+    Returns:
+        Dict with counts of new, changed and unchanged records
+    """
+    from fix_json_streaming import iter_json_array
+    
+    index = load_record_index(dataset_file)
+    pending: Dict[str, Dict[str, Any]] = {}
+    stats = {"new": 0, "changed": 0, "unchanged": 0}
+    
+    with open(delta_file, 'r', encoding='utf-8') as f:
+        for raw_record in iter_json_array(f):
+            record = clean_value(raw_record)
+            key = record_key(record)
+            if key is None:
+                logger.warning("Skipping record without registration_no/_id")
+                continue
+            digest = record_hash(record)
+            previous = index.get(key)
+            if previous == digest:
+                stats["unchanged"] += 1
+                continue
+            if key not in pending:
+                stats["changed" if previous else "new"] += 1
+            pending[key] = record
+            index[key] = digest
+    
+    records = list(pending.values())
+    if stats["changed"] and os.path.exists(dataset_file):
+        rewrite_records(dataset_file, pending, index)
+        save_record_index(dataset_file, index)
+    elif records:
+        append_records(dataset_file, records)
+        save_record_index(dataset_file, index)
+    
+    if delta_output:
+        with open(delta_output, 'w', encoding='utf-8') as f:
+            json.dump(records, f, ensure_ascii=False)
+    
+    logger.info(
+        f"✅ Ingested {delta_file} -> {dataset_file}: "
+        f"{stats['new']} new, {stats['changed']} changed, {stats['unchanged']} unchanged"
+    )
+    return stats
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Fix MongoDB-style JSON files from the CPGrams dataset")
+    parser.add_argument(
+        "--incremental",
+        metavar="DELTA_FILE",
+        help="Add only new or changed records from a daily export to an existing fixed dataset"
+    )
+    parser.add_argument(
+        "--dataset",
+        default="data/fixed_grievance_v2.json",
+        help="Fixed dataset to update in incremental mode (default: data/fixed_grievance_v2.json)"
+    )
+    parser.add_argument(
+        "--delta-output",
+        help="Also write the new/changed records to this file in incremental mode"
+    )
+    parser.add_argument(
+        "--single-pass",
+        action="store_true",
+        help="Convert, validate and checksum each file in one streaming pass with an atomic write"
+    )
+    return parser.parse_args()
+
 def main():
     """Main function to process JSON files."""
+    args = parse_args()
+    if args.incremental:
+        logger.info("🔧 Starting incremental ingest...")
+        ingest_incremental(args.incremental, args.dataset, args.delta_output)
+        return
+    
     logger.info("🔧 Starting JSON file fixing process...")
     
     # Define file mappings
@@ -198,6 +548,25 @@ def main():
         logger.info(f"   Input: {input_file} ({size_mb:.1f} MB)")
         logger.info(f"   Output: {output_file}")
         
+        if args.single_pass:
+            start = time.perf_counter()
+            info = convert_validate_file(input_file, output_file)
+            if not info["valid"]:
+                logger.error(f"❌ Failed to fix {input_file}: {info['error']}")
+                results.append({"file": description, "status": "❌ Failed processing", "output": None})
+                continue
+            wrapped = [
+                f"{field} ({'/'.join(sorted(name for name in histogram if name.startswith('$')))})"
+                for field, histogram in info["types"].items()
+                if any(name.startswith("$") for name in histogram)
+            ]
+            logger.info(f"   Records: {info['count']} with {len(info['keys'])} keys in {info['key_sets']} key set(s)")
+            if wrapped:
+                logger.info(f"   Extended JSON fields: {', '.join(wrapped)}")
+            logger.info(f"   Fixed: {info['output_mb']:.1f} MB in {time.perf_counter() - start:.1f}s, sha256 {info['sha256']}")
+            results.append({"file": description, "status": "✅ Success", "output": output_file})
+            continue
+        
         # Validate original structure
         original_info = validate_json_structure(input_file)
         if not original_info["valid"]:
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Parallel JSON File Fixer for CPGrams Data
+
+This script converts the MongoDB-style grievance and action history dumps on
+all CPU cores. Each dump is split into byte-range shards at record boundaries,
+the shards are converted in a process pool with mongodb_object_hook, and
+the converted shards are stitched back together in their original order. All
+input files are queued on the same pool, so they are processed concurrently.
+
+Usage: python scripts/fix_json_parallel.py [--workers N] [--shard-size MB] [FILES...]
+"""
+
+import argparse
+import io
+import json
+import os
+import re
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Iterator, List, Tuple
+import logging
+
+from fix_json_streaming import (
+    get_peak_rss_mb,
+    iter_json_array,
+    mongodb_object_hook,
+    stream_json_file,
+)
+
+logger = logging.getLogger(__name__)
+
+# Default target size of a single shard
+DEFAULT_SHARD_SIZE_MB = 16
+
+# Bytes scanned at a time when looking for record boundaries
+BOUNDARY_WINDOW = 64 * 1024
+
+# String literals (closed, or cut off by the end of a window) and the bytes
+# that change the nesting depth or separate elements
+TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*(?:(")|\Z)|[\[\]{},]', re.DOTALL)
+# Escape sequences, and string literals once escapes are removed
+ESCAPE = re.compile(rb"\\.", re.DOTALL)
+STRING = re.compile(rb'"[^"]*(?:"|\Z)')
+
+FILES_TO_FIX = [
+    ("data/no_pii_grievance_v2.json", "data/fixed_grievance_v2.json"),
+    ("data/no_pii_action_history_v2.json", "data/fixed_action_history_v2.json"),
+    ("data/no_pii_grievance.json", "data/fixed_grievance.json"),
+    ("data/no_pii_action_history.json", "data/fixed_action_history.json"),
+]
+
+def find_array_start(infile: io.BufferedReader) -> int:
+    """Return the byte offset of the first element of the top-level array, or -1 if empty."""
+    infile.seek(0)
+    head = infile.read(BOUNDARY_WINDOW)
+    match = re.match(rb"\s*\[\s*", head)
+    if not match:
+        raise ValueError("Expected a top-level JSON array")
+    if head[match.end():match.end() + 1] in (b"]", b""):
+        return -1
+    return match.end()
+
+def iter_record_boundaries(infile: io.BufferedReader, start: int, shard_size: int) -> Iterator[int]:
+    """
+    Yield shard boundaries: the offset just past the first top-level comma
+    at least shard_size bytes after the previous boundary.
+    
+    String literals and the nesting depth are tracked from the start of the
+    array, so a "}, {" inside a string or a nested array of objects is never
+    taken for a boundary. Windows holding no boundary are only counted
+    (escapes and strings removed, brackets counted); the window where a
+    boundary is due is scanned token by token.
+    
+    Args:
+        infile: Binary file object
+        start: Byte offset of the first element of the top-level array
+        shard_size: Target size of each shard in bytes
+    """
+    infile.seek(start)
+    position = start
+    target = start + shard_size
+    depth = 1  # inside the top-level array
+    in_string = False
+    while True:
+        window = infile.read(BOUNDARY_WINDOW)
+        if not window:
+            return
+        # Never end a window inside an escape sequence
+        while window.endswith(b"\\"):
+            more = infile.read(1)
+            if not more:
+                break
+            window += more
+        
+        if position + len(window) > target and not in_string:
+            for token in TOKEN.finditer(window):
+                char = token.group()[:1]
+                in_string = False
+                if char == b'"':
+                    in_string = token.group(1) is None
+                elif char == b",":
+                    if depth == 1 and position + token.start() >= target:
+                        yield position + token.end()
+                        target = position + token.end() + shard_size
+                elif char in (b"{", b"["):
+                    depth += 1
+                else:
+                    depth -= 1
+        else:
+            unescaped = ESCAPE.sub(b"", window)
+            if in_string:
+                unescaped = b'"' + unescaped
+            structure = STRING.sub(b"", unescaped)
+            depth += (structure.count(b"{") + structure.count(b"[")
+                      - structure.count(b"}") - structure.count(b"]"))
+            in_string = unescaped.count(b'"') % 2 == 1
+        position += len(window)
+
+def plan_shards(input_file: str, shard_size: int) -> List[Tuple[int, int]]:
+    """
+    Split a JSON array file into byte ranges that each start at a record.
+    
+    Args:
+        input_file: Path to input JSON file
+        shard_size: Target size of each shard in bytes
+        
+    Returns:
+        List of (start, end) byte ranges covering every record in order
+    """
+    file_size = os.path.getsize(input_file)
+    with open(input_file, 'rb') as infile:
+        start = find_array_start(infile)
+        if start < 0:
+            return []
+        boundaries = [start, *iter_record_boundaries(infile, start, shard_size)]
+    
+    boundaries.append(file_size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+def convert_shard(input_file: str, start: int, end: int, part_file: str) -> int:
+    """
+    Convert the records in one byte range and write them to a part file.
+
+    Runs inside a worker process. The part file holds the converted records
+    one per line, separated by commas, without the enclosing brackets.
+
+    Returns:
+        int: Number of records converted
+    """
+    with open(input_file, 'rb') as infile:
+        infile.seek(start)
+        text = infile.read(end - start).decode('utf-8')
+
+    # Non-final shards end with the separator before the next record and the
+    # final shard ends with the closing bracket of the array
+    text = text.rstrip()
+    if text.endswith(","):
+        text = text[:-1] + "]"
+    elif not text.endswith("]"):
+        raise ValueError(f"Shard {start}-{end} does not end at a record boundary")
+
+    count = 0
+    with open(part_file, 'w', encoding='utf-8') as outfile:
+        for record in iter_json_array(io.StringIO("[" + text), object_hook=mongodb_object_hook):
+            if count:
+                outfile.write(",\n")
+            outfile.write(json.dumps(record, ensure_ascii=False))
+            count += 1
+    return count
+
+def stitch_parts(part_files: List[str], output_file: str) -> None:
+    """Concatenate converted part files into a single JSON array, in order."""
+    wrote_any = False
+    with open(output_file, 'w', encoding='utf-8') as outfile:
+        outfile.write("[")
+        for part_file in part_files:
+            with open(part_file, 'r', encoding='utf-8') as infile:
+                first = infile.read(1)
+                if first:
+                    outfile.write(",\n" if wrote_any else "\n")
+                    outfile.write(first)
+                    while True:
+                        block = infile.read(1024 * 1024)
+                        if not block:
+                            break
+                        outfile.write(block)
+                    wrote_any = True
+            os.remove(part_file)
+        outfile.write("\n]\n")
+
+def submit_file(pool: ProcessPoolExecutor, input_file: str, output_file: str, shard_size: int) -> List[Tuple[str, Future]]:
+    """Queue every shard of one file on the pool."""
+    jobs = []
+    for index, (start, end) in enumerate(plan_shards(input_file, shard_size)):
+        part_file = f"{output_file}.part{index:05d}"
+        jobs.append((part_file, pool.submit(convert_shard, input_file, start, end, part_file)))
+    return jobs
+
+def process_files_parallel(files: List[Tuple[str, str]], workers: int, shard_size: int) -> Dict[str, int]:
+    """
+    Convert several JSON array files concurrently on a shared process pool.
+
+    If any shard of a file fails (for example because the input is not valid
+    JSON), that file falls back to the sequential streaming converter.
+
+    Args:
+        files: (input_file, output_file) pairs
+        workers: Number of worker processes
+        shard_size: Target shard size in bytes
+
+    Returns:
+        Dict mapping each input file to its record count (-1 on failure)
+    """
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        submitted = []
+        for input_file, output_file in files:
+            jobs = submit_file(pool, input_file, output_file, shard_size)
+            logger.info(f"📄 {input_file}: {len(jobs)} shards queued")
+            submitted.append((input_file, output_file, jobs))
+
+        for input_file, output_file, jobs in submitted:
+            try:
+                count = sum(future.result() for _, future in jobs)
+                stitch_parts([part_file for part_file, _ in jobs], output_file)
+                results[input_file] = count
+                logger.info(f"✅ {input_file} -> {output_file} ({count} records)")
+            except Exception as e:
+                logger.warning(f"⚠️  Parallel conversion of {input_file} failed ({e}); falling back to streaming")
+                for part_file, _ in jobs:
+                    if os.path.exists(part_file):
+                        os.remove(part_file)
+                results[input_file] = -1
+                if stream_json_file(input_file, output_file):
+                    with open(output_file, 'r', encoding='utf-8') as f:
+                        results[input_file] = sum(1 for _ in iter_json_array(f))
+    return results
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Convert CPGrams dumps in parallel")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes (default: all cores)"
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=DEFAULT_SHARD_SIZE_MB,
+        help=f"Target shard size in MB (default: {DEFAULT_SHARD_SIZE_MB})"
+    )
+    parser.add_argument(
+        "files",
+        nargs="*",
+        help="Input files; outputs are written next to them as *_fixed.json (default: the CPGrams dumps in data/)"
+    )
+    return parser.parse_args()
+
+def main():
+    """Main function to process JSON files in parallel."""
+    args = parse_args()
+    logger.info(f"🔧 Starting parallel JSON file fixing with {args.workers} workers...")
+
+    if args.files:
+        files = [(path, path.replace('.json', '_fixed.json')) for path in args.files]
+    else:
+        files = FILES_TO_FIX
+
+    existing = []
+    for input_file, output_file in files:
+        if os.path.exists(input_file):
+            existing.append((input_file, output_file))
+        else:
+            logger.warning(f"⚠️  File not found: {input_file}")
+
+    start = time.perf_counter()
+    results = process_files_parallel(existing, args.workers, args.shard_size * 1024 * 1024)
+    elapsed = time.perf_counter() - start
+
+    total = sum(count for count in results.values() if count > 0)
+    successful = len([count for count in results.values() if count >= 0])
+    logger.info(f"\n🎯 Completed: {successful}/{len(results)} files, {total} records in {elapsed:.1f}s")
+    if elapsed > 0:
+        logger.info(f"   Throughput: {total / elapsed:,.0f} records/sec")
+    logger.info(f"   Peak RSS (coordinator): {get_peak_rss_mb():.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -6,14 +6,28 @@ This script fixes large MongoDB-style JSON files by processing them in chunks
 to avoid memory issues with very large files (300MB+).
 
 Usage: python scripts/fix_json_streaming.py
+       python scripts/fix_json_streaming.py --stream [--buffer-size BYTES] [--converter hook|schema|recursive] [FILES...]
+       python scripts/fix_json_streaming.py --stream --format parquet [FILES...]
 """
 
+import argparse
 import json
 import os
 import re
-from typing import Any, Dict, List, Iterator
+import resource
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Iterator, Optional, TextIO, Tuple
 import logging
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional
+    pa = None
+    pq = None
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -21,21 +35,53 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Characters read per buffer by the streaming parser
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+# Records per Parquet row group
+DEFAULT_ROW_GROUP_SIZE = 50_000
+
+# Columnar type overrides for known CPGrams fields; other fields are typed
+# from their MongoDB wrapper ($date -> timestamp, $numberLong -> int64)
+TIMESTAMP_FIELDS = {"recvd_date", "DiaryDate", "closing_date"}
+INT64_FIELDS = {"CategoryV7"}
+DICTIONARY_FIELDS = {"state", "org_code", "dist_name", "sex"}
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Ways of converting MongoDB wrappers in streaming mode (see make_record_converter)
+CONVERTERS = ("hook", "schema", "recursive")
+DEFAULT_CONVERTER = "hook"
+
+def convert_mongodb_date(value: Any) -> Any:
+    """Convert the value of a MongoDB $date wrapper to an ISO string."""
+    if isinstance(value, str):
+        if value.endswith("+0000"):
+            return value[:-5] + "Z"
+        return value
+    # Canonical extended JSON stores dates as {"$numberLong": "<epoch ms>"}
+    if isinstance(value, dict) and "$numberLong" in value:
+        value = int(value["$numberLong"])
+    if isinstance(value, int):
+        return (EPOCH + timedelta(milliseconds=value)).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+    return value
+
+def convert_mongodb_numberlong(value: Any) -> int:
+    """Convert the value of a MongoDB $numberLong wrapper to an integer."""
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return 0
+
 def convert_mongodb_objects(obj: Any) -> Any:
     """Convert MongoDB-specific objects to standard JSON format."""
     if isinstance(obj, dict):
         if "$date" in obj:
             # Convert MongoDB date to ISO string
-            date_str = obj["$date"]
-            if date_str.endswith("+0000"):
-                return date_str[:-6] + "Z"
-            return date_str
+            return convert_mongodb_date(obj["$date"])
         elif "$numberLong" in obj:
             # Convert MongoDB numberLong to integer
-            try:
-                return int(obj["$numberLong"])
-            except (ValueError, TypeError):
-                return 0
+            return convert_mongodb_numberlong(obj["$numberLong"])
         elif "$oid" in obj:
             # Convert MongoDB ObjectId to string
             return obj["$oid"]
@@ -48,6 +94,120 @@ def convert_mongodb_objects(obj: Any) -> Any:
     else:
         return obj
 
+def mongodb_object_hook(obj: Dict[str, Any]) -> Any:
+    """
+    json object_hook that converts MongoDB wrappers while parsing.
+    
+    The decoder calls it for every object, innermost first, so records come
+    out of json.loads / iter_json_array already converted and no second pass
+    (or dict rebuild) is needed. Equivalent to convert_mongodb_objects.
+    """
+    if "$date" in obj:
+        return convert_mongodb_date(obj["$date"])
+    if "$numberLong" in obj:
+        return convert_mongodb_numberlong(obj["$numberLong"])
+    if "$oid" in obj:
+        return obj["$oid"]
+    return obj
+
+# Generated source converting one top-level field that held each MongoDB
+# wrapper when its record shape was learned (see SchemaConverter.compile_plan)
+FIELD_TEMPLATES = {
+    "$date": """\
+    v = record[{key}]
+    if v.__class__ is dict:
+        if "$date" in v:
+            d = v["$date"]
+            record[{key}] = d[:-5] + "Z" if d.__class__ is str and d.endswith("+0000") else convert_date(d)
+        else:
+            record[{key}] = convert_generic(v)
+    elif v.__class__ is list:
+        record[{key}] = convert_generic(v)
+""",
+    "$numberLong": """\
+    v = record[{key}]
+    if v.__class__ is dict:
+        record[{key}] = convert_numberlong(v["$numberLong"]) if "$numberLong" in v and "$date" not in v else convert_generic(v)
+    elif v.__class__ is list:
+        record[{key}] = convert_generic(v)
+""",
+    "$oid": """\
+    v = record[{key}]
+    if v.__class__ is dict:
+        record[{key}] = v["$oid"] if "$oid" in v and "$date" not in v and "$numberLong" not in v else convert_generic(v)
+    elif v.__class__ is list:
+        record[{key}] = convert_generic(v)
+""",
+    None: """\
+    v = record[{key}]
+    if v.__class__ is dict or v.__class__ is list:
+        record[{key}] = convert_generic(v)
+""",
+}
+
+class SchemaConverter:
+    """
+    Convert records with a function compiled for each record shape.
+    
+    The first record with a given set of keys is inspected once, noting
+    which top-level fields hold a MongoDB wrapper (e.g. DiaryDate,
+    recvd_date, closing_date -> $date, CategoryV7 -> $numberLong,
+    _id -> $oid). A function is then generated and compiled for that key
+    set which converts the fields in place with straight-line code: wrapper
+    fields take an inlined fast path and every other field is only type
+    checked. Objects and lists that are not the expected wrapper go through
+    the generic convert_mongodb_objects, so records whose fields change type
+    are still converted correctly.
+    
+    Output is identical to convert_mongodb_objects.
+    """
+    
+    def __init__(self):
+        self.plans: Dict[tuple, Callable] = {}
+    
+    def compile_plan(self, record: Dict[str, Any]) -> Callable:
+        """Generate and compile the converter for records shaped like this one."""
+        lines = ["def convert(record):"]
+        for key, value in record.items():
+            wrapper = None
+            if isinstance(value, dict):
+                wrapper = next((name for name in FIELD_TEMPLATES if name and name in value), None)
+            lines.append(FIELD_TEMPLATES[wrapper].format(key=repr(key)))
+        lines.append("    return record")
+        namespace = {
+            "convert_date": convert_mongodb_date,
+            "convert_numberlong": convert_mongodb_numberlong,
+            "convert_generic": convert_mongodb_objects,
+        }
+        exec(compile("\n".join(lines), f"<SchemaConverter {len(self.plans)}>", "exec"), namespace)
+        return namespace["convert"]
+    
+    def convert(self, record: Any) -> Any:
+        """Convert one record (a freshly parsed dict is modified in place)."""
+        if record.__class__ is not dict:
+            return convert_mongodb_objects(record)
+        keys = tuple(record)
+        plan = self.plans.get(keys)
+        if plan is None:
+            plan = self.plans[keys] = self.compile_plan(record)
+        return plan(record)
+
+def make_record_converter(converter: str = DEFAULT_CONVERTER) -> Tuple[Optional[Callable], Callable]:
+    """
+    Return the (object_hook, per-record function) pair for a converter name.
+    
+    - hook: convert wrappers while parsing with mongodb_object_hook (fastest)
+    - schema: convert only the learned wrapper fields with a SchemaConverter
+    - recursive: convert_mongodb_objects on every record
+    """
+    if converter == "hook":
+        return mongodb_object_hook, lambda record: record
+    if converter == "schema":
+        return None, SchemaConverter().convert
+    if converter == "recursive":
+        return None, convert_mongodb_objects
+    raise ValueError(f"Unknown converter: {converter}")
+
 def process_json_chunks(input_file: str, output_file: str, chunk_size: int = 1000) -> bool:
     """
     Process JSON file in chunks to handle large files.
@@ -72,13 +232,14 @@ def process_json_chunks(input_file: str, output_file: str, chunk_size: int = 100
         
         # Process and write in chunks
         processed_data = []
+        converter = SchemaConverter()
         
         for i in range(0, total_records, chunk_size):
             chunk = data[i:i + chunk_size]
             logger.info(f"Processing chunk {i//chunk_size + 1}/{(total_records + chunk_size - 1)//chunk_size}")
             
             # Clean the chunk
-            cleaned_chunk = [convert_mongodb_objects(record) for record in chunk]
+            cleaned_chunk = [converter.convert(record) for record in chunk]
             processed_data.extend(cleaned_chunk)
         
         # Write the cleaned data
@@ -92,6 +253,393 @@ def process_json_chunks(input_file: str, output_file: str, chunk_size: int = 100
         logger.error(f"❌ Error processing {input_file}: {e}")
         return False
 
+def iter_json_array(infile: TextIO, buffer_size: int = DEFAULT_BUFFER_SIZE,
+                    object_hook: Optional[Callable] = None) -> Iterator[Any]:
+    """
+    Incrementally yield the elements of a top-level JSON array.
+    
+    The file is read in fixed-size buffers and each element is decoded as soon
+    as it is complete, so only the current element (plus one buffer) is held in
+    memory regardless of the file size.
+    
+    Args:
+        infile: Text file object positioned at the start of the array
+        buffer_size: Number of characters to read per buffer
+        object_hook: Optional json object_hook, e.g. mongodb_object_hook
+        
+    Yields:
+        Each decoded array element, in order
+        
+    Raises:
+        ValueError: If the input is not exactly one JSON array
+    """
+    decoder = json.JSONDecoder(object_hook=object_hook)
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        chunk = infile.read(buffer_size)
+        if not chunk:
+            eof = True
+            return False
+        # Drop everything already consumed before growing the buffer
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip_whitespace() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if not fill():
+                return ""
+
+    if skip_whitespace() != "[":
+        raise ValueError("Expected a top-level JSON array")
+    pos += 1
+
+    def finish() -> None:
+        # Only whitespace may follow the closing bracket, so a slice that
+        # stops mid-array is an error rather than a silently short result
+        nonlocal pos
+        pos += 1
+        if skip_whitespace():
+            raise ValueError("Unexpected data after the end of the JSON array")
+
+    if skip_whitespace() == "]":
+        finish()
+        return
+
+    while True:
+        if not skip_whitespace():
+            raise ValueError("Unexpected end of file inside JSON array")
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # The element is split across buffers; read more and retry
+                if fill():
+                    continue
+                raise
+            # A bare number at the end of the buffer may still be truncated
+            if (not isinstance(value, (dict, list, str))
+                    and (end == len(buf) or buf[end] not in " \t\r\n,]")
+                    and fill()):
+                continue
+            break
+        pos = end
+        yield value
+
+        separator = skip_whitespace()
+        if separator == ",":
+            pos += 1
+        elif separator == "]":
+            finish()
+            return
+        else:
+            raise ValueError(f"Expected ',' or ']' after array element, found {separator!r}")
+
+def get_peak_rss_mb() -> float:
+    """Get the peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+def stream_json_file(input_file: str, output_file: str, buffer_size: int = DEFAULT_BUFFER_SIZE,
+                     converter: str = DEFAULT_CONVERTER) -> bool:
+    """
+    Convert a JSON array file record by record with constant memory.
+    
+    Unlike process_json_chunks, the input is never fully loaded: each record
+    is parsed from a fixed-size buffer, converted and written straight to the
+    output (one record per line).
+    
+    Args:
+        input_file: Path to input JSON file
+        output_file: Path to output fixed JSON file
+        buffer_size: Number of characters to read from the input at a time
+        converter: How MongoDB wrappers are converted, one of CONVERTERS
+        
+    Returns:
+        bool: True if successful
+    """
+    try:
+        logger.info(f"Streaming {input_file} with {buffer_size}-character buffers ({converter} converter)")
+        start = time.perf_counter()
+        count = 0
+        object_hook, convert = make_record_converter(converter)
+        
+        with open(input_file, 'r', encoding='utf-8') as infile, \
+                open(output_file, 'w', encoding='utf-8') as outfile:
+            outfile.write("[")
+            for record in iter_json_array(infile, buffer_size, object_hook):
+                outfile.write("\n" if count == 0 else ",\n")
+                outfile.write(json.dumps(convert(record), ensure_ascii=False))
+                count += 1
+                if count % 100000 == 0:
+                    logger.info(f"Processed {count} records")
+            outfile.write("\n]\n")
+        
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed if elapsed > 0 else float("inf")
+        logger.info(f"✅ Successfully streamed {count} records in {elapsed:.1f}s")
+        logger.info(f"   Throughput: {rate:,.0f} records/sec")
+        logger.info(f"   Peak RSS: {get_peak_rss_mb():.1f} MB")
+        return True
+        
+    except Exception as e:
+        logger.error(f"❌ Error streaming {input_file}: {e}")
+        return False
+
+def parse_timestamp_ms(value: Any) -> Optional[int]:
+    """Parse a MongoDB $date (or converted ISO string) to epoch milliseconds, or None."""
+    if isinstance(value, dict):
+        value = value.get("$date")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return (parsed - EPOCH) // timedelta(milliseconds=1)
+
+def parse_int64(value: Any) -> Optional[int]:
+    """Parse a MongoDB $numberLong (or plain number) to an integer, or None."""
+    value = convert_mongodb_objects(value)
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+def promote_type(current: "pa.DataType", other: Optional["pa.DataType"]) -> "pa.DataType":
+    """Column type holding values of both types (None: no values seen)."""
+    if other is None or current == other:
+        return current
+    if {current, other} == {pa.int64(), pa.float64()}:
+        return pa.float64()
+    return pa.string()
+
+class ParquetRecordWriter:
+    """
+    Write MongoDB-style records to a Parquet file in row groups.
+    
+    Date fields become UTC millisecond timestamps, number fields int64,
+    low-cardinality text fields dictionary-encoded, and anything nested is
+    stored as a JSON string. The schema grows as row groups arrive: fields
+    first seen in a later group are added (null in earlier groups), and a
+    field whose values change type is widened (int64 to float64, anything
+    else to string). Either rewrites the groups written so far, one at a
+    time. The file is written under a temporary name and only renamed to
+    output_file by close, so a failed conversion never leaves a truncated
+    output.
+    """
+    
+    def __init__(self, output_file: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE):
+        if pa is None:
+            raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow)")
+        self.output_file = output_file
+        self.temp_file = output_file + ".tmp"
+        self.row_group_size = row_group_size
+        self.schema = None
+        self.writer = None
+        self.pending: List[Dict[str, Any]] = []
+        self.count = 0
+        self.rewrites = 0
+    
+    def _infer_type(self, field: str, values: List[Any]) -> Optional["pa.DataType"]:
+        """Pick the column type for a field from its raw values (None if all are null)."""
+        if field in TIMESTAMP_FIELDS:
+            return pa.timestamp("ms", tz="UTC")
+        if field in INT64_FIELDS:
+            return pa.int64()
+        if field in DICTIONARY_FIELDS:
+            return pa.dictionary(pa.int32(), pa.string())
+        inferred = None
+        for value in values:
+            if value is None:
+                continue
+            if isinstance(value, dict) and "$date" in value:
+                value_type = pa.timestamp("ms", tz="UTC")
+            elif isinstance(value, dict) and "$numberLong" in value:
+                value_type = pa.int64()
+            elif isinstance(value, bool):
+                value_type = pa.bool_()
+            elif isinstance(value, int):
+                value_type = pa.int64()
+            elif isinstance(value, float):
+                value_type = pa.float64()
+            else:
+                return pa.string()
+            inferred = value_type if inferred is None else promote_type(inferred, value_type)
+        return inferred
+    
+    def _column(self, field: str, data_type: "pa.DataType", values: List[Any]) -> "pa.Array":
+        """Build one typed column from raw values."""
+        if pa.types.is_timestamp(data_type):
+            return pa.array([parse_timestamp_ms(v) for v in values], type=data_type)
+        if pa.types.is_integer(data_type):
+            return pa.array([parse_int64(v) for v in values], type=data_type)
+        if pa.types.is_dictionary(data_type):
+            return pa.array([None if v is None else str(v) for v in values], type=pa.string()).dictionary_encode()
+        if pa.types.is_string(data_type):
+            converted = []
+            for value in values:
+                value = convert_mongodb_objects(value)
+                if value is None or isinstance(value, str):
+                    converted.append(value)
+                elif isinstance(value, (dict, list)):
+                    converted.append(json.dumps(value, ensure_ascii=False))
+                else:
+                    converted.append(str(value))
+            return pa.array(converted, type=data_type)
+        return pa.array([convert_mongodb_objects(v) for v in values], type=data_type)
+    
+    def _convert(self, field: str, data_type: "pa.DataType", column: "pa.ChunkedArray") -> "pa.ChunkedArray":
+        """A written column as the (promoted) type of a later schema."""
+        if column.type == data_type:
+            return column
+        if pa.types.is_string(data_type):
+            if pa.types.is_timestamp(column.type):
+                # As the JSON converters write dates
+                return pa.chunked_array([pa.array(
+                    [None if ms is None else convert_mongodb_date(ms) for ms in column.cast(pa.int64()).to_pylist()],
+                    type=data_type,
+                )])
+            return pa.chunked_array([self._column(field, data_type, column.to_pylist())])
+        return column.cast(data_type)
+    
+    def _rewrite(self, schema: "pa.Schema") -> None:
+        """Rewrite the row groups written so far with a wider schema."""
+        self.writer.close()
+        previous = self.temp_file + ".old"
+        os.replace(self.temp_file, previous)
+        try:
+            self.writer = pq.ParquetWriter(self.temp_file, schema)
+            written = pq.ParquetFile(previous)
+            for index in range(written.num_row_groups):
+                table = written.read_row_group(index)
+                columns = [
+                    self._convert(field.name, field.type, table.column(field.name))
+                    if field.name in table.column_names else pa.nulls(table.num_rows, field.type)
+                    for field in schema
+                ]
+                self.writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+        finally:
+            os.remove(previous)
+        self.rewrites += 1
+    
+    def _flush(self) -> None:
+        """Write the pending records as one row group, widening the schema if needed."""
+        if not self.pending:
+            return
+        group_types = {
+            field: self._infer_type(field, [record.get(field) for record in self.pending])
+            for field in dict.fromkeys(field for record in self.pending for field in record)
+        }
+        fields = [] if self.schema is None else [
+            (field.name, promote_type(field.type, group_types.pop(field.name, None))) for field in self.schema
+        ]
+        # Fields with no values yet are stored as strings
+        fields += [(field, pa.string() if data_type is None else data_type) for field, data_type in group_types.items()]
+        schema = pa.schema(fields)
+        if self.schema is None:
+            self.writer = pq.ParquetWriter(self.temp_file, schema)
+        elif not schema.equals(self.schema):
+            logger.info(f"Schema changed after {self.count} records; rewriting them")
+            self._rewrite(schema)
+        self.schema = schema
+        
+        columns = [
+            self._column(field.name, field.type, [record.get(field.name) for record in self.pending])
+            for field in self.schema
+        ]
+        self.writer.write_table(pa.Table.from_arrays(columns, schema=self.schema))
+        self.count += len(self.pending)
+        self.pending = []
+    
+    def write(self, record: Dict[str, Any]) -> None:
+        """Buffer a raw record, flushing a row group when it is full."""
+        self.pending.append(record)
+        if len(self.pending) >= self.row_group_size:
+            self._flush()
+    
+    def close(self) -> int:
+        """Flush the last row group and move the file into place; returns the record count."""
+        try:
+            self._flush()
+        except BaseException:
+            self.abort()
+            raise
+        if self.writer is not None:
+            self.writer.close()
+            os.replace(self.temp_file, self.output_file)
+        return self.count
+    
+    def abort(self) -> None:
+        """Close and delete the partly written file; output_file is left as it was."""
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        if os.path.exists(self.temp_file):
+            os.remove(self.temp_file)
+
+def stream_to_parquet(input_file: str, output_file: str, buffer_size: int = DEFAULT_BUFFER_SIZE,
+                      row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> bool:
+    """
+    Convert a JSON array file to typed, columnar Parquet with bounded memory.
+    
+    Records are parsed incrementally and written in row groups, so at most one
+    row group is held in memory. Consumers can then read just the columns they
+    need instead of re-parsing every record.
+    
+    Args:
+        input_file: Path to input JSON file
+        output_file: Path to output Parquet file
+        buffer_size: Number of characters to read from the input at a time
+        row_group_size: Number of records per row group
+        
+    Returns:
+        bool: True if successful
+    """
+    try:
+        logger.info(f"Streaming {input_file} to Parquet in row groups of {row_group_size}")
+        start = time.perf_counter()
+        
+        writer = ParquetRecordWriter(output_file, row_group_size)
+        try:
+            with open(input_file, 'r', encoding='utf-8') as infile:
+                for record in iter_json_array(infile, buffer_size):
+                    writer.write(record)
+        except BaseException:
+            writer.abort()
+            raise
+        count = writer.close()
+        
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed if elapsed > 0 else float("inf")
+        size_mb = os.path.getsize(output_file) / (1024 * 1024) if count else 0.0
+        logger.info(f"✅ Successfully wrote {count} records to {output_file} ({size_mb:.1f} MB) in {elapsed:.1f}s")
+        logger.info(f"   Throughput: {rate:,.0f} records/sec")
+        logger.info(f"   Peak RSS: {get_peak_rss_mb():.1f} MB")
+        return True
+        
+    except Exception as e:
+        logger.error(f"❌ Error writing Parquet for {input_file}: {e}")
+        return False
+
 def create_sample_file(input_file: str, output_file: str, sample_size: int = 100) -> bool:
     """Create a small sample file for testing."""
     try:
@@ -111,8 +659,48 @@ def create_sample_file(input_file: str, output_file: str, sample_size: int = 100
         logger.error(f"❌ Error creating sample from {input_file}: {e}")
         return False
 
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Fix MongoDB-style JSON files from the CPGrams dataset")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Run non-interactively with the constant-memory streaming converter"
+    )
+    parser.add_argument(
+        "--buffer-size",
+        type=int,
+        default=DEFAULT_BUFFER_SIZE,
+        help=f"Characters read per buffer in streaming mode (default: {DEFAULT_BUFFER_SIZE})"
+    )
+    parser.add_argument(
+        "--converter",
+        choices=CONVERTERS,
+        default=DEFAULT_CONVERTER,
+        help=f"How MongoDB wrappers are converted in streaming JSON mode (default: {DEFAULT_CONVERTER})"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "parquet"],
+        default="json",
+        help="Output format in streaming mode (default: json)"
+    )
+    parser.add_argument(
+        "--row-group-size",
+        type=int,
+        default=DEFAULT_ROW_GROUP_SIZE,
+        help=f"Records per row group for Parquet output (default: {DEFAULT_ROW_GROUP_SIZE})"
+    )
+    parser.add_argument(
+        "files",
+        nargs="*",
+        help="Input files for streaming mode (default: the CPGrams dumps in data/)"
+    )
+    return parser.parse_args()
+
 def main():
     """Main function to process JSON files."""
+    args = parse_args()
     logger.info("🔧 Starting streaming JSON file fixing process...")
     
     # Create scripts directory if it doesn't exist
@@ -131,13 +719,30 @@ def main():
             size_mb = os.path.getsize(file_path) / (1024 * 1024)
             logger.info(f"📄 {description}: {size_mb:.1f} MB")
     
+    if args.stream:
+        input_files = args.files or [file_path for file_path, _ in files_info]
+        for file_path in input_files:
+            if not os.path.exists(file_path):
+                logger.warning(f"⚠️  File not found: {file_path}")
+            elif args.format == "parquet":
+                output_file = file_path.replace('.json', '_fixed.parquet')
+                logger.info(f"\n🔄 Streaming {file_path} to Parquet...")
+                stream_to_parquet(file_path, output_file, args.buffer_size, args.row_group_size)
+            else:
+                output_file = file_path.replace('.json', '_fixed.json')
+                logger.info(f"\n🔄 Streaming {file_path}...")
+                stream_json_file(file_path, output_file, args.buffer_size, args.converter)
+        logger.info("\n🎯 Processing completed!")
+        return
+    
     # Ask user what to do
     print("\nChoose an option:")
     print("1. Create sample files (100 records each) for testing")
     print("2. Process full files (may take a while for large files)")
     print("3. Process with custom chunk size")
+    print("4. Stream full files with constant memory")
     
-    choice = input("Enter your choice (1/2/3): ").strip()
+    choice = input("Enter your choice (1/2/3/4): ").strip()
     
     if choice == "1":
         # Create sample files
@@ -182,6 +787,14 @@ def main():
         except ValueError:
             logger.error("❌ Invalid chunk size. Please enter a number.")
     
+    elif choice == "4":
+        # Stream each file record by record
+        for file_path, description in files_info:
+            if os.path.exists(file_path):
+                output_file = file_path.replace('.json', '_fixed.json')
+                logger.info(f"\n🔄 Streaming {description}...")
+                stream_json_file(file_path, output_file, args.buffer_size, args.converter)
+    
     else:
         logger.error("❌ Invalid choice. Please run the script again.")
     
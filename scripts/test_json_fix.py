@@ -3,9 +3,20 @@
 Test script to validate JSON fixing process with a small sample.
 """
 
+import copy
+import io
 import json
 import os
-from fix_json_streaming import convert_mongodb_objects
+import tempfile
+from fix_json_streaming import (
+    SchemaConverter,
+    convert_mongodb_objects,
+    iter_json_array,
+    mongodb_object_hook,
+    stream_to_parquet,
+    pq,
+)
+from fix_json_parallel import convert_shard, plan_shards, process_files_parallel
 
 def test_conversion():
     """Test the MongoDB object conversion with sample data."""
@@ -65,6 +76,239 @@ def test_conversion():
     
     return all_passed
 
+def test_streaming_parser():
+    """Test that the incremental parser matches json.load for any buffer size."""
+    
+    records = [
+        {"_id": f"TEST/E/2023/{i:07d}", "CategoryV7": {"$numberLong": str(i)}, "note": "a],{b"}
+        for i in range(50)
+    ] + [12345, 2.5, "text", [1, [2]], None, True]
+    
+    print("\n🧪 Testing incremental array parser...")
+    
+    for text in (json.dumps(records, indent=2), json.dumps(records)):
+        for buffer_size in (1, 3, 64, 4096):
+            parsed = list(iter_json_array(io.StringIO(text), buffer_size))
+            assert parsed == records, f"Mismatch with buffer size {buffer_size}"
+    
+    assert list(iter_json_array(io.StringIO(" [ ] "), 1)) == []
+    try:
+        list(iter_json_array(io.StringIO('[{"a": 1}] {"b": 2}]')))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("data after the array was ignored")
+    
+    print("  ✅ Incremental parser matches json.load")
+
+def test_fast_converters():
+    """Test that the schema-aware and object_hook converters match the recursive one."""
+    
+    records = [
+        {
+            "_id": {"$oid": "64b7f0c2a1b2c3d4e5f60718"},
+            "CategoryV7": {"$numberLong": "11578"},
+            "recvd_date": {"$date": "2023-01-01T00:00:19.977+0000"},
+            "closing_date": None,
+            "state": "TS",
+        },
+        {
+            # Same keys: closing_date now holds a wrapper, CategoryV7 does not
+            "_id": {"$oid": "64b7f0c2a1b2c3d4e5f60719"},
+            "CategoryV7": 11579,
+            "recvd_date": {"$date": {"$numberLong": "1672531219977"}},
+            "closing_date": {"$date": "2023-01-04T00:00:00.000+0000"},
+            "state": "TS",
+        },
+        {
+            # New key set with nested objects and lists
+            "registration_no": "TEST/E/2023/0000003",
+            "meta": {"created": {"$date": "2023-02-01T00:00:00.000+0000"}, "tags": ["a"]},
+            "history": [{"action_srno": {"$numberLong": "1"}}, {"action_srno": {"$numberLong": "bad"}}],
+        },
+    ]
+    
+    print("\n🧪 Testing fast converters...")
+    
+    expected = [convert_mongodb_objects(record) for record in records]
+    converter = SchemaConverter()
+    assert [converter.convert(record) for record in copy.deepcopy(records)] == expected
+    assert json.loads(json.dumps(records), object_hook=mongodb_object_hook) == expected
+    assert expected[0]["recvd_date"] == expected[1]["recvd_date"] == "2023-01-01T00:00:19.977Z"
+    assert expected[2]["history"][1]["action_srno"] == 0
+    
+    print("  ✅ Schema and object_hook converters match the recursive converter")
+
+def test_parallel_conversion():
+    """Test that sharded parallel conversion preserves every record in order."""
+    
+    records = [
+        {
+            "_id": f"TEST/E/2023/{i:07d}",
+            "CategoryV7": {"$numberLong": str(i)},
+            "recvd_date": {"$date": "2023-01-01T00:00:19.977+0000"},
+            "history": [{"step": 1}, {"step": 2}],
+            "n": [{"x": 1}, {"y": 2}],
+            "remarks": 'closed }, { see "}, {" [\\',
+            "b": 3,
+        }
+        for i in range(500)
+    ]
+    
+    print("\n🧪 Testing parallel sharded conversion...")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_file = os.path.join(tmp_dir, "input.json")
+        output_file = os.path.join(tmp_dir, "output.json")
+        with open(input_file, 'w', encoding='utf-8') as f:
+            json.dump(records, f, indent=2)
+        
+        # Tiny shards force many boundaries; "}, {" inside nested arrays and
+        # strings must never be taken for one
+        shards = plan_shards(input_file, 2048)
+        assert len(shards) > 1
+        part_file = os.path.join(tmp_dir, "shard.part")
+        assert sum(convert_shard(input_file, start, end, part_file) for start, end in shards) == len(records)
+        
+        results = process_files_parallel([(input_file, output_file)], workers=2, shard_size=2048)
+        
+        with open(output_file, 'r', encoding='utf-8') as f:
+            converted = json.load(f)
+    
+    assert results[input_file] == len(records)
+    assert converted == [convert_mongodb_objects(record) for record in records]
+    
+    print("  ✅ Parallel conversion matches sequential conversion")
+
+def test_incremental_ingest():
+    """Test that incremental ingest keeps one copy of each record."""
+    
+    def grievance(key, state):
+        return {"registration_no": key, "state": state, "CategoryV7": 1}
+    
+    print("\n🧪 Testing incremental ingest...")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # fix_json_files logs to data/fix_json.log under the working directory
+        os.makedirs(os.path.join(tmp_dir, "data"))
+        cwd = os.getcwd()
+        os.chdir(tmp_dir)
+        try:
+            from fix_json_files import ingest_incremental
+        finally:
+            os.chdir(cwd)
+        
+        dataset_file = os.path.join(tmp_dir, "fixed.json")
+        delta_file = os.path.join(tmp_dir, "delta.json")
+        # B was appended twice by an older version of the ingest
+        with open(dataset_file, 'w', encoding='utf-8') as f:
+            json.dump([grievance("A", "Goa"), grievance("B", "Goa"), grievance("C", "Goa"), grievance("B", "Assam")], f)
+        
+        def ingest(records):
+            with open(delta_file, 'w', encoding='utf-8') as f:
+                json.dump(records, f)
+            stats = ingest_incremental(delta_file, dataset_file)
+            with open(dataset_file, 'r', encoding='utf-8') as f:
+                return stats, json.load(f)
+        
+        delta = [dict(grievance("A", "Kerala"), CategoryV7={"$numberLong": "1"}), grievance("C", "Goa"), grievance("D", "Goa")]
+        stats, dataset = ingest(delta)
+        assert stats == {"new": 1, "changed": 1, "unchanged": 1}
+        assert dataset == [grievance("A", "Kerala"), grievance("C", "Goa"), grievance("B", "Assam"), grievance("D", "Goa")]
+        
+        stats, dataset = ingest([grievance("E", "Goa")])
+        assert stats == {"new": 1, "changed": 0, "unchanged": 0}
+        assert [record["registration_no"] for record in dataset] == ["A", "C", "B", "D", "E"]
+    
+    print("  ✅ Changed records replace their earlier copy")
+
+def test_parquet_output():
+    """Test that Parquet output has typed and dictionary-encoded columns."""
+    
+    if pq is None:
+        print("\n⚠️  pyarrow not installed, skipping Parquet test")
+        return
+    
+    records = [
+        {
+            "_id": f"TEST/E/2023/{i:07d}",
+            "CategoryV7": {"$numberLong": str(11578 + i)},
+            "recvd_date": {"$date": "2023-01-01T00:00:19.977+0000"},
+            "closing_date": {"$date": "not a date"} if i == 0 else None,
+            "state": "TS",
+        }
+        for i in range(10)
+    ]
+    
+    print("\n🧪 Testing Parquet output...")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_file = os.path.join(tmp_dir, "input.json")
+        output_file = os.path.join(tmp_dir, "output.parquet")
+        with open(input_file, 'w', encoding='utf-8') as f:
+            json.dump(records, f)
+        
+        assert stream_to_parquet(input_file, output_file, row_group_size=4)
+        parquet_file = pq.ParquetFile(output_file)
+        table = parquet_file.read(columns=["CategoryV7", "recvd_date", "closing_date", "state"])
+    
+    assert parquet_file.metadata.num_row_groups == 3
+    assert str(table.schema.field("recvd_date").type) == "timestamp[ms, tz=UTC]"
+    assert str(table.schema.field("CategoryV7").type) == "int64"
+    assert str(table.schema.field("state").type).startswith("dictionary")
+    assert table.column("CategoryV7").to_pylist()[:2] == [11578, 11579]
+    assert table.column("recvd_date").cast("int64").to_pylist()[0] == 1672531219977
+    assert table.column("closing_date").null_count == 10
+    
+    print("  ✅ Parquet columns are typed")
+
+def test_parquet_schema_changes():
+    """Test that Parquet output keeps fields and types that change after the first row group."""
+    
+    if pq is None:
+        print("\n⚠️  pyarrow not installed, skipping Parquet schema test")
+        return
+    
+    records = [
+        {
+            "_id": f"TEST/E/2023/{i:07d}",
+            "recvd_date": {"$date": "2023-01-01T00:00:19.977+0000"},
+            # First seen in the third row group
+            **({"sex": "F", "rating": 4} if i >= 8 else {}),
+            # int64 in the first group, float64 from the second on
+            "score": i if i < 4 else i + 0.5,
+            # int64 until a text value arrives in the last group
+            "UserCode": "110124" if i == 9 else 110124,
+            # A date until a text value arrives
+            "ReopenDate": {"$date": "2023-02-01T00:00:00.000+0000"} if i < 8 else "n/a",
+        }
+        for i in range(10)
+    ]
+    
+    print("\n🧪 Testing Parquet schema changes...")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_file = os.path.join(tmp_dir, "input.json")
+        output_file = os.path.join(tmp_dir, "output.parquet")
+        with open(input_file, 'w', encoding='utf-8') as f:
+            json.dump(records, f)
+        
+        assert stream_to_parquet(input_file, output_file, row_group_size=4)
+        parquet_file = pq.ParquetFile(output_file)
+        table = parquet_file.read()
+        assert sorted(os.listdir(tmp_dir)) == ["input.json", "output.parquet"]
+    
+    assert parquet_file.metadata.num_row_groups == 3
+    assert table.column("sex").to_pylist() == [None] * 8 + ["F", "F"]
+    assert table.column("rating").to_pylist() == [None] * 8 + [4, 4]
+    assert str(table.schema.field("score").type) == "double"
+    assert table.column("score").to_pylist() == [0, 1, 2, 3, 4.5, 5.5, 6.5, 7.5, 8.5, 9.5]
+    assert table.column("UserCode").to_pylist() == ["110124"] * 10
+    assert table.column("ReopenDate").to_pylist() == ["2023-02-01T00:00:00.000Z"] * 8 + ["n/a", "n/a"]
+    assert table.column("recvd_date").cast("int64").to_pylist() == [1672531219977] * 10
+    
+    print("  ✅ Later fields and type changes are kept")
+
 def check_actual_files():
     """Check if the actual data files exist and show their structure."""
     
@@ -103,6 +347,12 @@ def main():
     
     # Test the conversion logic
     conversion_test_passed = test_conversion()
+    test_streaming_parser()
+    test_fast_converters()
+    test_parallel_conversion()
+    test_incremental_ingest()
+    test_parquet_output()
+    test_parquet_schema_changes()
     
     # Check actual files
     check_actual_files()
@@ -111,7 +361,7 @@ def main():
     if conversion_test_passed:
         print("1. Run: python scripts/fix_json_streaming.py")
         print("2. Choose option 1 to create sample files first")
-        print("3. Then choose option 2 to process full files")
+        print("3. Then choose option 2 (or run with --stream) to process full files")
     else:
         print("1. Fix the conversion logic in fix_json_streaming.py")
         print("2. Re-run this test script")
@@ -119,6 +369,7 @@ def main():
     print("\n📚 Available scripts:")
     print("- scripts/fix_json_files.py - Full-featured fixer with logging")
     print("- scripts/fix_json_streaming.py - Streaming fixer for large files")
+    print("- scripts/fix_json_parallel.py - Multi-core fixer for all dumps at once")
     print("- scripts/test_json_fix.py - This test script")
 
 if __name__ == "__main__":